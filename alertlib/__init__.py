@@ -0,0 +1,9 @@
+"""
+Alert engines for the meshing-around bot
+
+Runtime building blocks behind the alert sections of config.enhanced.ini.
+They are compiled from the typed config (configlib.schema) once at load and
+then called for every inbound packet, so each module keeps per-message work
+constant. alertlib.engines.load_engines() builds them all from config.ini
+and joins them into one alert path. Nothing is imported at package import.
+"""
@@ -0,0 +1,180 @@
+"""
+Batched alert log files with a single writer thread
+
+Every alert section has log_to_file / log_file. Opening, appending and
+flushing the file from the packet handler for each alert means many small
+writes to the SD card, and the handler waits on each one. AlertLog moves
+all of that to one background thread:
+
+- log() only puts (file, time, priority, message) on a queue.SimpleQueue,
+  which takes no Python-level lock, so the hot path costs about a
+  microsecond;
+- the writer drains the queue in batches, formats the lines, and buffers
+  them per file, keeping each file open;
+- buffered lines are written when flush_bytes are pending or flush_interval
+  seconds have passed, so one write covers many alerts;
+- a priority 4 (emergency) line is written and fsync'd straight away,
+  together with anything buffered for its file.
+
+close() (or leaving a with block) writes everything left and closes the files.
+The writer is a daemon thread, so close() is also registered with atexit:
+a bot that exits without calling it still writes its last lines.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from configlib.schema import SECTION_NAMES
+
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 5.0
+URGENT_PRIORITY = 4
+
+_STOP = object()
+
+
+class AlertLog:
+    """Single-writer, per-file batched alert logging"""
+
+    def __init__(self, base_dir: Union[str, Path] = '.', flush_bytes: int = FLUSH_BYTES,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.base_dir = Path(base_dir)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.paths: Dict[str, Path] = {}   # section -> log file (relative to base_dir)
+        self.errors = 0                    # lines dropped because a file could not be written
+
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._put = self._queue.put
+        self._files: Dict[Path, object] = {}
+        self._buffers: Dict[Path, List[bytes]] = {}
+        self._pending = 0
+        self._stamp: Tuple[int, str] = (-1, '')
+        self._thread = threading.Thread(target=self._run, name="alert-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, typed_config, base_dir: Union[str, Path] = '.', **kwargs) -> "AlertLog":
+        """Writer for every section with log_to_file on, paths relative to base_dir"""
+        log = cls(base_dir, **kwargs)
+        for name in SECTION_NAMES:
+            section = getattr(typed_config, name)
+            if getattr(section, 'log_to_file', False) and section.log_file:
+                log.paths[name] = Path(section.log_file)
+        return log
+
+    def __enter__(self) -> "AlertLog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def log(self, path: Union[str, Path], message: str, priority: int = 1):
+        """Queue one line for path (relative to base_dir)"""
+        self._put((path, time.time(), priority, message))
+
+    def log_alert(self, section: str, message: str, priority: int = 1) -> bool:
+        """Queue a line for section's log_file; False if the section does not log"""
+        path = self.paths.get(section)
+        if path is None:
+            return False
+        self._put((path, time.time(), priority, message))
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """Write everything queued, close the files and stop the writer"""
+        atexit.unregister(self.close)
+        if self._thread.is_alive():
+            self._put(_STOP)
+            self._thread.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        get = self._queue.get
+        deadline = 0.0
+        while True:
+            idle = not self._pending
+            try:
+                item = get(timeout=None if idle else max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            # Take whatever else is already queued as one batch
+            stop = False
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                else:
+                    self._add(*item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            now = time.monotonic()
+            if idle and self._pending:
+                deadline = now + self.flush_interval  # oldest buffered line waits at most this long
+            if stop or self._pending >= self.flush_bytes or (self._pending and now >= deadline):
+                self._flush_all()
+            if stop:
+                for f in self._files.values():
+                    f.close()
+                self._files.clear()
+                return
+
+    def _add(self, path, stamp: float, priority: int, message: str):
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.base_dir / path
+        second = int(stamp)
+        if second != self._stamp[0]:
+            self._stamp = (second, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(second)))
+        line = f"{self._stamp[1]} - {message}\n".encode('utf-8', 'replace')
+        buffer = self._buffers.get(path)
+        if buffer is None:
+            buffer = self._buffers[path] = []
+        buffer.append(line)
+        self._pending += len(line)
+        if priority >= URGENT_PRIORITY:
+            self._flush(path, sync=True)
+
+    def _open(self, path: Path):
+        f = self._files.get(path)
+        if f is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            f = self._files[path] = open(path, 'ab')
+        return f
+
+    def _flush(self, path: Path, sync: bool = False):
+        buffer = self._buffers.pop(path, None)
+        if not buffer:
+            return
+        data = b''.join(buffer)
+        self._pending -= len(data)
+        try:
+            f = self._open(path)
+            f.write(data)
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        except OSError:
+            self.errors += len(buffer)
+            f = self._files.pop(path, None)
+            if f is not None:
+                try:
+                    f.close()  # reopened on the next flush
+                except OSError:
+                    pass
+
+    def _flush_all(self):
+        for path in list(self._buffers):
+            self._flush(path)
@@ -0,0 +1,111 @@
+"""
+Incremental altitude alerts
+
+[altitudeAlert] compares node altitudes with min_altitude every
+check_interval. Rescanning the whole node table each time wastes CPU when
+most nodes have not moved, so AltitudeEngine works from position updates
+instead: update() records a node's altitude in O(1) and marks the node
+dirty only if the value changed, and tick() evaluates just the dirty nodes.
+The cost of a tick is proportional to the number of nodes that moved, not
+to the size of the mesh.
+
+Alerts fire on upward crossings only. A node whose first report is already
+above min_altitude has not crossed anything, so it starts out latched like
+a node that has alerted. A latched node is re-armed once it drops below
+min_altitude - hysteresis_meters, so a balloon hovering around the
+threshold does not alert on every tick, and cooldown_period limits how
+often the same node can alert at all. Given a CooldownRegistry the cooldown
+is kept there (and survives restarts) instead.
+"""
+
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+
+COOLDOWN_TYPE = 'altitudeAlert'
+
+
+class AltitudeEvent(NamedTuple):
+    """A node climbing through min_altitude"""
+    node: int
+    altitude: float
+    min_altitude: float
+
+
+class AltitudeEngine:
+    """Dirty-set altitude threshold with hysteresis and per-node cooldown"""
+
+    def __init__(self, min_altitude: float, hysteresis: float = 50.0,
+                 cooldown_period: float = 300.0, clock: Callable[[], float] = time.monotonic,
+                 cooldowns=None):
+        self.min_altitude = min_altitude
+        self.rearm_altitude = min_altitude - max(0.0, hysteresis)
+        self.cooldown_period = cooldown_period
+        self.clock = clock
+        self.cooldowns = cooldowns  # optional alertlib.cooldowns.CooldownRegistry
+
+        self._altitude: Dict[int, float] = {}
+        self._above: Set[int] = set()       # alerted (or suppressed) and not yet re-armed
+        self._last_alert: Dict[int, float] = {}
+        self._dirty: Set[int] = set()
+
+    @classmethod
+    def from_config(cls, typed_config, **kwargs) -> "AltitudeEngine":
+        section = typed_config.altitudeAlert
+        return cls(section.min_altitude, hysteresis=section.hysteresis_meters,
+                   cooldown_period=section.cooldown_period, **kwargs)
+
+    def update(self, node: int, altitude: Optional[float]):
+        """Record a node's latest altitude (None if the fix has none)"""
+        previous = self._altitude.get(node)
+        if altitude is None or previous == altitude:
+            return
+        if previous is None and altitude >= self.min_altitude:
+            self._above.add(node)  # first sighting up high: not a crossing
+        self._altitude[node] = altitude
+        self._dirty.add(node)
+
+    @property
+    def pending(self) -> int:
+        """Nodes waiting for the next tick"""
+        return len(self._dirty)
+
+    def tick(self, now: Optional[float] = None) -> List[AltitudeEvent]:
+        """Evaluate the nodes whose altitude changed since the last tick"""
+        if not self._dirty:
+            return []
+        if now is None:
+            now = self.clock()
+
+        dirty, self._dirty = self._dirty, set()
+        above, altitudes = self._above, self._altitude
+        events = []
+        for node in dirty:
+            altitude = altitudes[node]
+            if node in above:
+                if altitude < self.rearm_altitude:
+                    above.discard(node)
+                continue
+            if altitude < self.min_altitude:
+                continue
+
+            # Upward crossing: latch until re-armed, alert unless cooling down
+            above.add(node)
+            if self.cooldowns is not None:
+                if self.cooldowns.try_fire(COOLDOWN_TYPE, node):
+                    events.append(AltitudeEvent(node, altitude, self.min_altitude))
+                continue
+            last = self._last_alert.get(node)
+            if last is not None and now - last < self.cooldown_period:
+                continue
+            self._last_alert[node] = now
+            events.append(AltitudeEvent(node, altitude, self.min_altitude))
+
+        events.sort(key=lambda e: e.node)
+        return events
+
+    def forget(self, node: int):
+        """Drop all state for a node"""
+        self._altitude.pop(node, None)
+        self._above.discard(node)
+        self._last_alert.pop(node, None)
+        self._dirty.discard(node)
@@ -0,0 +1,144 @@
+"""
+Low-battery alerts from a compact per-node store
+
+[batteryAlert] needs, per node, the latest battery level and whether it
+may alert again. Keeping a dict per node is heavy on a 512 MB Pi, so
+BatteryStore keeps flat arrays indexed by a per-node slot: level as uint8
+(255 = unknown) and an armed flag byte. With the slot -> node number array
+that is six bytes per node, plus the node -> slot dict. When a node last
+alerted is not kept here: node_cooldown_minutes is the node's batteryAlert
+cooldown in the shared CooldownRegistry, which only holds nodes that have
+alerted recently.
+
+Telemetry is recorded with update() as it arrives and evaluated once per
+check_interval_minutes with evaluate(), which checks every node in one pass
+(vectorised with NumPy when it is installed) and asks the registry only
+about the nodes that pass:
+
+- a node alerts when it is armed and its level is at or below
+  threshold_percent, and its cooldown in the registry has ended;
+- alerting disarms the node, and it is re-armed only once its level is back
+  to threshold + hysteresis, so a node hovering at 19-21% alerts once.
+
+Meshtastic reports 101 for externally powered nodes; that counts as full.
+"""
+
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from alertlib.cooldowns import CooldownRegistry, cooldown_seconds
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+UNKNOWN = 255
+HYSTERESIS_PERCENT = 5
+COOLDOWN_TYPE = 'batteryAlert'
+
+
+class BatteryEvent(NamedTuple):
+    """A node's battery dropping to the threshold"""
+    node: int
+    level: int
+
+
+class BatteryStore:
+    """Array-backed battery levels and arming flags"""
+
+    def __init__(self, threshold: int, cooldowns: Optional[CooldownRegistry] = None,
+                 monitor_nodes: Iterable[int] = (), hysteresis: int = HYSTERESIS_PERCENT,
+                 clock: Callable[[], float] = time.time, use_numpy: bool = True):
+        self.threshold = threshold
+        self.rearm_level = min(100, threshold + max(0, hysteresis))
+        # No registry: no cooldown beyond the hysteresis
+        self.cooldowns = cooldowns if cooldowns is not None else CooldownRegistry({}, clock=clock)
+        self.monitor_nodes = frozenset(monitor_nodes)
+        self.clock = clock
+        self.use_numpy = use_numpy and np is not None
+
+        self._slots: Dict[int, int] = {}
+        self._nodes = array('I')             # slot -> node number
+        self._level = bytearray()            # uint8, UNKNOWN if never reported
+        self._armed = bytearray()            # 1 = may alert
+
+    @classmethod
+    def from_config(cls, typed_config, cooldowns: Optional[CooldownRegistry] = None,
+                    **kwargs) -> "BatteryStore":
+        """Store for [batteryAlert] (default: an in-memory registry of its cooldowns)"""
+        section = typed_config.batteryAlert
+        if cooldowns is None:
+            cooldowns = CooldownRegistry(cooldown_seconds(typed_config))
+        return cls(section.threshold_percent, cooldowns,
+                   monitor_nodes=section.monitor_nodes, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the per-node arrays (excluding the slot dict)"""
+        return self._nodes.itemsize * len(self._nodes) + len(self._level) + len(self._armed)
+
+    def update(self, node: int, level: Optional[int]):
+        """Record a node's battery level from telemetry"""
+        if level is None or (self.monitor_nodes and node not in self.monitor_nodes):
+            return
+        level = 100 if level > 100 else max(0, int(level))
+        slot = self._slots.get(node)
+        if slot is None:
+            self._slots[node] = len(self._nodes)
+            self._nodes.append(node & 0xFFFFFFFF)
+            self._level.append(level)
+            self._armed.append(1)
+        else:
+            self._level[slot] = level
+
+    def update_many(self, readings: Iterable[tuple]):
+        """Record (node, level) pairs"""
+        for node, level in readings:
+            self.update(node, level)
+
+    def level(self, node: int) -> Optional[int]:
+        slot = self._slots.get(node)
+        if slot is None or self._level[slot] == UNKNOWN:
+            return None
+        return self._level[slot]
+
+    def evaluate(self, now: Optional[float] = None) -> List[BatteryEvent]:
+        """Check every node once; returns the nodes that should alert now"""
+        if not self._slots:
+            return []
+        now = self.clock() if now is None else now
+        slots = self._candidates_numpy() if self.use_numpy else self._candidates_python()
+        level, armed, nodes, cooldowns = self._level, self._armed, self._nodes, self.cooldowns
+        events = []
+        for slot in slots:
+            # Still armed if it is cooling down, so it alerts once the cooldown ends
+            if cooldowns.try_fire(COOLDOWN_TYPE, nodes[slot], now):
+                armed[slot] = 0
+                events.append(BatteryEvent(nodes[slot], level[slot]))
+        return events
+
+    def _candidates_numpy(self) -> List[int]:
+        """Re-arm recovered nodes; slots that are armed and at or below threshold"""
+        level = np.frombuffer(self._level, dtype=np.uint8)
+        armed = np.frombuffer(self._armed, dtype=np.uint8)
+        armed[(level >= self.rearm_level) & (level != UNKNOWN)] = 1
+        return np.nonzero((armed == 1) & (level <= self.threshold))[0].tolist()
+
+    def _candidates_python(self) -> List[int]:
+        level, armed = self._level, self._armed
+        threshold, rearm = self.threshold, self.rearm_level
+        slots = []
+        for slot in range(len(level)):
+            value = level[slot]
+            if value == UNKNOWN:
+                continue
+            if value >= rearm:
+                armed[slot] = 1
+            elif armed[slot] and value <= threshold:
+                slots.append(slot)
+        return slots
@@ -0,0 +1,212 @@
+"""
+One cooldown registry for every alert section
+
+The sections spell their cooldowns differently: cooldown_period and
+node_cooldown are seconds, node_cooldown_minutes and mute_duration_minutes
+are minutes. cooldown_seconds() normalises them all to seconds once, at
+config load, and CooldownRegistry keeps a single dict of
+(alert type, node) -> time the cooldown ends, so "may this fire?" is one
+dict lookup. Entries are not swept on a timer: an expired entry is dropped
+when it is next looked up, and the rest when a snapshot is written.
+
+Alert types are section names. An engine that needs several cooldowns per
+node adds a qualifier after a slash ("proximityAlert/home") and gets the
+section's duration. A node's noisyNodeAlert entry is also its auto-mute
+(alertlib.mute), so the two cannot disagree.
+
+The registry is snapshotted to disk as a marshal tuple of the type names
+and packed (type index, node, end time) records. A change is written at
+once unless the last write was under snapshot_interval seconds ago. Such
+a change is held back until maybe_snapshot() runs again, on the next change
+or from the bot's periodic tick. Call close() on shutdown to write
+anything still pending.
+
+The snapshot is reloaded on start, so a bot restarted by its systemd unit
+does not repeat every alert it just sent. End times are wall-clock epoch
+seconds so they carry across restarts.
+"""
+
+import marshal
+import math
+import struct
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Mapping, Optional, Tuple, Union
+
+from configlib.ini_writer import write_atomic
+from configlib.paths import state_dir
+
+COOLDOWN_FILE = "cooldowns.bin"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_INTERVAL = 60
+_RECORD = struct.Struct('<HII')  # type index, node number, end (epoch seconds)
+
+# section -> (key, seconds per unit)
+COOLDOWN_KEYS = {
+    'emergencyHandler': ('cooldown_period', 1),
+    'proximityAlert': ('node_cooldown', 1),
+    'altitudeAlert': ('cooldown_period', 1),
+    'batteryAlert': ('node_cooldown_minutes', 60),
+    'noisyNodeAlert': ('mute_duration_minutes', 60),
+}
+
+
+def default_cooldown_path() -> Path:
+    return state_dir() / COOLDOWN_FILE
+
+
+def cooldown_seconds(typed_config) -> Dict[str, float]:
+    """Every section's cooldown in seconds"""
+    return {section: float(getattr(getattr(typed_config, section), key) * scale)
+            for section, (key, scale) in COOLDOWN_KEYS.items()}
+
+
+class CooldownRegistry:
+    """(alert type, node) cooldowns with lazy expiry and periodic snapshots"""
+
+    def __init__(self, durations: Mapping[str, float], path: Optional[Union[str, Path]] = None,
+                 snapshot_interval: float = SNAPSHOT_INTERVAL,
+                 clock: Callable[[], float] = time.time):
+        self.durations = dict(durations)
+        self.path = Path(path) if path is not None else None
+        self.snapshot_interval = snapshot_interval
+        self.clock = clock
+
+        self._until: Dict[Tuple[str, int], float] = {}
+        self._dirty = False
+        self._saved_at = -math.inf  # the first change is written straight away
+        if self.path is not None:
+            self._load()
+
+    @classmethod
+    def from_config(cls, typed_config, path: Optional[Union[str, Path]] = None,
+                    **kwargs) -> "CooldownRegistry":
+        """Registry with every section's cooldown, persisted at path (default: state dir)"""
+        return cls(cooldown_seconds(typed_config),
+                   path=path if path is not None else default_cooldown_path(), **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+    def duration(self, alert_type: str) -> float:
+        """Cooldown in seconds for alert_type (its section's, for 'section/qualifier')"""
+        duration = self.durations.get(alert_type)
+        if duration is None:
+            duration = self.durations.get(alert_type.partition('/')[0], 0.0)
+        return duration
+
+    def may_fire(self, alert_type: str, node: int, now: Optional[float] = None) -> bool:
+        """True unless (alert_type, node) is cooling down"""
+        key = (alert_type, node)
+        until = self._until.get(key)
+        if until is None:
+            return True
+        if until > (self.clock() if now is None else now):
+            return False
+        del self._until[key]
+        return True
+
+    def ends_at(self, alert_type: str, node: int) -> Optional[float]:
+        """When (alert_type, node)'s cooldown ends, or None if it has none"""
+        return self._until.get((alert_type, node))
+
+    def entries(self, alert_type: str) -> Iterator[Tuple[int, float]]:
+        """(node, end time) for every cooldown of alert_type, expired or not"""
+        return ((node, until) for (kind, node), until in list(self._until.items())
+                if kind == alert_type)
+
+    def remaining(self, alert_type: str, node: int, now: Optional[float] = None) -> float:
+        """Seconds of cooldown left (0 if it may fire)"""
+        until = self._until.get((alert_type, node))
+        if until is None:
+            return 0.0
+        return max(0.0, until - (self.clock() if now is None else now))
+
+    def fire(self, alert_type: str, node: int, now: Optional[float] = None,
+             duration: Optional[float] = None) -> float:
+        """Start (alert_type, node)'s cooldown; returns when it ends"""
+        if now is None:
+            now = self.clock()
+        if duration is None:
+            duration = self.duration(alert_type)
+        if duration <= 0:
+            return now
+        until = now + duration
+        self._until[(alert_type, node)] = until
+        self._dirty = True
+        self.maybe_snapshot(now)
+        return until
+
+    def try_fire(self, alert_type: str, node: int, now: Optional[float] = None) -> bool:
+        """may_fire() and, if so, fire(); True if the alert should be sent"""
+        if now is None:
+            now = self.clock()
+        if not self.may_fire(alert_type, node, now):
+            return False
+        self.fire(alert_type, node, now)
+        return True
+
+    def reset(self, alert_type: str, node: int):
+        """End a cooldown early"""
+        if self._until.pop((alert_type, node), None) is not None:
+            self._dirty = True
+            self.maybe_snapshot()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def maybe_snapshot(self, now: Optional[float] = None):
+        """snapshot() if there are changes and snapshot_interval has passed
+
+        Call this from a periodic tick so a change held back by the
+        interval is written even if nothing else fires.
+        """
+        if now is None:
+            now = self.clock()
+        if self._dirty and now - self._saved_at >= self.snapshot_interval:
+            self.snapshot(now)
+
+    def flush(self):
+        """Write pending changes now, regardless of snapshot_interval"""
+        if self._dirty:
+            self.snapshot()
+
+    def close(self):
+        """Write pending changes before shutdown"""
+        self.flush()
+
+    def snapshot(self, now: Optional[float] = None):
+        """Drop expired entries and write the rest to path"""
+        if now is None:
+            now = self.clock()
+        self._until = {key: until for key, until in self._until.items() if until > now}
+        self._saved_at = now
+        self._dirty = False
+        if self.path is None:
+            return
+
+        types: Dict[str, int] = {}
+        records = bytearray()
+        for (alert_type, node), until in self._until.items():
+            index = types.setdefault(alert_type, len(types))
+            records += _RECORD.pack(index, node & 0xFFFFFFFF, min(int(math.ceil(until)), 0xFFFFFFFF))
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path, marshal.dumps((SNAPSHOT_VERSION, tuple(types), bytes(records))))
+        except OSError:
+            pass
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                version, types, records = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if version != SNAPSHOT_VERSION or len(records) % _RECORD.size:
+            return
+
+        now = self.clock()
+        for index, node, until in _RECORD.iter_unpack(records):
+            if until > now and index < len(types):
+                self._until[(types[index], node)] = float(until)
@@ -0,0 +1,121 @@
+"""
+Disconnect detection with a lazy deadline heap
+
+[disconnectAlert] reports nodes not heard for offline_threshold_minutes.
+Scanning every node's last-seen time each minute is O(N) per tick forever.
+DisconnectMonitor keeps a min-heap of (deadline, node) instead:
+
+- heard() just stores the node's last-seen time; a heap entry is pushed
+  only if the node has none (e.g. after going offline), so a packet from a
+  node that is already queued costs a dict write.
+- check() pops only entries whose deadline has passed. If the node was
+  heard since the entry was pushed, it is pushed back with its real
+  deadline; otherwise the node is reported offline.
+
+Each node has at most one heap entry, so a tick touches only nodes whose
+deadline actually passed and memory is one entry per monitored node.
+"""
+
+import heapq
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+OFFLINE = 'offline'
+ONLINE = 'online'
+
+
+class DisconnectEvent(NamedTuple):
+    """A monitored node going offline or coming back"""
+    kind: str
+    node: int
+    silent_seconds: float
+
+
+class DisconnectMonitor:
+    """Offline detection for monitored nodes (all nodes if none are listed)"""
+
+    def __init__(self, threshold_seconds: float, monitor_nodes: Iterable[int] = (),
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold_seconds
+        self.monitor_nodes = frozenset(monitor_nodes)
+        self.clock = clock
+        self.send_admin_dm = False
+
+        self._last_seen: Dict[int, float] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._queued: Set[int] = set()
+        self._offline: Set[int] = set()
+
+        # Listed nodes are expected from the start, so one that is never
+        # heard is reported after the threshold too
+        now = self.clock()
+        for node in self.monitor_nodes:
+            self.heard(node, now)
+
+    @classmethod
+    def from_config(cls, typed_config, **kwargs) -> "DisconnectMonitor":
+        section = typed_config.disconnectAlert
+        monitor = cls(section.offline_threshold_minutes * 60,
+                      monitor_nodes=section.monitor_nodes, **kwargs)
+        monitor.send_admin_dm = section.send_admin_dm
+        return monitor
+
+    def __len__(self) -> int:
+        return len(self._last_seen)
+
+    def monitors(self, node: int) -> bool:
+        return not self.monitor_nodes or node in self.monitor_nodes
+
+    def heard(self, node: int, now: Optional[float] = None) -> Optional[DisconnectEvent]:
+        """Record a packet from node; returns an 'online' event if it was offline"""
+        if self.monitor_nodes and node not in self.monitor_nodes:
+            return None
+        if now is None:
+            now = self.clock()
+
+        previous = self._last_seen.get(node)
+        self._last_seen[node] = now
+        if node not in self._queued:
+            self._queued.add(node)
+            heapq.heappush(self._heap, (now + self.threshold, node))
+
+        if node in self._offline:
+            self._offline.discard(node)
+            return DisconnectEvent(ONLINE, node, now - previous if previous is not None else 0.0)
+        return None
+
+    def check(self, now: Optional[float] = None) -> List[DisconnectEvent]:
+        """Report nodes whose offline deadline passed since the last check"""
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        events = []
+        while heap and heap[0][0] <= now:
+            _, node = heapq.heappop(heap)
+            last = self._last_seen.get(node)
+            if last is None:
+                self._queued.discard(node)  # forgotten
+                continue
+            deadline = last + self.threshold
+            if deadline > now:
+                heapq.heappush(heap, (deadline, node))  # heard since: requeue
+                continue
+            self._queued.discard(node)
+            self._offline.add(node)
+            events.append(DisconnectEvent(OFFLINE, node, now - last))
+        return events
+
+    def next_deadline(self) -> Optional[float]:
+        """Earliest time check() could report something (for sleeping until then)"""
+        return self._heap[0][0] if self._heap else None
+
+    def offline_nodes(self) -> Set[int]:
+        return set(self._offline)
+
+    def last_seen(self, node: int) -> Optional[float]:
+        return self._last_seen.get(node)
+
+    def forget(self, node: int):
+        """Stop monitoring a node; its heap entry is discarded when popped"""
+        self._last_seen.pop(node, None)
+        self._offline.discard(node)
@@ -0,0 +1,211 @@
+"""
+Priority dispatch queue between the alert engines and the senders
+
+[alertGlobal] assigns priorities from 1 (general) to 4 (emergency).
+DispatchQueue holds pending alerts in one deque per priority, each in
+queueing order, and always hands out the oldest alert of the highest
+non-empty priority, so an emergency queued behind a backlog of proximity
+alerts goes out next.
+
+- Coalescing: an alert with the same (type, node, channel) as one still
+  pending is merged into it. The pending alert keeps its place, takes the
+  newest message and counts the repeats. If the repeat has a higher
+  priority it moves up to that priority, still ordered by when it was
+  first queued, so it goes out ahead of alerts queued after it there.
+- Bounded: at capacity, the oldest alert of the lowest priority below the
+  new alert's is shed to make room. If nothing queued is lower, the new
+  alert is the one shed.
+- Metrics: depth per priority, totals for queued, coalesced, shed and
+  dispatched alerts, and the mean and maximum wait from queueing to dispatch.
+
+Engines call put() and sender threads call get(), which can block until an
+alert arrives; the queue is thread-safe.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+PRIORITIES = (1, 2, 3, 4)
+DEFAULT_CAPACITY = 200
+
+# Alert sections with their own priority key in [alertGlobal]; every other
+# type uses general_priority
+PRIORITY_KEYS = {
+    'emergencyHandler': 'emergency_priority',
+    'weatherAlert': 'weather_priority',
+    'proximityAlert': 'proximity_priority',
+}
+
+
+class Dispatch(NamedTuple):
+    """An alert handed to a sender"""
+    alert_type: str
+    node: Optional[int]
+    channel: Optional[int]
+    message: str
+    priority: int
+    count: int          # alerts coalesced into this one (1 = no repeats)
+    waited: float       # seconds since it was first queued
+
+
+class DispatchMetrics(NamedTuple):
+    depth: Dict[int, int]   # pending alerts per priority
+    queued: int
+    coalesced: int
+    shed: int
+    dispatched: int
+    mean_wait: float
+    max_wait: float
+
+
+class _Pending:
+    __slots__ = ('key', 'message', 'priority', 'count', 'queued_at', 'seq', 'live')
+
+    def __init__(self, key: Tuple[str, Any, Any], message: str, priority: int,
+                 queued_at: float, seq: int, count: int = 1):
+        self.key = key
+        self.message = message
+        self.priority = priority
+        self.count = count
+        self.queued_at = queued_at
+        self.seq = seq          # queueing order, kept when the alert moves up
+        self.live = True
+
+
+class DispatchQueue:
+    """Bounded per-priority alert queue with coalescing and shedding"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, priorities: Optional[Dict[str, int]] = None,
+                 general_priority: int = 1, clock: Callable[[], float] = time.monotonic):
+        self.capacity = max(1, capacity)
+        self.priorities = dict(priorities or {})
+        self.general_priority = general_priority
+        self.clock = clock
+
+        self._queues: Dict[int, Deque[_Pending]] = {p: deque() for p in PRIORITIES}
+        self._depth = dict.fromkeys(PRIORITIES, 0)   # live entries per priority
+        self._pending: Dict[Tuple[str, Any, Any], _Pending] = {}
+        self._cond = threading.Condition()
+        self._seq = 0
+
+        self._queued = self._coalesced = self._shed = self._dispatched = 0
+        self._total_wait = self._max_wait = 0.0
+
+    @classmethod
+    def from_config(cls, typed_config, **kwargs) -> "DispatchQueue":
+        section = typed_config.alertGlobal
+        priorities = {alert_type: getattr(section, key) for alert_type, key in PRIORITY_KEYS.items()}
+        return cls(priorities=priorities, general_priority=section.general_priority, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def priority_for(self, alert_type: str) -> int:
+        return self.priorities.get(alert_type, self.general_priority)
+
+    def put(self, alert_type: str, message: str, node: Optional[int] = None,
+            channel: Optional[int] = None, priority: Optional[int] = None) -> bool:
+        """Queue an alert; returns False if it was shed because the queue is full"""
+        if priority is None:
+            priority = self.priority_for(alert_type)
+        priority = min(max(priority, PRIORITIES[0]), PRIORITIES[-1])
+        key = (alert_type, node, channel)
+
+        with self._cond:
+            now = self.clock()
+            pending = self._pending.get(key)
+            if pending is not None:
+                self._coalesced += 1
+                pending.message = message
+                pending.count += 1
+                if priority > pending.priority:
+                    # Move up: the old deque entry is skipped when reached
+                    pending.live = False
+                    self._depth[pending.priority] -= 1
+                    pending = _Pending(key, message, priority, pending.queued_at, pending.seq,
+                                       pending.count)
+                    self._pending[key] = pending
+                    self._insert(pending)
+                return True
+
+            if len(self._pending) >= self.capacity and not self._shed_below(priority):
+                self._shed += 1
+                return False
+            self._seq += 1
+            pending = _Pending(key, message, priority, now, self._seq)
+            self._pending[key] = pending
+            self._append(pending)
+            self._queued += 1
+            self._cond.notify()
+            return True
+
+    def _append(self, pending: _Pending):
+        self._queues[pending.priority].append(pending)
+        self._depth[pending.priority] += 1
+
+    def _insert(self, pending: _Pending):
+        """Put a moved-up alert in its queue by seq, behind anything queued before it"""
+        queue = self._queues[pending.priority]
+        index = len(queue)
+        while index and queue[index - 1].seq > pending.seq:
+            index -= 1
+        queue.insert(index, pending)
+        self._depth[pending.priority] += 1
+
+    def _pop_live(self, priority: int) -> Optional[_Pending]:
+        queue = self._queues[priority]
+        while queue:
+            pending = queue.popleft()
+            if pending.live:
+                self._depth[priority] -= 1
+                del self._pending[pending.key]
+                return pending
+        return None
+
+    def _shed_below(self, priority: int) -> bool:
+        """Drop the oldest alert of the lowest priority below priority"""
+        for level in PRIORITIES:
+            if level >= priority:
+                break
+            if self._depth[level] and self._pop_live(level) is not None:
+                self._shed += 1
+                return True
+        return False
+
+    def get(self, block: bool = False, timeout: Optional[float] = None) -> Optional[Dispatch]:
+        """Next alert by priority, then age; None if empty (after timeout when blocking)"""
+        with self._cond:
+            if block and not self._pending:
+                self._cond.wait_for(lambda: self._pending, timeout)
+            for level in reversed(PRIORITIES):
+                if not self._depth[level]:
+                    continue
+                pending = self._pop_live(level)
+                if pending is None:
+                    continue
+                waited = max(0.0, self.clock() - pending.queued_at)
+                self._dispatched += 1
+                self._total_wait += waited
+                if waited > self._max_wait:
+                    self._max_wait = waited
+                alert_type, node, channel = pending.key
+                return Dispatch(alert_type, node, channel, pending.message,
+                                pending.priority, pending.count, waited)
+            return None
+
+    def drain(self) -> List[Dispatch]:
+        """Every pending alert in dispatch order"""
+        alerts = []
+        while True:
+            alert = self.get()
+            if alert is None:
+                return alerts
+            alerts.append(alert)
+
+    def metrics(self) -> DispatchMetrics:
+        with self._cond:
+            mean = self._total_wait / self._dispatched if self._dispatched else 0.0
+            return DispatchMetrics(dict(self._depth), self._queued, self._coalesced, self._shed,
+                                   self._dispatched, mean, self._max_wait)
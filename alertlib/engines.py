@@ -0,0 +1,272 @@
+"""
+Every alert engine, built from config.ini in one place
+
+load_engines() is the bot's single entry point into alertlib. It reads the
+typed config through configlib.config_snapshot (the precompiled snapshot
+while it is current, the INI otherwise), builds the engine of every enabled
+section once with its from_config(), and joins them into one alert path:
+
+    packet -> engine -> cooldown -> quiet hours -> rate limit
+           -> alert log -> DispatchQueue -> sender
+
+The packet handler feeds AlertEngines with on_packet(), on_text(),
+on_position() and on_telemetry(); tick(), called from the bot's main loop,
+runs the periodic checks (altitude, proximity and battery at their
+check_interval, disconnects, welcomes and mute expiry every time) and saves
+state now and then. Alerts that get through are read by the senders with
+engines.dispatch.get().
+
+Emergency-priority alerts are sent during quiet hours; everything else is
+dropped until they end. Every per-node cooldown, auto-mutes included, is
+kept in the one CooldownRegistry. close() writes the log files and saves
+cooldowns, seen nodes and rate-limit buckets; it is registered with atexit, so
+a bot that exits without calling it still keeps its state.
+
+    engines = load_engines(meshing_path / "config.ini")
+    if engines.on_packet(node, snr=packet_snr, is_dm=is_dm):
+        engines.on_text(node, text)
+"""
+
+import atexit
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+
+from alertlib.alert_log import URGENT_PRIORITY, AlertLog
+from alertlib.altitude import AltitudeEngine
+from alertlib.battery import BatteryStore
+from alertlib.cooldowns import CooldownRegistry
+from alertlib.disconnect import OFFLINE, DisconnectMonitor
+from alertlib.dispatch import DispatchQueue
+from alertlib.keyword_alerts import keyword_engine
+from alertlib.mute import MuteTable
+from alertlib.noisy import NoisyNodeDetector
+from alertlib.proximity import ENTER, ProximityEngine
+from alertlib.quiet_hours import QuietHours
+from alertlib.rate_limit import RateLimiter
+from alertlib.seen_nodes import WelcomeScheduler
+from alertlib.snr import SnrMonitor
+from configlib.config_snapshot import load_config_fast
+
+SAVE_INTERVAL = 300  # seconds between periodic saves of the rate-limit buckets
+
+EMERGENCY_MESSAGE = "Emergency from {node_name}: {text}"
+
+
+class _KeepMissing(dict):
+    """format_map() mapping that leaves unknown {placeholders} as written"""
+
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+
+def _render(template: str, **fields) -> str:
+    return template.format_map(_KeepMissing(fields))
+
+
+def default_node_name(node: int) -> str:
+    """Meshtastic's '!hex' form, for bots without a node database"""
+    return f"!{node & 0xFFFFFFFF:08x}"
+
+
+class AlertEngines:
+    """The enabled alert engines of one config, behind one alert path"""
+
+    def __init__(self, typed_config, errors: Iterable[str] = (), base_dir: Union[str, Path] = '.',
+                 node_name: Callable[[int], str] = default_node_name,
+                 clock: Callable[[], float] = time.monotonic):
+        self.config = typed_config
+        self.errors = list(errors)
+        self.node_name = node_name
+        self.clock = clock
+        c = typed_config
+
+        # Shared by every section
+        self.cooldowns = CooldownRegistry.from_config(c)
+        self.quiet_hours = QuietHours.from_config(c)
+        self.rate_limiter = RateLimiter.from_config(c)
+        self.dispatch = DispatchQueue.from_config(c)
+        self.log = AlertLog.from_config(c, base_dir=base_dir)
+
+        # One engine per enabled section (None when it is off)
+        self.keywords = keyword_engine(c)
+        self.proximity = (ProximityEngine.from_config(c, cooldowns=self.cooldowns)
+                          if c.proximityAlert.enabled else None)
+        self.altitude = (AltitudeEngine.from_config(c, cooldowns=self.cooldowns)
+                         if c.altitudeAlert.enabled else None)
+        self.noisy = (NoisyNodeDetector.from_config(c, cooldowns=self.cooldowns)
+                      if c.noisyNodeAlert.enabled else None)
+        self.mutes = (MuteTable.from_config(c, cooldowns=self.cooldowns)
+                      if c.noisyNodeAlert.enabled and c.noisyNodeAlert.auto_mute else None)
+        self.battery = (BatteryStore.from_config(c, cooldowns=self.cooldowns)
+                        if c.batteryAlert.enabled else None)
+        self.snr = SnrMonitor.from_config(c) if c.snrAlert.enabled else None
+        self.disconnect = DisconnectMonitor.from_config(c) if c.disconnectAlert.enabled else None
+        self.welcomes = WelcomeScheduler.from_config(c) if c.newNodeAlert.enabled else None
+
+        self._positions: Dict[int, Tuple[float, float]] = {}  # reported since the last check
+        self._next_run: Dict[str, float] = {'save': clock() + SAVE_INTERVAL}
+        self._closed = False
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Alert path
+    # ------------------------------------------------------------------
+
+    def emit(self, alert_type: str, message: str, node: Optional[int] = None,
+             channel: Optional[int] = None) -> bool:
+        """Log and queue an alert unless it is off, in quiet hours or over the rate limit"""
+        if not self.config.alertGlobal.global_enabled:
+            return False
+        priority = self.dispatch.priority_for(alert_type)
+        if priority < URGENT_PRIORITY and self.quiet_hours.is_quiet():
+            return False
+        if not self.rate_limiter.admit(alert_type):
+            return False
+        self.log.log_alert(alert_type, message, priority)
+        return self.dispatch.put(alert_type, message, node, channel, priority)
+
+    # ------------------------------------------------------------------
+    # Packet handlers
+    # ------------------------------------------------------------------
+
+    def on_packet(self, node: int, snr: Optional[float] = None, is_dm: bool = False) -> bool:
+        """Note any packet from node; False if node is muted and the packet should be ignored"""
+        if self.mutes is not None and self.mutes.is_muted(node):
+            return False
+        c = self.config
+        name = self.node_name(node)
+
+        if self.noisy is not None:
+            event = self.noisy.record(node)
+            if event is not None:
+                section = c.noisyNodeAlert
+                self.emit('noisyNodeAlert', _render(section.alert_message, node_name=name,
+                                                    count=event.count, period=event.period_minutes),
+                          node, section.alert_channel)
+                if self.mutes is not None:
+                    self.mutes.mute(node)
+        if self.snr is not None:
+            event = self.snr.observe(node, snr, is_dm)
+            if event is not None:
+                section = c.snrAlert
+                self.emit('snrAlert', _render(section.alert_message, node_name=name, snr=event.value),
+                          node, section.alert_channel)
+        if self.disconnect is not None:
+            self.disconnect.heard(node)
+        if self.welcomes is not None:
+            self.welcomes.heard(node)
+        return True
+
+    def on_text(self, node: int, text: str) -> int:
+        """Check a text message for emergency and custom keywords; returns alerts queued"""
+        hits = self.keywords.scan(text)
+        if not hits:
+            return 0
+        name = self.node_name(node)
+        queued = 0
+        if hits.emergency and self.cooldowns.try_fire('emergencyHandler', node):
+            section = self.config.emergencyHandler
+            queued += self.emit('emergencyHandler', _render(EMERGENCY_MESSAGE, node_name=name, text=text),
+                                node, section.alert_channel)
+        for hit in hits.custom:
+            queued += self.emit('customAlert', self.keywords.render_response(hit, node_name=name),
+                                node, self.config.customAlert.alert_channel)
+        return queued
+
+    def on_position(self, node: int, latitude: float, longitude: float,
+                    altitude: Optional[float] = None):
+        """Record a position report; it is checked at the next proximity/altitude check"""
+        if self.proximity is not None:
+            self._positions[node] = (latitude, longitude)
+        if self.altitude is not None:
+            self.altitude.update(node, altitude)
+
+    def on_telemetry(self, node: int, battery_level: Optional[int] = None):
+        """Record device telemetry; battery levels are checked every check_interval_minutes"""
+        if self.battery is not None:
+            self.battery.update(node, battery_level)
+
+    # ------------------------------------------------------------------
+    # Periodic work
+    # ------------------------------------------------------------------
+
+    def _due(self, name: str, interval: float, now: float) -> bool:
+        if now < self._next_run.get(name, now):
+            return False
+        self._next_run[name] = now + interval
+        return True
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Run whatever periodic checks are due; returns the number of alerts queued"""
+        if now is None:
+            now = self.clock()
+        c = self.config
+        queued = 0
+
+        if self.proximity is not None and self._due('proximity', c.proximityAlert.check_interval, now):
+            positions, self._positions = self._positions, {}
+            section = c.proximityAlert
+            for event in self.proximity.evaluate(positions):
+                if event.kind == ENTER:
+                    message = _render(section.alert_message, node_name=self.node_name(event.node),
+                                      distance=round(event.distance_m), fence=event.fence.name)
+                    queued += self.emit('proximityAlert', message, event.node, section.alert_channel)
+        if self.altitude is not None and self._due('altitude', c.altitudeAlert.check_interval, now):
+            section = c.altitudeAlert
+            for event in self.altitude.tick():
+                message = _render(section.alert_message, node_name=self.node_name(event.node),
+                                  altitude=round(event.altitude))
+                queued += self.emit('altitudeAlert', message, event.node, section.alert_channel)
+        if self.battery is not None and self._due('battery', c.batteryAlert.check_interval_minutes * 60, now):
+            section = c.batteryAlert
+            for event in self.battery.evaluate():
+                message = _render(section.alert_message, node_name=self.node_name(event.node),
+                                  battery=event.level)
+                queued += self.emit('batteryAlert', message, event.node, section.alert_channel)
+        if self.disconnect is not None:
+            section = c.disconnectAlert
+            for event in self.disconnect.check():
+                if event.kind == OFFLINE:
+                    message = _render(section.alert_message, node_name=self.node_name(event.node),
+                                      duration=round(event.silent_seconds / 60))
+                    queued += self.emit('disconnectAlert', message, event.node, section.alert_channel)
+        if self.welcomes is not None:
+            section = c.newNodeAlert
+            channel = None if section.send_as_dm else section.announcement_channel
+            for node in self.welcomes.due():
+                message = _render(section.welcome_message, node_name=self.node_name(node))
+                queued += self.emit('newNodeAlert', message, node, channel)
+        if self.mutes is not None:
+            self.mutes.expire()
+
+        self.cooldowns.maybe_snapshot()
+        if self._due('save', SAVE_INTERVAL, now):
+            self.rate_limiter.save()
+        return queued
+
+    def close(self):
+        """Write the alert logs and save all persistent state (safe to call twice)"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self.log.close()
+        self.cooldowns.close()
+        self.rate_limiter.save()
+        if self.welcomes is not None:
+            self.welcomes.seen.close()
+
+
+def load_engines(config_file: Union[str, Path], base_dir: Optional[Union[str, Path]] = None,
+                 **kwargs) -> AlertEngines:
+    """AlertEngines for config_file; alert log paths are relative to base_dir
+
+    base_dir defaults to the directory holding config_file (the bot's own
+    directory). Config errors do not stop the load: the offending keys keep
+    their defaults and the messages are in engines.errors.
+    """
+    config_file = Path(config_file)
+    typed, errors = load_config_fast(config_file)
+    return AlertEngines(typed, errors, config_file.parent if base_dir is None else base_dir, **kwargs)
+
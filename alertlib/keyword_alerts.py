@@ -0,0 +1,108 @@
+"""
+Keyword alerts: [emergencyHandler] and [customAlert] in one pass
+
+Both sections trigger on words in inbound text. Rather than one matcher per
+section, KeywordAlertEngine compiles emergency_keywords and the customAlert
+keywords into a single tagged automaton (alertlib.keywords) when the config
+is loaded. Each message is case-folded once and scanned once, and the hits
+are split by tag, so enabling custom alerts adds no second pass.
+
+customAlert.case_sensitive applies to the custom keywords only; emergency
+keywords always match regardless of case.
+
+    engine = keyword_engine(typed_config)
+    hits = engine.scan(text)
+    for hit in hits.custom:
+        reply = engine.render_response(hit, node_name=name)
+"""
+
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Tuple
+
+from alertlib.keywords import KeywordMatch, KeywordMatcher, fold
+
+EMERGENCY = 'emergency'
+CUSTOM = 'custom'
+
+DEFAULT_RESPONSE = "Alert triggered by {node_name}: {keyword}"
+
+
+class KeywordHits(NamedTuple):
+    """Keyword matches in one message, split by alert type"""
+    emergency: Tuple[KeywordMatch, ...]
+    custom: Tuple[KeywordMatch, ...]
+
+    def __bool__(self) -> bool:
+        return bool(self.emergency or self.custom)
+
+
+class _KeepMissing(dict):
+    """format_map() mapping that leaves unknown {placeholders} as written"""
+
+    def __missing__(self, key):
+        return '{' + key + '}'
+
+
+class KeywordAlertEngine:
+    """Shared automaton for emergency and custom keyword alerts"""
+
+    def __init__(self, emergency_keywords: Iterable[str] = (),
+                 custom_keywords: Iterable[str] = (), case_sensitive: bool = False,
+                 response_message: str = DEFAULT_RESPONSE):
+        self.response_message = response_message
+        specs = [(k, EMERGENCY, False) for k in emergency_keywords]
+        specs += [(k, CUSTOM, case_sensitive) for k in custom_keywords]
+        self.matcher = KeywordMatcher(specs)
+
+    @classmethod
+    def from_config(cls, typed_config) -> "KeywordAlertEngine":
+        """Engine for the enabled keyword sections of a TypedConfig"""
+        emergency = typed_config.emergencyHandler
+        custom = typed_config.customAlert
+        return cls(
+            emergency.emergency_keywords if emergency.enabled else (),
+            custom.keywords if custom.enabled else (),
+            case_sensitive=custom.case_sensitive,
+            response_message=custom.response_message,
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.matcher)
+
+    def scan(self, text: str) -> KeywordHits:
+        """All emergency and custom keyword matches in text (one pass)"""
+        if not self.matcher:
+            return KeywordHits((), ())
+        emergency = []
+        custom = []
+        for hit in self.matcher.finditer(text, fold(text)):
+            (emergency if hit.tag == EMERGENCY else custom).append(hit)
+        return KeywordHits(tuple(emergency), tuple(custom))
+
+    def render_response(self, hit: KeywordMatch, **fields) -> str:
+        """response_message for a custom hit; {keyword} is the configured keyword
+
+        Extra fields (node_name, node_id, ...) fill the other placeholders;
+        placeholders without a value are left in place.
+        """
+        values = _KeepMissing(fields)
+        values.setdefault('keyword', hit.keyword)
+        return self.response_message.format_map(values)
+
+
+@lru_cache(maxsize=4)
+def _cached_engine(emergency: Tuple[str, ...], custom: Tuple[str, ...],
+                   case_sensitive: bool, response_message: str) -> KeywordAlertEngine:
+    return KeywordAlertEngine(emergency, custom, case_sensitive, response_message)
+
+
+def keyword_engine(typed_config) -> KeywordAlertEngine:
+    """KeywordAlertEngine for a TypedConfig, rebuilt only when keywords change"""
+    emergency = typed_config.emergencyHandler
+    custom = typed_config.customAlert
+    return _cached_engine(
+        tuple(emergency.emergency_keywords) if emergency.enabled else (),
+        tuple(custom.keywords) if custom.enabled else (),
+        custom.case_sensitive,
+        custom.response_message,
+    )
@@ -0,0 +1,186 @@
+"""
+Multi-keyword matching (Aho-Corasick)
+
+Checking every keyword against every message costs keywords x length on the
+bot's hottest path. KeywordMatcher compiles all keywords into one automaton
+when the config is loaded and then finds every keyword in a single pass over
+the message, so the cost per message depends on its length, not on how many
+keywords are configured.
+
+Matching is case-insensitive and, by default, on word boundaries: "help"
+matches "need help!" but not "helpful". Each keyword can carry a tag (e.g.
+the alert type it belongs to), so one automaton can serve several alert
+types at once, and can be marked case-sensitive: the automaton always runs
+on the folded text and case-sensitive hits are then checked against the
+original slice, so mixing both kinds still costs one pass.
+
+    matcher = KeywordMatcher(['sos', 'mayday', 'need help'])
+    hit = matcher.search("MAYDAY mayday")
+    hit.keyword, hit.start  ->  ('mayday', 0)
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+KeywordSpec = Union[str, Tuple[str, Any], Tuple[str, Any, bool]]
+
+
+class KeywordMatch(NamedTuple):
+    """One keyword occurrence; start/end index the original message"""
+    keyword: str
+    start: int
+    end: int
+    tag: Any = None
+
+
+def fold(text: str) -> str:
+    """Lower-case text without changing its length, so offsets stay valid
+
+    str.lower() keeps the length of nearly all text; the rare characters
+    that expand (e.g. 'İ') are left as they are instead.
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == '_'
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed set of keywords"""
+
+    def __init__(self, keywords: Iterable[KeywordSpec], word_boundary: bool = True,
+                 case_sensitive: bool = False):
+        """keywords are strings or (keyword, tag[, case_sensitive]) tuples;
+        case_sensitive is the default for entries that do not say"""
+        self.word_boundary = word_boundary
+        self.patterns: List[Tuple[str, Any]] = []
+        self._exact: List[bool] = []
+        seen = set()
+        for spec in keywords:
+            if isinstance(spec, str):
+                keyword, tag, exact = spec, None, case_sensitive
+            else:
+                keyword, tag = spec[0], spec[1]
+                exact = spec[2] if len(spec) > 2 else case_sensitive
+            keyword = keyword.strip()
+            key = (keyword if exact else fold(keyword), tag, exact)
+            if keyword and key not in seen:
+                seen.add(key)
+                self.patterns.append((keyword, tag))
+                self._exact.append(exact)
+
+        # State 0 is the root. goto[s] maps a character to the next state,
+        # out[s] lists the patterns ending at s (including via fail links).
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._lengths: List[int] = []
+        self._build()
+
+    def _build(self):
+        goto, out = self._goto, self._out
+        for index, (keyword, _) in enumerate(self.patterns):
+            folded = fold(keyword)
+            self._lengths.append(len(folded))
+            state = 0
+            for c in folded:
+                nxt = goto[state].get(c)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][c] = nxt
+                    goto.append({})
+                    self._fail.append(0)
+                    out.append(())
+                state = nxt
+            out[state] = out[state] + (index,)
+
+        # Breadth-first: fail links point to the longest proper suffix that
+        # is also a trie path; outputs are merged along them
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for c, nxt in goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and c not in goto[f]:
+                    f = self._fail[f]
+                target = goto[f].get(c, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if out[self._fail[nxt]]:
+                    out[nxt] = out[nxt] + out[self._fail[nxt]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    @property
+    def keywords(self) -> List[str]:
+        return [keyword for keyword, _ in self.patterns]
+
+    def _scan(self, folded: str) -> Iterator[Tuple[int, int]]:
+        """Yield (pattern index, end) for every raw occurrence in folded text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, c in enumerate(folded):
+            while state and c not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(c, 0)
+            if out[state]:
+                for index in out[state]:
+                    yield index, i + 1
+
+    def finditer(self, text: str, folded: Optional[str] = None) -> Iterator[KeywordMatch]:
+        """Yield every keyword occurrence in text, in order of where it ends
+
+        folded may be passed when the caller already has fold(text), so
+        several matchers can share the per-message normalisation.
+        """
+        if not self.patterns:
+            return
+        if folded is None:
+            folded = fold(text)
+        boundary = self.word_boundary
+        exact = self._exact
+        size = len(folded)
+        for index, end in self._scan(folded):
+            start = end - self._lengths[index]
+            if boundary and ((start > 0 and _is_word_char(folded[start - 1]) and
+                              _is_word_char(folded[start])) or
+                             (end < size and _is_word_char(folded[end]) and
+                              _is_word_char(folded[end - 1]))):
+                continue
+            keyword, tag = self.patterns[index]
+            if exact[index] and text[start:end] != keyword:
+                continue
+            yield KeywordMatch(keyword, start, end, tag)
+
+    def findall(self, text: str, folded: Optional[str] = None) -> List[KeywordMatch]:
+        """All keyword occurrences in text"""
+        return list(self.finditer(text, folded))
+
+    def search(self, text: str, folded: Optional[str] = None) -> Optional[KeywordMatch]:
+        """The first keyword occurrence in text, or None"""
+        return next(self.finditer(text, folded), None)
+
+
+@lru_cache(maxsize=8)
+def _compile(keywords: Tuple[str, ...], word_boundary: bool) -> KeywordMatcher:
+    return KeywordMatcher(keywords, word_boundary=word_boundary)
+
+
+def compile_keywords(keywords: Sequence[str], word_boundary: bool = True) -> KeywordMatcher:
+    """KeywordMatcher for a keyword list, reused while the list is unchanged"""
+    return _compile(tuple(keywords), word_boundary)
+
+
+def emergency_matcher(typed_config) -> KeywordMatcher:
+    """Matcher for [emergencyHandler] emergency_keywords of a TypedConfig"""
+    return compile_keywords(typed_config.emergencyHandler.emergency_keywords)
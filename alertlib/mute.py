@@ -0,0 +1,149 @@
+"""
+Auto-mute table for noisy nodes
+
+With [noisyNodeAlert] auto_mute on, a noisy node is muted for
+mute_duration_minutes. A mute is the node's noisyNodeAlert cooldown in the
+shared CooldownRegistry, the same entry that stops a node's noisy alert
+repeating, so the duration, the "is this node muted?" lookup (one dict
+lookup per inbound packet) and the persistence across restarts all live
+there; MuteTable keeps no expiry times of its own.
+
+What it adds is reporting mutes as they run out. Each mute is filed in a
+hashed timer wheel slot for its expiry tick, and expire() only visits the
+slots for the ticks that passed since the last call. Entries for later
+rounds stay put, entries made stale by a re-mute are dropped when their
+slot comes up and an unmute takes its entry out, so expiry is amortised
+O(1) with no scans of the whole table. On start the wheel is refilled
+from the registry's reloaded snapshot, so a restart does not unmute every
+flooding node.
+"""
+
+import math
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from alertlib.cooldowns import CooldownRegistry
+
+COOLDOWN_TYPE = 'noisyNodeAlert'
+TICK_SECONDS = 60
+WHEEL_SLOTS = 64
+
+
+class MuteTable:
+    """Muted nodes, kept in a CooldownRegistry, with timer-wheel expiry"""
+
+    def __init__(self, cooldowns: CooldownRegistry, tick_seconds: float = TICK_SECONDS,
+                 slots: int = WHEEL_SLOTS, clock: Optional[Callable[[], float]] = None):
+        self.cooldowns = cooldowns
+        self.tick_seconds = tick_seconds
+        self.clock = clock if clock is not None else cooldowns.clock
+
+        self._wheel: List[List[Tuple[int, float]]] = [[] for _ in range(slots)]
+        now = self.clock()
+        self._tick = int(now // tick_seconds)
+        for node, expiry in cooldowns.entries(COOLDOWN_TYPE):
+            if expiry > now:
+                self._file(node, expiry)
+
+    @classmethod
+    def from_config(cls, typed_config, cooldowns: Optional[CooldownRegistry] = None,
+                    **kwargs) -> "MuteTable":
+        """Table for [noisyNodeAlert] (default: a registry persisted in the state dir)"""
+        if cooldowns is None:
+            cooldowns = CooldownRegistry.from_config(typed_config)
+        return cls(cooldowns, **kwargs)
+
+    @property
+    def default_duration(self) -> float:
+        """mute_duration_minutes in seconds, as the registry has it"""
+        return self.cooldowns.duration(COOLDOWN_TYPE)
+
+    def __len__(self) -> int:
+        now = self.clock()
+        return sum(1 for _, expiry in self.cooldowns.entries(COOLDOWN_TYPE) if expiry > now)
+
+    def __contains__(self, node: int) -> bool:
+        return self.is_muted(node)
+
+    def is_muted(self, node: int, now: Optional[float] = None) -> bool:
+        """True while node is muted (one dict lookup)"""
+        return not self.cooldowns.may_fire(COOLDOWN_TYPE, node, now)
+
+    def remaining(self, node: int, now: Optional[float] = None) -> float:
+        """Seconds of mute left for node (0 if not muted)"""
+        return self.cooldowns.remaining(COOLDOWN_TYPE, node, now)
+
+    def _file(self, node: int, expiry: float):
+        # Never file into a tick expire() has already processed
+        tick = max(int(math.ceil(expiry / self.tick_seconds)), self._tick + 1)
+        self._wheel[tick % len(self._wheel)].append((node, expiry))
+
+    def mute(self, node: int, duration: Optional[float] = None,
+             now: Optional[float] = None) -> float:
+        """Mute node for duration seconds (default_duration); returns the expiry"""
+        if now is None:
+            now = self.clock()
+        expiry = self.cooldowns.fire(COOLDOWN_TYPE, node, now, duration)
+        if expiry > now:
+            self._file(node, expiry)
+        return expiry
+
+    def unmute(self, node: int) -> bool:
+        """Unmute node early, taking its entry out of the wheel"""
+        expiry = self.cooldowns.ends_at(COOLDOWN_TYPE, node)
+        if expiry is None:
+            return False
+        self.cooldowns.reset(COOLDOWN_TYPE, node)
+        slot = self._wheel[int(math.ceil(expiry / self.tick_seconds)) % len(self._wheel)]
+        if (node, expiry) in slot:
+            slot.remove((node, expiry))
+        return True
+
+    def expire(self, now: Optional[float] = None) -> List[int]:
+        """Remove and return nodes whose mute ran out since the last call
+
+        Nodes are reported at the first tick boundary after their expiry;
+        is_muted() itself is exact.
+        """
+        if now is None:
+            now = self.clock()
+        current = int(now // self.tick_seconds)
+        if current <= self._tick:
+            return []
+
+        slots = len(self._wheel)
+        cooldowns = self.cooldowns
+        # After a long gap every slot is due once; no need to go round again
+        first = max(self._tick + 1, current - slots + 1)
+        expired = []
+        for tick in range(first, current + 1):
+            slot = self._wheel[tick % slots]
+            if not slot:
+                continue
+            keep = []
+            for node, expiry in slot:
+                current_expiry = cooldowns.ends_at(COOLDOWN_TYPE, node)
+                if current_expiry is None:
+                    # The registry drops expired entries on its own
+                    if expiry <= now:
+                        expired.append(node)
+                    continue
+                if current_expiry != expiry:
+                    continue  # re-muted since
+                if expiry <= now:
+                    cooldowns.may_fire(COOLDOWN_TYPE, node, now)  # drops the entry
+                    expired.append(node)
+                else:
+                    keep.append((node, expiry))  # a later round of the wheel
+            self._wheel[tick % slots] = keep
+        self._tick = current
+        return expired
+
+    def items(self) -> Iterator[Tuple[int, float]]:
+        """(node, expiry) for every muted node"""
+        now = self.clock()
+        return ((node, expiry) for node, expiry in self.cooldowns.entries(COOLDOWN_TYPE)
+                if expiry > now)
+
+    def save(self):
+        """Write the registry's pending changes, mutes included"""
+        self.cooldowns.flush()
@@ -0,0 +1,184 @@
+"""
+Noisy-node detection with a fixed memory cap
+
+[noisyNodeAlert] alerts when a node sends message_threshold messages
+within time_period_minutes. Keeping a timestamp list per node and
+pruning it on every packet costs memory in proportion to the traffic, which
+balloons during a flood, exactly when the detector matters.
+
+NoisyNodeDetector instead gives each tracked node a ring of per-bucket
+counters (one-minute buckets by default) covering the window, plus a
+running total. A packet touches one bucket and the total, and buckets that
+fall out of the window are cleared as the ring advances, so each packet is
+O(1). All counters live in flat arrays sized up front for max_nodes nodes;
+when more nodes show up, the least recently heard node is evicted.
+
+The window slides in bucket steps: a count can include up to one bucket of
+messages older than the window.
+
+A node alerts once per burst. Given the shared CooldownRegistry, a node
+that alerted also waits out its noisyNodeAlert cooldown
+(mute_duration_minutes) before its next burst can alert; with auto_mute
+that same registry entry is the node's mute (see alertlib.mute).
+"""
+
+import math
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from alertlib.cooldowns import CooldownRegistry
+
+DEFAULT_MAX_NODES = 10000
+BUCKET_SECONDS = 60
+MAX_BUCKETS = 60
+COOLDOWN_TYPE = 'noisyNodeAlert'
+
+
+class NoisyEvent(NamedTuple):
+    """A node crossing the message threshold"""
+    node: int
+    count: int
+    period_minutes: float
+
+
+class NoisyNodeDetector:
+    """Per-node bucketed ring counters with LRU eviction"""
+
+    def __init__(self, threshold: int, window_seconds: float, whitelist: Iterable[int] = (),
+                 max_nodes: int = DEFAULT_MAX_NODES, bucket_seconds: float = BUCKET_SECONDS,
+                 clock: Callable[[], float] = time.monotonic,
+                 cooldowns: Optional[CooldownRegistry] = None):
+        self.threshold = max(1, threshold)
+        self.window_seconds = window_seconds
+        self.whitelist = frozenset(whitelist)
+        self.max_nodes = max(1, max_nodes)
+        self.clock = clock
+        self.cooldowns = cooldowns
+
+        self.buckets = max(1, min(MAX_BUCKETS, math.ceil(window_seconds / bucket_seconds)))
+        self.bucket_seconds = window_seconds / self.buckets
+
+        size = self.max_nodes * self.buckets
+        self._counts = array('I', bytes(4 * size))
+        self._stamps = array('q', bytes(8 * size))  # bucket number each slot holds
+        self._totals = array('I', bytes(4 * self.max_nodes))
+        self._latest = array('q', bytes(8 * self.max_nodes))  # newest bucket per node
+        self._alerted = bytearray(self.max_nodes)
+        self._slots: "OrderedDict[int, int]" = OrderedDict()  # node -> slot, LRU order
+        self._free = list(range(self.max_nodes - 1, -1, -1))
+
+    @classmethod
+    def from_config(cls, typed_config, **kwargs) -> "NoisyNodeDetector":
+        section = typed_config.noisyNodeAlert
+        return cls(section.message_threshold, section.time_period_minutes * 60,
+                   whitelist=section.whitelist, **kwargs)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the preallocated counter arrays"""
+        return (self._counts.itemsize * len(self._counts) +
+                self._stamps.itemsize * len(self._stamps) +
+                self._totals.itemsize * len(self._totals) +
+                self._latest.itemsize * len(self._latest) + len(self._alerted))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _slot(self, node: int, bucket: int) -> int:
+        """Allocate a slot for a new node, evicting the least recently heard"""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            _, slot = self._slots.popitem(last=False)
+        base = slot * self.buckets
+        for i in range(base, base + self.buckets):
+            self._counts[i] = 0
+            self._stamps[i] = -1
+        self._totals[slot] = 0
+        self._latest[slot] = bucket
+        self._alerted[slot] = 0
+        self._slots[node] = slot
+        return slot
+
+    def _advance(self, slot: int, bucket: int):
+        """Clear the buckets that left the window since the node was last heard"""
+        latest = self._latest[slot]
+        if bucket <= latest:
+            return
+        base = slot * self.buckets
+        counts, stamps = self._counts, self._stamps
+        if bucket - latest >= self.buckets:
+            for i in range(base, base + self.buckets):
+                counts[i] = 0
+            self._totals[slot] = 0
+        else:
+            total = self._totals[slot]
+            for b in range(latest + 1, bucket + 1):
+                i = base + b % self.buckets
+                if stamps[i] != b:
+                    total -= counts[i]
+                    counts[i] = 0
+                    stamps[i] = b
+            self._totals[slot] = total
+        self._latest[slot] = bucket
+
+    def record(self, node: int, now: Optional[float] = None) -> Optional[NoisyEvent]:
+        """Count one message from node; returns an event when it becomes noisy
+
+        A node alerts once per burst and is re-armed when its count drops
+        below the threshold again; a burst during the node's cooldown in
+        the registry does not alert.
+        """
+        if node in self.whitelist:
+            return None
+        if now is None:
+            now = self.clock()
+        bucket = int(now // self.bucket_seconds)
+
+        slot = self._slots.get(node)
+        if slot is not None and self._latest[slot] == bucket:
+            # Fast path: node already tracked and heard in this bucket
+            self._slots.move_to_end(node)
+        else:
+            if slot is None:
+                slot = self._slot(node, bucket)
+            else:
+                self._slots.move_to_end(node)
+                self._advance(slot, bucket)
+            bucket = max(bucket, self._latest[slot])  # clock stepped back: count as newest
+        i = slot * self.buckets + bucket % self.buckets
+        if self._stamps[i] != bucket:
+            self._totals[slot] -= self._counts[i]
+            self._counts[i] = 0
+            self._stamps[i] = bucket
+        self._counts[i] += 1
+        total = self._totals[slot] + 1
+        self._totals[slot] = total
+
+        if total < self.threshold:
+            self._alerted[slot] = 0
+            return None
+        if self._alerted[slot]:
+            return None
+        self._alerted[slot] = 1
+        if self.cooldowns is not None and not self.cooldowns.try_fire(COOLDOWN_TYPE, node):
+            return None
+        return NoisyEvent(node, total, self.window_seconds / 60)
+
+    def count(self, node: int, now: Optional[float] = None) -> int:
+        """Messages from node in the current window"""
+        slot = self._slots.get(node)
+        if slot is None:
+            return 0
+        if now is None:
+            now = self.clock()
+        self._advance(slot, int(now // self.bucket_seconds))
+        return self._totals[slot]
+
+    def forget(self, node: int):
+        """Stop tracking a node and free its slot"""
+        slot = self._slots.pop(node, None)
+        if slot is not None:
+            self._free.append(slot)
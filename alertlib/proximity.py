@@ -0,0 +1,250 @@
+"""
+Multi-geofence proximity engine
+
+[proximityAlert] watches one target point, but a mesh covering several
+campsites and trailheads needs many. ProximityEngine takes any number of
+geofences and checks every reported node position against every fence in
+one vectorised pass:
+
+1. a bounding-box prefilter (latitude band and wrapped longitude band per
+   fence) discards node/fence pairs that cannot be inside, and
+2. the haversine distance is computed only for the remaining pairs.
+
+With NumPy both steps are array operations; without it the same prefilter
+runs in plain Python. Alerts are edge-triggered: a node produces one
+'enter' event when it comes inside a fence and one 'exit' event when it
+leaves, not an alert every check_interval. node_cooldown suppresses
+repeated 'enter' events for the same node and fence; given a
+CooldownRegistry, those cooldowns are kept there (and survive restarts).
+
+Extra fences come from proximityAlert.extra_geofences:
+
+    extra_geofences = basecamp:45.1234:-123.5678:50; trailhead:45.2:-123.6:200
+"""
+
+import math
+import time
+from typing import (Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional,
+                    Sequence, Set, Tuple)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EARTH_RADIUS_M = 6371008.8
+_M_PER_DEG = math.pi * EARTH_RADIUS_M / 180.0
+
+ENTER = 'enter'
+EXIT = 'exit'
+COOLDOWN_TYPE = 'proximityAlert'
+UNSET_TARGET = (0.0, 0.0)  # target_latitude/longitude as shipped
+
+
+class Geofence(NamedTuple):
+    """A circular fence; radius in meters"""
+    name: str
+    latitude: float
+    longitude: float
+    radius_m: float
+
+
+class ProximityEvent(NamedTuple):
+    """A node entering or leaving a fence"""
+    kind: str
+    node: int
+    fence: Geofence
+    distance_m: float
+
+
+def parse_geofences(text: str) -> List[Geofence]:
+    """Parse 'name:lat:lon:radius; ...' into Geofences"""
+    fences = []
+    for entry in text.split(';'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        parts = entry.split(':')
+        if len(parts) != 4:
+            raise ValueError(f"expected name:lat:lon:radius, got {entry!r}")
+        name = parts[0].strip()
+        try:
+            lat, lon, radius = (float(p) for p in parts[1:])
+        except ValueError:
+            raise ValueError(f"invalid number in geofence {entry!r}")
+        if not name or not -90 <= lat <= 90 or not -180 <= lon <= 180 or radius <= 0:
+            raise ValueError(f"geofence out of range: {entry!r}")
+        fences.append(Geofence(name, lat, lon, radius))
+    return fences
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in meters between two points given in degrees"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dphi = p2 - p1
+    dlam = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def _half_widths(fence: Geofence) -> Tuple[float, float]:
+    """Bounding box half-widths (degrees of latitude, longitude) of a fence"""
+    dlat = fence.radius_m / _M_PER_DEG
+    edge = min(90.0, abs(fence.latitude) + dlat)
+    cos_edge = math.cos(math.radians(edge))
+    dlon = 180.0 if cos_edge < 1e-9 else min(180.0, dlat / cos_edge)
+    return dlat, dlon
+
+
+class ProximityEngine:
+    """Edge-triggered proximity alerts for many nodes and many fences"""
+
+    def __init__(self, fences: Sequence[Geofence], node_cooldown: float = 600,
+                 clock: Callable[[], float] = time.monotonic, use_numpy: bool = True,
+                 cooldowns=None):
+        self.fences: Tuple[Geofence, ...] = tuple(fences)
+        self.node_cooldown = node_cooldown
+        self.clock = clock
+        self.cooldowns = cooldowns  # optional alertlib.cooldowns.CooldownRegistry
+        self.use_numpy = use_numpy and np is not None
+
+        widths = [_half_widths(f) for f in self.fences]
+        self._dlat = [w[0] for w in widths]
+        self._dlon = [w[1] for w in widths]
+        if self.use_numpy:
+            self._f_lat = np.array([f.latitude for f in self.fences], dtype=float)
+            self._f_lon = np.array([f.longitude for f in self.fences], dtype=float)
+            self._f_rad = np.array([f.radius_m for f in self.fences], dtype=float)
+            self._f_dlat = np.array(self._dlat, dtype=float)
+            self._f_dlon = np.array(self._dlon, dtype=float)
+
+        self._inside: Set[Tuple[int, int]] = set()     # (node, fence index)
+        self._announced: Set[Tuple[int, int]] = set()  # inside and alerted
+        self._last_alert: Dict[Tuple[int, int], float] = {}
+
+    @classmethod
+    def from_config(cls, typed_config, **kwargs) -> "ProximityEngine":
+        """Engine for [proximityAlert]: the target point plus extra_geofences
+
+        The target is left out while it is at the template's 0,0 placeholder,
+        so a config with only extra_geofences has no fence at Null Island.
+        """
+        section = typed_config.proximityAlert
+        fences = []
+        if (section.target_latitude, section.target_longitude) != UNSET_TARGET:
+            fences.append(Geofence('target', section.target_latitude, section.target_longitude,
+                                   float(section.radius_meters)))
+        fences += parse_geofences(section.extra_geofences)
+        return cls(fences, node_cooldown=section.node_cooldown, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Containment
+    # ------------------------------------------------------------------
+
+    def _inside_numpy(self, nodes: Sequence[int], lats, lons) -> Dict[Tuple[int, int], float]:
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        # Bounding-box prefilter over all node/fence pairs at once
+        near = np.abs(lats[:, None] - self._f_lat[None, :]) <= self._f_dlat[None, :]
+        rows, cols = np.nonzero(near)
+        if rows.size:
+            dlon = np.abs((lons[rows] - self._f_lon[cols] + 180.0) % 360.0 - 180.0)
+            keep = dlon <= self._f_dlon[cols]
+            rows, cols = rows[keep], cols[keep]
+        if not rows.size:
+            return {}
+
+        # Haversine for the surviving pairs only
+        p1 = np.radians(lats[rows])
+        p2 = np.radians(self._f_lat[cols])
+        dlam = np.radians(self._f_lon[cols] - lons[rows])
+        a = np.sin((p2 - p1) / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dlam / 2) ** 2
+        dist = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        inside = dist <= self._f_rad[cols]
+        return {(nodes[r], c): d for r, c, d in
+                zip(rows[inside].tolist(), cols[inside].tolist(), dist[inside].tolist())}
+
+    def _inside_python(self, nodes: Sequence[int], lats, lons) -> Dict[Tuple[int, int], float]:
+        found = {}
+        for fi, fence in enumerate(self.fences):
+            flat, flon, dlat, dlon = fence.latitude, fence.longitude, self._dlat[fi], self._dlon[fi]
+            for node, lat, lon in zip(nodes, lats, lons):
+                if abs(lat - flat) > dlat or abs((lon - flon + 180.0) % 360.0 - 180.0) > dlon:
+                    continue
+                dist = haversine_m(lat, lon, flat, flon)
+                if dist <= fence.radius_m:
+                    found[(node, fi)] = dist
+        return found
+
+    def contained(self, nodes: Sequence[int], lats: Sequence[float],
+                  lons: Sequence[float]) -> Dict[Tuple[int, int], float]:
+        """{(node, fence index): distance} for every node inside a fence"""
+        if not self.fences or not len(nodes):
+            return {}
+        if self.use_numpy:
+            return self._inside_numpy(nodes, lats, lons)
+        return self._inside_python(nodes, lats, lons)
+
+    # ------------------------------------------------------------------
+    # Transitions
+    # ------------------------------------------------------------------
+
+    def evaluate(self, positions: Mapping[int, Tuple[float, float]],
+                 now: Optional[float] = None) -> List[ProximityEvent]:
+        """Check {node: (lat, lon)} against all fences and return the transitions
+
+        Nodes missing from positions keep their previous state.
+        """
+        nodes = list(positions)
+        coords = [positions[n] for n in nodes]
+        return self.evaluate_arrays(nodes, [c[0] for c in coords], [c[1] for c in coords], now)
+
+    def evaluate_arrays(self, nodes: Sequence[int], lats: Sequence[float],
+                        lons: Sequence[float], now: Optional[float] = None) -> List[ProximityEvent]:
+        """evaluate() for parallel node/latitude/longitude sequences"""
+        if now is None:
+            now = self.clock()
+        current = self.contained(nodes, lats, lons)
+        events: List[ProximityEvent] = []
+
+        for pair in current.keys() - self._inside:
+            if self.cooldowns is not None:
+                key = f"{COOLDOWN_TYPE}/{self.fences[pair[1]].name}"
+                if not self.cooldowns.try_fire(key, pair[0]):
+                    continue
+            else:
+                last = self._last_alert.get(pair)
+                if last is not None and now - last < self.node_cooldown:
+                    continue
+                self._last_alert[pair] = now
+            self._announced.add(pair)
+            events.append(ProximityEvent(ENTER, pair[0], self.fences[pair[1]], current[pair]))
+
+        if self._inside:
+            reported = set(nodes)
+            for pair in [p for p in self._inside if p[0] in reported and p not in current]:
+                self._inside.discard(pair)
+                if pair in self._announced:
+                    self._announced.discard(pair)
+                    events.append(ProximityEvent(EXIT, pair[0], self.fences[pair[1]], float('nan')))
+
+        self._inside.update(current.keys())
+        self._prune_cooldowns(now)
+        events.sort(key=lambda e: (e.kind != EXIT, e.node, e.fence.name))
+        return events
+
+    def _prune_cooldowns(self, now: float):
+        if len(self._last_alert) > 2 * len(self._inside) + 1024:
+            cutoff = now - self.node_cooldown
+            self._last_alert = {p: t for p, t in self._last_alert.items() if t > cutoff}
+
+    def inside(self, node: int) -> List[Geofence]:
+        """Fences a node is currently inside"""
+        return [self.fences[fi] for n, fi in self._inside if n == node]
+
+    def forget(self, nodes: Iterable[int]):
+        """Drop all state for nodes (e.g. nodes removed from the node DB)"""
+        gone = set(nodes)
+        self._inside = {p for p in self._inside if p[0] not in gone}
+        self._announced = {p for p in self._announced if p[0] not in gone}
+        self._last_alert = {p: t for p, t in self._last_alert.items() if p[0] not in gone}
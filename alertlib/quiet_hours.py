@@ -0,0 +1,119 @@
+"""
+Quiet hours compiled to a minute bitmap
+
+[alertGlobal] quiet_hours is one or more ranges separated by commas or
+semicolons, each optionally limited to a day or a range of days:
+
+    22:00-07:00
+    22:00-07:00, 12:00-13:30
+    Mon-Fri 22:00-07:00, Sat-Sun 23:00-09:00
+
+Ranges include the start minute and exclude the end minute; 24:00 may be
+used as an end. A range that ends earlier than it starts runs past
+midnight, and the part after midnight belongs to the following day, so
+"Fri 22:00-07:00" is quiet from Friday 22:00 to Saturday 07:00. Day ranges
+wrap too (Fri-Mon).
+
+QuietHours compiles the string once into a 7 x 1440 bit week bitmap (a
+1440-bit minute-of-day map per weekday), so checking whether an alert falls
+in quiet hours is one local-time lookup and one bit test. Compiling is also
+the validation: a bad string raises ValueError with the reason, which the
+configurator shows before anything is saved.
+"""
+
+import re
+import time
+from functools import lru_cache
+from typing import Callable, Optional
+
+MINUTES_PER_DAY = 1440
+DAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+_RULE = re.compile(r'^(?:(?P<days>[A-Za-z]+(?:\s*-\s*[A-Za-z]+)?)\s+)?'
+                   r'(?P<start>\d{1,2}:\d{2})\s*-\s*(?P<end>\d{1,2}:\d{2})$')
+
+
+def _minute(text: str, allow_24: bool = False) -> int:
+    hours, minutes = (int(part) for part in text.split(':'))
+    if minutes > 59 or hours > 24 or (hours == 24 and (minutes or not allow_24)):
+        raise ValueError(f"'{text}' is not a valid time (00:00-23:59)")
+    return hours * 60 + minutes
+
+
+def _day(text: str) -> int:
+    try:
+        return DAYS.index(text.lower())
+    except ValueError:
+        raise ValueError(f"'{text}' is not a day (use {', '.join(d.title() for d in DAYS)})")
+
+
+class QuietHours:
+    """A compiled quiet_hours schedule"""
+
+    def __init__(self, spec: str = '', clock: Callable[[], float] = time.time):
+        self.spec = spec.strip()
+        self.clock = clock
+        self._bits = bytearray(7 * MINUTES_PER_DAY // 8)
+        for rule in re.split(r'[,;]', self.spec):
+            if rule.strip():
+                self._add_rule(rule.strip())
+        self.active = any(self._bits)
+
+    @classmethod
+    def from_config(cls, typed_config, **kwargs) -> "QuietHours":
+        return cls(typed_config.alertGlobal.quiet_hours, **kwargs)
+
+    def __bool__(self) -> bool:
+        return self.active
+
+    def __repr__(self) -> str:
+        return f"QuietHours({self.spec!r})"
+
+    def _add_rule(self, rule: str):
+        match = _RULE.match(rule)
+        if not match:
+            raise ValueError(f"'{rule}' is not [Day[-Day]] HH:MM-HH:MM")
+        start = _minute(match.group('start'))
+        end = _minute(match.group('end'), allow_24=True)
+        if start == end:
+            raise ValueError(f"'{rule}' is an empty range (use 00:00-24:00 for a whole day)")
+
+        if match.group('days'):
+            first, _, last = match.group('days').partition('-')
+            first = _day(first.strip())
+            last = _day(last.strip()) if last else first
+            days = [(first + i) % 7 for i in range((last - first) % 7 + 1)]
+        else:
+            days = range(7)
+
+        for day in days:
+            base = day * MINUTES_PER_DAY
+            length = (end - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+            for offset in range(start, start + length):
+                self._set((base + offset) % (7 * MINUTES_PER_DAY))
+
+    def _set(self, index: int):
+        self._bits[index >> 3] |= 1 << (index & 7)
+
+    def is_quiet_at(self, weekday: int, minute: int) -> bool:
+        """weekday 0 = Monday, minute of the day 0-1439"""
+        index = weekday * MINUTES_PER_DAY + minute
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def is_quiet(self, now: Optional[float] = None) -> bool:
+        """Whether the local time at now (epoch seconds) is in quiet hours"""
+        if not self.active:
+            return False
+        tm = time.localtime(self.clock() if now is None else now)
+        index = tm.tm_wday * MINUTES_PER_DAY + tm.tm_hour * 60 + tm.tm_min
+        return bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def quiet_minutes(self) -> int:
+        """Quiet minutes per week"""
+        return sum(bin(byte).count('1') for byte in self._bits)
+
+
+@lru_cache(maxsize=8)
+def compile_quiet_hours(spec: str) -> QuietHours:
+    """Cached QuietHours for spec (raises ValueError if it is invalid)"""
+    return QuietHours(spec)
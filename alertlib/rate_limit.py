@@ -0,0 +1,180 @@
+"""
+Alert rate limiting with token buckets
+
+[alertGlobal] max_alerts_per_hour caps the alerts of all types together;
+per_type_limits ("proximityAlert:5,noisyNodeAlert:2") optionally caps
+individual alert sections as well. Each cap is a token bucket holding up to
+its hourly limit and refilling continuously at limit/3600 tokens a second,
+so a quiet hour's allowance can be spent in a burst but the long-run rate
+never exceeds the limit.
+
+There is no refill thread: a bucket stores its tokens and when it last
+refilled, and admit() tops it up from the monotonic clock before deciding.
+That is a few float operations on preallocated slots per check, with no
+per-call containers. An alert is admitted only if both the global bucket
+and its type's bucket have a token, and only then is a token taken from
+each, so a denied alert costs nothing.
+
+Bucket levels are saved with save() (alertlib.engines calls it every few
+minutes and on shutdown) and restored on start, refilled for the wall-clock
+time the bot was down, so a restart does not hand out a fresh allowance.
+"""
+
+import marshal
+import re
+import time
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, Union
+
+from configlib.ini_writer import write_atomic
+from configlib.paths import state_dir
+
+RATE_FILE = "rate_limits.bin"
+STATE_VERSION = 1
+GLOBAL = ''  # bucket name used for the global limit in the state file
+
+_TYPE_LIMIT = re.compile(r'^\s*(\w+)\s*:\s*(\d+)\s*$')
+
+
+def default_rate_path() -> Path:
+    return state_dir() / RATE_FILE
+
+
+def parse_type_limits(text: str) -> Dict[str, int]:
+    """Parse 'section:limit, ...' into {section: alerts per hour}"""
+    limits = {}
+    for entry in text.split(','):
+        if not entry.strip():
+            continue
+        match = _TYPE_LIMIT.match(entry)
+        if not match:
+            raise ValueError(f"Per-type limit '{entry.strip()}' is not section:alerts_per_hour")
+        limits[match.group(1)] = int(match.group(2))
+    return limits
+
+
+class TokenBucket:
+    """capacity tokens, refilled lazily at rate tokens per second"""
+
+    __slots__ = ('capacity', 'rate', 'tokens', 'stamp')
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.stamp = now
+
+    def refill(self, now: float) -> float:
+        if now > self.stamp:
+            tokens = self.tokens + (now - self.stamp) * self.rate
+            self.tokens = tokens if tokens < self.capacity else self.capacity
+            self.stamp = now
+        return self.tokens
+
+    def take(self, now: float) -> bool:
+        if self.refill(now) >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available"""
+        missing = 1.0 - self.refill(now)
+        return missing / self.rate if missing > 0 and self.rate else 0.0
+
+
+class RateLimiter:
+    """A global token bucket plus optional per-type buckets"""
+
+    def __init__(self, max_per_hour: int, per_type: Optional[Mapping[str, int]] = None,
+                 path: Optional[Union[str, Path]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 wall_clock: Callable[[], float] = time.time):
+        self.path = Path(path) if path is not None else None
+        self.clock = clock
+        self.wall_clock = wall_clock
+        now = clock()
+        # A limit of 0 means unlimited
+        self._global = TokenBucket(max_per_hour, max_per_hour / 3600.0, now) if max_per_hour > 0 else None
+        self._types: Dict[str, TokenBucket] = {
+            name: TokenBucket(limit, limit / 3600.0, now)
+            for name, limit in (per_type or {}).items() if limit > 0
+        }
+        if self.path is not None:
+            self._load()
+
+    @classmethod
+    def from_config(cls, typed_config, path: Optional[Union[str, Path]] = None,
+                    **kwargs) -> "RateLimiter":
+        """Limiter for [alertGlobal], persisted at path (default: state dir)"""
+        section = typed_config.alertGlobal
+        return cls(section.max_alerts_per_hour, parse_type_limits(section.per_type_limits),
+                   path=path if path is not None else default_rate_path(), **kwargs)
+
+    def admit(self, alert_type: str = '', now: Optional[float] = None) -> bool:
+        """Take a token for one alert of alert_type; False if it must be dropped"""
+        if now is None:
+            now = self.clock()
+        bucket = self._types.get(alert_type)
+        glob = self._global
+        if bucket is None:
+            return glob is None or glob.take(now)
+        if glob is None:
+            return bucket.take(now)
+        if bucket.refill(now) < 1.0 or glob.refill(now) < 1.0:
+            return False
+        bucket.tokens -= 1.0
+        glob.tokens -= 1.0
+        return True
+
+    def retry_after(self, alert_type: str = '', now: Optional[float] = None) -> float:
+        """Seconds until an alert of alert_type would be admitted"""
+        if now is None:
+            now = self.clock()
+        waits = [b.wait_time(now) for b in (self._global, self._types.get(alert_type)) if b]
+        return max(waits, default=0.0)
+
+    def tokens(self, alert_type: Optional[str] = None, now: Optional[float] = None) -> Optional[float]:
+        """Tokens left in the global bucket, or alert_type's (None if unlimited)"""
+        bucket = self._global if alert_type is None else self._types.get(alert_type)
+        if bucket is None:
+            return None
+        return bucket.refill(self.clock() if now is None else now)
+
+    def _buckets(self):
+        if self._global is not None:
+            yield GLOBAL, self._global
+        yield from self._types.items()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self):
+        """Write bucket levels to path, stamped with the wall-clock time"""
+        if self.path is None:
+            return
+        now = self.clock()
+        levels = {name: bucket.refill(now) for name, bucket in self._buckets()}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(self.path, marshal.dumps((STATE_VERSION, self.wall_clock(), levels)))
+        except OSError:
+            pass
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                version, saved_at, levels = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if version != STATE_VERSION or not isinstance(levels, dict):
+            return
+
+        # The monotonic clock restarts with the process, so credit the
+        # downtime measured on the wall clock
+        downtime = max(0.0, self.wall_clock() - saved_at)
+        for name, bucket in self._buckets():
+            level = levels.get(name)
+            if isinstance(level, (int, float)):
+                bucket.tokens = min(bucket.capacity, max(0.0, level + downtime * bucket.rate))
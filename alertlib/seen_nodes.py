@@ -0,0 +1,219 @@
+"""
+Persistent seen-node set and deferred welcomes for [newNodeAlert]
+
+The bot asks "have I ever seen this node?" for every packet, and the answer
+has to survive a restart or the whole mesh gets welcomed again. SeenNodes
+keeps node numbers in a file laid out for that question:
+
+    header  b"SEEN" + uint32 count of sorted entries
+    sorted  that many uint32 node numbers, ascending
+    tail    uint32 node numbers appended since the last compaction
+
+Opening the file memory-maps it and bisects the sorted part in place, so
+start-up does not depend on the size of the mesh. New nodes are appended to
+the tail (4 bytes per node, no rewrite) and kept in a small in-memory set;
+once the tail grows past a fraction of the sorted part the file is merged
+and rewritten atomically. A torn final append (a power cut mid-write) is
+cut off on load so later appends stay aligned.
+
+WelcomeScheduler queues a welcome welcome_delay seconds after a node is
+first seen on a deadline heap that the bot's loop drains with due(),
+instead of a sleeping thread per new node.
+"""
+
+import heapq
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from configlib.ini_writer import write_atomic
+from configlib.paths import state_dir
+
+SEEN_FILE = "seen_nodes.bin"
+_MAGIC = b"SEEN"
+_HEADER = struct.Struct('<4sI')
+MIN_COMPACT = 1024       # tail entries before a compaction is considered
+COMPACT_FRACTION = 8     # ... and the tail must exceed sorted/COMPACT_FRACTION
+
+
+def default_seen_path() -> Path:
+    return state_dir() / SEEN_FILE
+
+
+class SeenNodes:
+    """Memory-mapped sorted uint32 node set with an append-only tail"""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self.path = Path(path) if path is not None else None
+        self._map: Optional[mmap.mmap] = None
+        self._sorted: Union[memoryview, array] = array('I')
+        self._tail: Set[int] = set()
+        if self.path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._tail)
+
+    def __contains__(self, node: int) -> bool:
+        node &= 0xFFFFFFFF
+        if node in self._tail:
+            return True
+        ordered = self._sorted
+        i = bisect_left(ordered, node)
+        return i < len(ordered) and ordered[i] == node
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(set(self._sorted) | self._tail))
+
+    def add(self, node: int) -> bool:
+        """Record node as seen; returns True if it was new"""
+        node &= 0xFFFFFFFF
+        if node in self:
+            return False
+        self._tail.add(node)
+        if self.path is not None:
+            self._append(node)
+            if len(self._tail) >= max(MIN_COMPACT, len(self._sorted) // COMPACT_FRACTION):
+                self.compact()
+        return True
+
+    def update(self, nodes: Iterable[int]):
+        """Add many nodes with a single rewrite of the file"""
+        for node in nodes:
+            node &= 0xFFFFFFFF
+            if node not in self:
+                self._tail.add(node)
+        self.compact()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _append(self, node: int):
+        try:
+            if not self.path.exists():
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._write(self._sorted, self._tail - {node})
+            with open(self.path, 'ab') as f:
+                f.write(struct.pack('<I', node))
+        except OSError:
+            pass
+
+    def _write(self, ordered, tail: Set[int]):
+        merged = array('I', sorted(set(ordered) | tail))
+        if sys.byteorder != 'little':
+            merged.byteswap()
+        write_atomic(self.path, _HEADER.pack(_MAGIC, len(merged)) + merged.tobytes())
+
+    def compact(self):
+        """Merge the tail into the sorted part and rewrite the file"""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._write(self._sorted, self._tail)
+        except OSError:
+            return
+        self.close()
+        self._load()
+
+    def close(self):
+        """Release the memory map (the set is empty until reloaded)"""
+        if isinstance(self._sorted, memoryview):
+            self._sorted.release()
+        self._sorted = array('I')
+        self._tail = set()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                size = f.seek(0, 2)
+                if size < _HEADER.size:
+                    return
+                f.seek(0)
+                magic, count = _HEADER.unpack(f.read(_HEADER.size))
+                end = _HEADER.size + 4 * count
+                if magic != _MAGIC or end > size:
+                    return
+                tail_end = end + (size - end) // 4 * 4
+                if tail_end != size:
+                    # Torn final append: cut it off, or every later 4-byte
+                    # append would be misaligned
+                    try:
+                        os.truncate(self.path, tail_end)
+                    except OSError:
+                        pass
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return
+
+        if sys.byteorder == 'little':
+            self._map = data
+            self._sorted = memoryview(data)[_HEADER.size:end].cast('I')
+            tail = array('I', data[end:tail_end])
+        else:
+            self._sorted = array('I', data[_HEADER.size:end])
+            self._sorted.byteswap()
+            tail = array('I', data[end:tail_end])
+            tail.byteswap()
+            data.close()
+        self._tail = set(tail)
+
+
+class WelcomeScheduler:
+    """New-node detection with welcomes queued on a deadline heap"""
+
+    def __init__(self, delay: float, seen: Optional[SeenNodes] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.delay = delay
+        self.seen = seen if seen is not None else SeenNodes()
+        self.clock = clock
+        self._heap: List[Tuple[float, int, int]] = []
+        self._seq = 0  # keeps welcomes for the same instant in arrival order
+
+    @classmethod
+    def from_config(cls, typed_config, path: Optional[Union[str, Path]] = None,
+                    **kwargs) -> "WelcomeScheduler":
+        """Scheduler for [newNodeAlert], remembering nodes at path (default: state dir)"""
+        seen = SeenNodes(path if path is not None else default_seen_path())
+        return cls(typed_config.newNodeAlert.welcome_delay, seen=seen, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def heard(self, node: int, now: Optional[float] = None) -> bool:
+        """Note a packet from node; returns True if it is new and a welcome was queued
+
+        The node is remembered straight away, so a restart before the
+        welcome goes out drops that welcome rather than sending it twice.
+        """
+        if not self.seen.add(node):
+            return False
+        if now is None:
+            now = self.clock()
+        self._seq += 1
+        heapq.heappush(self._heap, (now + self.delay, self._seq, node))
+        return True
+
+    def due(self, now: Optional[float] = None) -> List[int]:
+        """Pop the nodes whose welcome should be sent now, oldest first"""
+        if now is None:
+            now = self.clock()
+        heap = self._heap
+        nodes = []
+        while heap and heap[0][0] <= now:
+            nodes.append(heapq.heappop(heap)[2])
+        return nodes
+
+    def next_due(self) -> Optional[float]:
+        """When the next welcome is due (for sleeping until then)"""
+        return self._heap[0][0] if self._heap else None
@@ -0,0 +1,291 @@
+"""
+Streaming per-node SNR statistics for [snrAlert]
+
+Checking snr_threshold against every single packet alerts on one lucky
+packet, and keeping each node's raw SNR history to smooth that out costs
+memory in proportion to the traffic. SnrMonitor keeps a fixed-size summary
+per node instead, updated in O(1) per packet:
+
+- a time-weighted EWMA (time constant of a third of the window, so about
+  95% of the weight lies inside the window);
+- rolling min/max from a ring of per-bucket extremes (one-minute buckets by
+  default, widened so that a window has at most MAX_BUCKETS of them), like
+  the noisy-node counters;
+- an approximate percentile sketch: a 1 dB histogram per bucket, summed
+  into a window histogram as buckets come and go. Percentiles are read from
+  the window histogram, accurate to the bin width.
+
+statistic selects what is compared with snr_threshold: 'last' (the packet,
+the old behaviour), 'ewma', 'min', 'max' or a percentile such as 'p50'.
+The windowed statistics need min_samples packets in the window, so "p50 SNR
+over 5 minutes is at least 10 dB" is statistic='p50', window 300 seconds.
+
+Most of a node's summary is the per-bucket histograms, about 2 KB at
+MAX_BUCKETS buckets. max_nodes is lowered if needed so that the summaries of
+all tracked nodes fit in memory_budget (16 MiB by default); beyond that the
+least recently heard node is evicted.
+
+monitor_mode is checked before anything else is done with a packet.
+"""
+
+import math
+import re
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+DEFAULT_MAX_NODES = 10000
+BUCKET_SECONDS = 60
+MAX_BUCKETS = 12
+MEMORY_BUDGET = 16 * 1024 * 1024  # bytes of per-node summaries across all nodes
+MIN_SAMPLES = 3
+
+SNR_MIN = -32.0         # lower edge of the first histogram bin (dB)
+SNR_BINS = 64           # 1 dB bins up to +32 dB; values outside are clamped
+BIN_CAP = 0xFFFF        # per-bucket bin counts saturate here
+MIN_ALPHA = 0.05        # weight of a packet arriving together with the last one
+
+STATISTICS = ('last', 'ewma', 'min', 'max', 'p50', 'p90')
+_PERCENTILE = re.compile(r'^p(\d{1,2})$')
+
+
+class SnrEvent(NamedTuple):
+    """A node's SNR statistic reaching the threshold"""
+    node: int
+    statistic: str
+    value: float
+    snr: float              # the packet that triggered the check
+    samples: int            # packets in the window
+
+
+class SnrSummary(NamedTuple):
+    """Current statistics for one node"""
+    samples: int
+    last: float
+    ewma: float
+    minimum: Optional[float]
+    maximum: Optional[float]
+    p50: Optional[float]
+    p90: Optional[float]
+
+
+class SnrStats:
+    """Fixed-size streaming SNR statistics for one node"""
+
+    __slots__ = ('buckets', 'tau', 'last', 'ewma', 'updated', 'latest', 'samples', 'alerted',
+                 '_stamps', '_counts', '_mins', '_maxs', '_hist', '_window')
+
+    def __init__(self, buckets: int, tau: float, bucket: int):
+        self.buckets = buckets
+        self.tau = tau
+        self.last = math.nan
+        self.ewma = math.nan
+        self.updated = 0.0
+        self.latest = bucket
+        self.samples = 0
+        self.alerted = False
+        self._stamps = array('q', [-1]) * buckets
+        self._counts = array('I', bytes(4 * buckets))
+        self._mins = array('f', bytes(4 * buckets))
+        self._maxs = array('f', bytes(4 * buckets))
+        self._hist = array('H', bytes(2 * buckets * SNR_BINS))
+        self._window = array('I', bytes(4 * SNR_BINS))
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self._stamps, self._counts, self._mins,
+                                                 self._maxs, self._hist, self._window))
+
+    def _clear(self, i: int):
+        base = i * SNR_BINS
+        hist, window = self._hist, self._window
+        for b in range(SNR_BINS):
+            if hist[base + b]:
+                window[b] -= hist[base + b]
+                hist[base + b] = 0
+        self.samples -= self._counts[i]
+        self._counts[i] = 0
+
+    def advance(self, bucket: int):
+        """Drop the buckets that left the window (each bucket is cleared once)"""
+        latest = self.latest
+        if bucket <= latest:
+            return
+        stamps = self._stamps
+        for b in range(max(latest + 1, bucket - self.buckets + 1), bucket + 1):
+            i = b % self.buckets
+            if stamps[i] != b:
+                if self._counts[i]:
+                    self._clear(i)
+                stamps[i] = b
+        self.latest = bucket
+
+    def add(self, snr: float, now: float, bucket: int):
+        self.advance(bucket)
+        bucket = max(bucket, self.latest)  # clock stepped back: count as newest
+
+        if self.ewma != self.ewma:  # NaN: first packet
+            self.ewma = snr
+        else:
+            alpha = 1.0 - math.exp(-max(0.0, now - self.updated) / self.tau)
+            self.ewma += max(alpha, MIN_ALPHA) * (snr - self.ewma)
+        self.last = snr
+        self.updated = now
+
+        i = bucket % self.buckets
+        if self._stamps[i] != bucket:
+            if self._counts[i]:
+                self._clear(i)
+            self._stamps[i] = bucket
+        b = int((snr - SNR_MIN) // 1.0)
+        b = 0 if b < 0 else SNR_BINS - 1 if b >= SNR_BINS else b
+        j = i * SNR_BINS + b
+        if self._hist[j] >= BIN_CAP:
+            return  # saturated bucket: the sketch is already dominated by this bin
+        self._hist[j] += 1
+        self._window[b] += 1
+        if self._counts[i]:
+            if snr < self._mins[i]:
+                self._mins[i] = snr
+            if snr > self._maxs[i]:
+                self._maxs[i] = snr
+        else:
+            self._mins[i] = self._maxs[i] = snr
+        self._counts[i] += 1
+        self.samples += 1
+
+    def minimum(self) -> Optional[float]:
+        values = [self._mins[i] for i in range(self.buckets) if self._counts[i]]
+        return min(values) if values else None
+
+    def maximum(self) -> Optional[float]:
+        values = [self._maxs[i] for i in range(self.buckets) if self._counts[i]]
+        return max(values) if values else None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Approximate q-th percentile (0-100) of the window, to within 1 dB"""
+        if not self.samples:
+            return None
+        rank = max(1, math.ceil(self.samples * q / 100.0))
+        seen = 0
+        for b, count in enumerate(self._window):
+            seen += count
+            if seen >= rank:
+                value = SNR_MIN + b + 0.5
+                # The extremes are exact, so never report beyond them
+                low, high = self.minimum(), self.maximum()
+                return min(max(value, low), high)
+        return self.maximum()
+
+
+class SnrMonitor:
+    """Per-node streaming SNR statistics and sustained-threshold alerts"""
+
+    def __init__(self, threshold: float, statistic: str = 'last', window_seconds: float = 300,
+                 monitor_mode: str = 'all', min_samples: int = MIN_SAMPLES,
+                 max_nodes: int = DEFAULT_MAX_NODES, bucket_seconds: float = BUCKET_SECONDS,
+                 memory_budget: int = MEMORY_BUDGET, clock: Callable[[], float] = time.monotonic):
+        if monitor_mode not in ('all', 'dm_only', 'channel_only'):
+            raise ValueError(f"monitor_mode must be all, dm_only or channel_only, not {monitor_mode!r}")
+        self.threshold = threshold
+        self.statistic = statistic
+        self._value = self._statistic(statistic)
+        self.window_seconds = window_seconds
+        self.monitor_mode = monitor_mode
+        self._accept_dm = monitor_mode != 'channel_only'
+        self._accept_channel = monitor_mode != 'dm_only'
+        self.min_samples = 1 if statistic == 'last' else max(1, min_samples)
+        self.clock = clock
+
+        self.buckets = max(1, min(MAX_BUCKETS, math.ceil(window_seconds / bucket_seconds)))
+        self.bucket_seconds = window_seconds / self.buckets
+        self.tau = max(1e-6, window_seconds / 3)
+        self.node_bytes = SnrStats(self.buckets, self.tau, 0).memory_bytes
+        self.max_nodes = max(1, min(max_nodes, memory_budget // self.node_bytes))
+        self._nodes: "OrderedDict[int, SnrStats]" = OrderedDict()  # LRU order
+
+    @staticmethod
+    def _statistic(name: str) -> Callable[[SnrStats], Optional[float]]:
+        if name == 'last':
+            return lambda stats: stats.last
+        if name == 'ewma':
+            return lambda stats: stats.ewma
+        if name == 'min':
+            return SnrStats.minimum
+        if name == 'max':
+            return SnrStats.maximum
+        match = _PERCENTILE.match(name)
+        if match:
+            q = int(match.group(1))
+            return lambda stats: stats.percentile(q)
+        raise ValueError(f"unknown SNR statistic {name!r}")
+
+    @classmethod
+    def from_config(cls, typed_config, **kwargs) -> "SnrMonitor":
+        section = typed_config.snrAlert
+        return cls(section.snr_threshold, statistic=section.statistic,
+                   window_seconds=section.window_minutes * 60,
+                   monitor_mode=section.monitor_mode, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the tracked nodes' statistics arrays"""
+        return len(self._nodes) * self.node_bytes
+
+    def accepts(self, is_dm: bool) -> bool:
+        """Whether monitor_mode covers a DM (True) or channel (False) packet"""
+        return self._accept_dm if is_dm else self._accept_channel
+
+    def observe(self, node: int, snr: Optional[float], is_dm: bool = False,
+                now: Optional[float] = None) -> Optional[SnrEvent]:
+        """Add one packet's SNR; returns an event when the statistic reaches the threshold
+
+        A node alerts once and is re-armed when its statistic drops below
+        the threshold again.
+        """
+        if not (self._accept_dm if is_dm else self._accept_channel) or snr is None:
+            return None
+        if now is None:
+            now = self.clock()
+        bucket = int(now // self.bucket_seconds)
+
+        stats = self._nodes.get(node)
+        if stats is None:
+            if len(self._nodes) >= self.max_nodes:
+                self._nodes.popitem(last=False)
+            stats = self._nodes[node] = SnrStats(self.buckets, self.tau, bucket)
+        else:
+            self._nodes.move_to_end(node)
+        stats.add(float(snr), now, bucket)
+
+        if stats.samples < self.min_samples:
+            return None
+        value = self._value(stats)
+        if value is None or value < self.threshold:
+            stats.alerted = False
+            return None
+        if stats.alerted:
+            return None
+        stats.alerted = True
+        return SnrEvent(node, self.statistic, round(value, 2), float(snr), stats.samples)
+
+    def stats(self, node: int, now: Optional[float] = None) -> Optional[SnrStats]:
+        """A node's statistics, with buckets older than the window dropped"""
+        stats = self._nodes.get(node)
+        if stats is not None:
+            stats.advance(int((self.clock() if now is None else now) // self.bucket_seconds))
+        return stats
+
+    def summary(self, node: int, now: Optional[float] = None) -> Optional[SnrSummary]:
+        stats = self.stats(node, now)
+        if stats is None:
+            return None
+        return SnrSummary(stats.samples, stats.last, stats.ewma, stats.minimum(),
+                          stats.maximum(), stats.percentile(50), stats.percentile(90))
+
+    def forget(self, node: int):
+        self._nodes.pop(node, None)
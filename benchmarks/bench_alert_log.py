@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Alert log hot-path benchmark
+
+Logs --lines alert lines spread over the per-section log files two ways:
+
+  direct    open, append and flush the file for every line (the simple way)
+  batched   alertlib.alert_log.AlertLog.log_alert() (queued to the writer thread)
+
+Reports the cost per line seen by the caller, and the total time until the
+batched writer has written everything. Every line must reach its file, and
+one line in every --urgent-every is logged at priority 4.
+
+Usage:
+    python3 benchmarks/bench_alert_log.py [--lines 50000] [--urgent-every 1000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from alertlib.alert_log import AlertLog  # noqa: E402
+
+SECTIONS = ('emergencyHandler', 'proximityAlert', 'altitudeAlert', 'weatherAlert',
+            'batteryAlert', 'noisyNodeAlert', 'newNodeAlert', 'snrAlert',
+            'disconnectAlert', 'customAlert')
+
+
+def count_lines(directory: Path) -> int:
+    return sum(len(path.read_bytes().splitlines()) for path in directory.glob("*.log"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50000, help="alert lines to log")
+    parser.add_argument("--urgent-every", type=int, default=1000,
+                        help="log every Nth line at priority 4")
+    args = parser.parse_args()
+
+    messages = [(SECTIONS[i % len(SECTIONS)], f"Alert {i} from !{i * 2654435761 % (1 << 32):08x}",
+                 4 if args.urgent_every and i % args.urgent_every == 0 else 1)
+                for i in range(args.lines)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        direct_dir = Path(tmp) / "direct"
+        direct_dir.mkdir()
+        start = time.perf_counter()
+        for section, message, _ in messages:
+            with open(direct_dir / f"{section}.log", 'a') as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}\n")
+                f.flush()
+        direct = time.perf_counter() - start
+
+        batched_dir = Path(tmp) / "batched"
+        log = AlertLog(batched_dir)
+        log.paths = {section: Path(f"{section}.log") for section in SECTIONS}
+        log_alert = log.log_alert
+        start = time.perf_counter()
+        for section, message, priority in messages:
+            log_alert(section, message, priority)
+        batched = time.perf_counter() - start
+        log.close()
+        written = time.perf_counter() - start
+
+        print(f"{args.lines} lines over {len(SECTIONS)} files:")
+        print(f"  direct   {direct / args.lines * 1e6:>7.2f} us/line in the caller")
+        print(f"  batched  {batched / args.lines * 1e6:>7.2f} us/line in the caller, "
+              f"all written after {written * 1000:.0f} ms")
+
+        for name, directory in (("direct", direct_dir), ("batched", batched_dir)):
+            lines = count_lines(directory)
+            if lines != args.lines:
+                print(f"FAIL: {name} wrote {lines} of {args.lines} lines")
+                return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
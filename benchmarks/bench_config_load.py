@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Config load benchmark: INI parse vs precompiled snapshot
+
+Times three ways of getting a usable config from config.enhanced.ini:
+
+  ini      ConfigParser.read + splitting the list keys by hand (what the
+           bot does today)
+  typed    ConfigParser.read + configlib.schema.load_typed
+  snapshot configlib.config_snapshot.load_config_fast with a current
+           config.ini.snap
+
+--list-size pads the node and keyword lists to show how the INI cost grows
+with list length while the snapshot load stays flat. Fails if the snapshot
+does not round-trip to the same typed config, if a changed config.ini is
+not picked up, or if loading the snapshot is not faster than the typed parse.
+
+Usage:
+    python3 benchmarks/bench_config_load.py [--runs 200] [--list-size 0]
+"""
+
+import argparse
+import configparser
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from configlib.config_snapshot import load_config_fast, write_snapshot  # noqa: E402
+from configlib.schema import load_typed  # noqa: E402
+
+TEMPLATE = REPO_ROOT / "config.enhanced.ini"
+
+LIST_KEYS = (
+    ('emergencyHandler', 'emergency_keywords'),
+    ('noisyNodeAlert', 'whitelist'),
+    ('batteryAlert', 'monitor_nodes'),
+    ('disconnectAlert', 'monitor_nodes'),
+    ('weatherAlert', 'dm_recipients'),
+    ('sms', 'phone_numbers'),
+)
+
+
+def make_config(directory: Path, list_size: int) -> Path:
+    """Copy the template, optionally padding the list keys to list_size entries"""
+    path = directory / "config.ini"
+    shutil.copy(TEMPLATE, path)
+    if list_size:
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(path)
+        for section, key in LIST_KEYS:
+            if key == 'emergency_keywords':
+                items = [f"keyword{i}" for i in range(list_size)]
+            elif key == 'phone_numbers':
+                items = [f"555{i:07d}" for i in range(list_size)]
+            else:
+                items = [str(1000000 + i) for i in range(list_size)]
+            config[section][key] = ','.join(items)
+        with open(path, 'w') as f:
+            config.write(f)
+    return path
+
+
+def load_ini(path: Path):
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(path)
+    return {(section, key): [v.strip() for v in config.get(section, key, fallback='').split(',')]
+            for section, key in LIST_KEYS}
+
+
+def load_typed_ini(path: Path):
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(path)
+    return load_typed(config)
+
+
+def time_per_call(func: Callable, runs: int) -> float:
+    """Best-of-three mean time per call in microseconds"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(runs):
+            func()
+        best = min(best, (time.perf_counter() - start) / runs)
+    return best * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--list-size", type=int, default=0,
+                        help="entries per list key (0 = template as shipped)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = make_config(Path(tmp), args.list_size)
+        write_snapshot(path)
+
+        typed, _ = load_config_fast(path, refresh=False)
+        expected, _ = load_typed_ini(path)
+        if typed != expected:
+            print("FAIL: snapshot does not match the parsed INI")
+            return 1
+
+        results = [
+            ("ini", time_per_call(lambda: load_ini(path), args.runs)),
+            ("typed", time_per_call(lambda: load_typed_ini(path), args.runs)),
+            ("snapshot", time_per_call(lambda: load_config_fast(path, refresh=False), args.runs)),
+        ]
+
+        # An edit that keeps the size must still be seen through the hash
+        text = path.read_text()
+        path.write_text(text.replace("enabled = False", "enabled = True ", 1))
+        changed, _ = load_config_fast(path, refresh=False)
+        if changed != load_typed_ini(path)[0] or changed == typed:
+            print("FAIL: snapshot used after config.ini changed")
+            return 1
+
+    baseline = results[0][1]
+    print(f"config load, list size {args.list_size or 'as shipped'}, {args.runs} runs")
+    for name, us in results:
+        print(f"  {name:<9} {us:>9.1f} us   x{baseline / us:.1f}")
+
+    if results[2][1] >= results[1][1]:
+        print("FAIL: loading the snapshot is not faster than parsing the INI")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
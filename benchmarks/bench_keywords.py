@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Keyword matching benchmark: per-keyword scan vs Aho-Corasick
+
+Times matching a batch of typical mesh messages against keyword lists of
+growing size, once with the naive approach (one word-boundary regex search
+per keyword) and once with alertlib.keywords.KeywordMatcher. The naive cost
+grows with the keyword count; the automaton's should stay flat. Fails if
+the matcher's per-message time at the largest list is more than --max-growth
+times its time with the 11 shipped keywords.
+
+The last line compares the shared emergency + customAlert engine with
+emergency keywords alone; both go through one fold and one scan per message.
+
+Usage:
+    python3 benchmarks/bench_keywords.py [--sizes 11,100,1000,5000] [--max-growth 3]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from alertlib.keyword_alerts import KeywordAlertEngine  # noqa: E402
+from alertlib.keywords import KeywordMatcher  # noqa: E402
+
+SHIPPED_KEYWORDS = ['emergency', '911', '112', '999', 'police', 'fire', 'ambulance',
+                    'rescue', 'help', 'sos', 'mayday']
+
+MESSAGES = [
+    "Good morning mesh, heading up the ridge trail today",
+    "Anyone copy? Signal is weak near the north campground",
+    "Battery at 40%, switching to low power mode for the night",
+    "Thanks for the helpful tip about the antenna placement!",
+    "Need help, twisted ankle at trail marker 14, send rescue",
+    "Weather looks clear, 12C and light wind from the west",
+    "Checking in from base camp, all good here",
+    "sos sos lost near the lake, phone dead, using radio",
+]
+
+
+def make_keywords(count: int, rng: random.Random) -> List[str]:
+    """The shipped keywords padded with random words up to count"""
+    keywords = list(SHIPPED_KEYWORDS)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    while len(keywords) < count:
+        keywords.append(''.join(rng.choice(letters) for _ in range(rng.randint(4, 10))))
+    return keywords[:count]
+
+
+def naive_matcher(keywords: List[str]) -> Callable[[str], List[str]]:
+    patterns = [(k, re.compile(r'\b' + re.escape(k) + r'\b')) for k in keywords]
+
+    def match(text: str) -> List[str]:
+        lowered = text.lower()
+        return [k for k, pattern in patterns if pattern.search(lowered)]
+    return match
+
+
+def per_message_us(match: Callable[[str], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for message in MESSAGES:
+                match(message)
+        best = min(best, (time.perf_counter() - start) / (repeat * len(MESSAGES)))
+    return best * 1e6
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="11,100,1000,5000",
+                        help="comma-separated keyword counts")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--max-growth", type=float, default=3.0)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',')]
+    rng = random.Random(42)
+
+    print(f"{'keywords':>8}  {'build':>9}  {'naive':>10}  {'automaton':>10}")
+    automaton_times = []
+    for size in sizes:
+        keywords = make_keywords(size, rng)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        naive = naive_matcher(keywords)
+        for message in MESSAGES:
+            expected = sorted(set(naive(message)))
+            got = sorted({m.keyword for m in matcher.finditer(message)})
+            if expected != got:
+                print(f"FAIL: mismatch on {message!r}: {got} != {expected}")
+                return 1
+
+        # Fewer naive repeats for large lists, it is the slow side
+        naive_us = per_message_us(naive, max(1, args.repeat * 11 // size))
+        automaton_us = per_message_us(matcher.findall, args.repeat)
+        automaton_times.append(automaton_us)
+        print(f"{size:>8}  {build_ms:>7.1f}ms  {naive_us:>8.1f}us  {automaton_us:>8.1f}us")
+
+    custom = make_keywords(111, rng)[11:]
+    emergency_only = per_message_us(KeywordAlertEngine(SHIPPED_KEYWORDS).scan, args.repeat)
+    shared = per_message_us(
+        KeywordAlertEngine(SHIPPED_KEYWORDS, custom, case_sensitive=True).scan, args.repeat)
+    print(f"emergency only {emergency_only:.1f}us, emergency + {len(custom)} custom "
+          f"(case-sensitive) {shared:.1f}us")
+
+    growth = automaton_times[-1] / automaton_times[0]
+    print(f"automaton per-message growth {sizes[0]} -> {sizes[-1]} keywords: x{growth:.2f}")
+    if growth > args.max_growth:
+        print(f"FAIL: growth exceeds x{args.max_growth:.1f}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
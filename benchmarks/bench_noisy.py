@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Noisy-node flood benchmark
+
+Replays a simulated flood at --rate messages per second for --seconds
+(simulated time, so it runs as fast as the code allows) through two
+detectors:
+
+  naive     a timestamp deque per node, pruned on every packet
+  buckets   alertlib.noisy.NoisyNodeDetector
+
+Most traffic comes from a handful of flooding nodes; the rest is spread
+over --senders node IDs (a spoofed-ID flood when that exceeds 10k). Reports
+the cost per packet, the share of one CPU needed to keep up with the rate,
+and peak traced memory. Both detectors must flag the same flooding nodes.
+
+The bucketed detector trades CPU for a memory bound: it costs more per
+packet than the deque version, but its peak memory stays under a fixed cap
+set by max_nodes, however long the flood runs. The benchmark then replays
+floods at a quarter, half and all of --rate through it alone, and fails
+unless its peak stays under the cap and its cost per packet stays flat
+(within FLAT_TOLERANCE) as the flood grows.
+
+Usage:
+    python3 benchmarks/bench_noisy.py [--rate 1000] [--seconds 600] [--senders 20000]
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from alertlib.noisy import NoisyNodeDetector  # noqa: E402
+
+THRESHOLD = 50
+WINDOW = 600
+FLOODERS = 5
+
+# The detector's own bound: its preallocated arrays plus, per node slot, the
+# LRU index entry with its key and slot ints (allowing for the index table
+# being rebuilt while full)
+LRU_BYTES_PER_NODE = 240
+FLAT_TOLERANCE = 1.5   # largest / smallest cost per packet across flood sizes
+
+
+class NaiveDetector:
+    """Per-node timestamp lists, the approach the bucketed detector replaces"""
+
+    def __init__(self, threshold: int, window: float):
+        self.threshold = threshold
+        self.window = window
+        self.seen: Dict[int, deque] = {}
+        self.alerted: Set[int] = set()
+
+    def record(self, node: int, now: float):
+        stamps = self.seen.setdefault(node, deque())
+        stamps.append(now)
+        cutoff = now - self.window
+        while stamps and stamps[0] <= cutoff:
+            stamps.popleft()
+        if len(stamps) >= self.threshold and node not in self.alerted:
+            self.alerted.add(node)
+            return node
+        if len(stamps) < self.threshold:
+            self.alerted.discard(node)
+        return None
+
+
+def make_traffic(rate: int, seconds: int, senders: int) -> List[Tuple[int, float]]:
+    rng = random.Random(11)
+    packets = []
+    for i in range(rate * seconds):
+        now = i / rate
+        if rng.random() < 0.3:
+            node = 1 + rng.randrange(FLOODERS)
+        else:
+            node = 1000 + rng.randrange(senders)
+        packets.append((node, now))
+    return packets
+
+
+def replay(detector, packets) -> Set[int]:
+    flagged = set()
+    for node, now in packets:
+        if detector.record(node, now) is not None:
+            flagged.add(node)
+    return flagged
+
+
+def run(factory, packets) -> Tuple[float, int, Set[int]]:
+    """Time one replay, then measure peak memory in a second (traced) replay"""
+    start = time.perf_counter()
+    flagged = replay(factory(), packets)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    replay(factory(), packets)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, flagged
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rate", type=int, default=1000, help="messages per second")
+    parser.add_argument("--seconds", type=int, default=600, help="simulated flood length")
+    parser.add_argument("--senders", type=int, default=20000, help="distinct background node IDs")
+    args = parser.parse_args()
+
+    packets = make_traffic(args.rate, args.seconds, args.senders)
+    print(f"{len(packets)} packets, {args.rate}/s for {args.seconds}s, "
+          f"{FLOODERS} flooders + {args.senders} other senders")
+
+    results = {}
+    for name, factory in (("naive", lambda: NaiveDetector(THRESHOLD, WINDOW)),
+                          ("buckets", lambda: NoisyNodeDetector(THRESHOLD, WINDOW))):
+        elapsed, peak, flagged = run(factory, packets)
+        per_packet_us = elapsed / len(packets) * 1e6
+        results[name] = (per_packet_us, peak, flagged)
+        cpu_share = per_packet_us * args.rate / 1e6 * 100
+        print(f"  {name:<8} {per_packet_us:>6.2f} us/packet  {cpu_share:>5.1f}% CPU at "
+              f"{args.rate}/s  peak {peak / 1e6:>6.1f} MB")
+
+    naive_us = results["naive"][0]
+    buckets_us, buckets_peak = results["buckets"][0], results["buckets"][1]
+    print(f"  buckets cost {buckets_us / naive_us:.1f}x the naive detector per packet, "
+          f"using {buckets_peak / results['naive'][1]:.0%} of its peak memory")
+
+    detector = NoisyNodeDetector(THRESHOLD, WINDOW)
+    cap = detector.memory_bytes + detector.max_nodes * LRU_BYTES_PER_NODE
+    costs = []
+    for fraction in (4, 2, 1):
+        rate = max(1, args.rate // fraction)
+        flood = make_traffic(rate, args.seconds, args.senders) if fraction > 1 else packets
+        elapsed, peak, _ = run(lambda: NoisyNodeDetector(THRESHOLD, WINDOW), flood)
+        costs.append(elapsed / len(flood) * 1e6)
+        print(f"  buckets at {rate:>5}/s: {costs[-1]:>6.2f} us/packet  peak {peak / 1e6:>6.1f} MB "
+              f"(cap {cap / 1e6:.1f} MB)")
+        if peak > cap:
+            print(f"FAIL: peak memory {peak / 1e6:.1f} MB exceeds the {cap / 1e6:.1f} MB cap")
+            return 1
+    if max(costs) > min(costs) * FLAT_TOLERANCE:
+        print(f"FAIL: cost per packet grew from {min(costs):.2f} to {max(costs):.2f} us with the flood")
+        return 1
+
+    flagged = {name: result[2] for name, result in results.items()}
+    flooders = set(range(1, FLOODERS + 1))
+    if flagged["naive"] != flagged["buckets"]:
+        print("FAIL: the detectors flagged different nodes")
+        return 1
+    if not flooders <= flagged["buckets"]:
+        print(f"FAIL: flooders not flagged: {sorted(flooders - flagged['buckets'])}")
+        return 1
+    if flagged["buckets"] - flooders:
+        print(f"FAIL: background nodes flagged: {len(flagged['buckets'] - flooders)}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
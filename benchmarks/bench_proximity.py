@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Proximity benchmark: per-pair haversine vs the geofence engine
+
+Places --nodes random nodes and --fences random fences (50 m to 2 km) in a
+2 x 2 degree area and times one check of every node against every fence:
+
+  naive    haversine for every node/fence pair in plain Python
+  python   ProximityEngine without NumPy (bounding-box prefilter)
+  numpy    ProximityEngine with NumPy (vectorised prefilter and haversine)
+
+All three must agree on which nodes are inside which fences.
+
+Usage:
+    python3 benchmarks/bench_proximity.py [--nodes 10000] [--fences 100]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from alertlib.proximity import Geofence, ProximityEngine, haversine_m, np  # noqa: E402
+
+AREA = (44.0, -124.0)  # south-west corner
+SPAN = 2.0             # degrees
+
+
+def naive_check(fences, nodes, lats, lons):
+    found = {}
+    for fi, fence in enumerate(fences):
+        for node, lat, lon in zip(nodes, lats, lons):
+            dist = haversine_m(lat, lon, fence.latitude, fence.longitude)
+            if dist <= fence.radius_m:
+                found[(node, fi)] = dist
+    return found
+
+
+def best_ms(func, runs: int) -> float:
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--fences", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    fences = [Geofence(f"fence{i}", AREA[0] + rng.random() * SPAN, AREA[1] + rng.random() * SPAN,
+                       rng.uniform(50, 2000)) for i in range(args.fences)]
+    nodes = list(range(1, args.nodes + 1))
+    lats = [AREA[0] + rng.random() * SPAN for _ in nodes]
+    lons = [AREA[1] + rng.random() * SPAN for _ in nodes]
+
+    python_engine = ProximityEngine(fences, use_numpy=False)
+    expected = python_engine.contained(nodes, lats, lons)
+    results = [
+        ("naive", best_ms(lambda: naive_check(fences, nodes, lats, lons), 1)),
+        ("python", best_ms(lambda: python_engine.contained(nodes, lats, lons), args.runs)),
+    ]
+    if naive_check(fences, nodes, lats, lons).keys() != expected.keys():
+        print("FAIL: prefiltered result differs from the naive check")
+        return 1
+
+    if np is not None:
+        numpy_engine = ProximityEngine(fences)
+        lat_array, lon_array = np.array(lats), np.array(lons)
+        if numpy_engine.contained(nodes, lat_array, lon_array).keys() != expected.keys():
+            print("FAIL: NumPy result differs from the naive check")
+            return 1
+        results.append(("numpy", best_ms(
+            lambda: numpy_engine.contained(nodes, lat_array, lon_array), args.runs)))
+    else:
+        print("NumPy not installed, skipping the vectorised engine")
+
+    print(f"{args.nodes} nodes x {args.fences} fences, {len(expected)} inside")
+    baseline = results[0][1]
+    for name, ms in results:
+        print(f"  {name:<7} {ms:>9.1f} ms   x{baseline / ms:.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
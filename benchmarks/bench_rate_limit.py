@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Alert rate limiter throughput benchmark
+
+Runs --decisions admit() calls through alertlib.rate_limit.RateLimiter with
+a global limit and per-type limits, spread over the alert sections, with a
+simulated clock advancing --rate decisions per second. Reports decisions
+per second of CPU, and checks that the number admitted matches what the
+limits allow over the simulated time.
+
+Usage:
+    python3 benchmarks/bench_rate_limit.py [--decisions 2000000] [--rate 100]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from alertlib.rate_limit import RateLimiter  # noqa: E402
+
+MAX_PER_HOUR = 20
+PER_TYPE = {'proximityAlert': 5, 'noisyNodeAlert': 2}
+TYPES = ('emergencyHandler', 'proximityAlert', 'altitudeAlert', 'weatherAlert',
+         'batteryAlert', 'noisyNodeAlert', 'newNodeAlert', 'snrAlert',
+         'disconnectAlert', 'customAlert')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--decisions", type=int, default=2000000, help="admit() calls to time")
+    parser.add_argument("--rate", type=float, default=100.0, help="simulated alerts per second")
+    args = parser.parse_args()
+
+    limiter = RateLimiter(MAX_PER_HOUR, PER_TYPE, clock=lambda: 0.0)
+    admit = limiter.admit
+    step = 1.0 / args.rate
+    types = [TYPES[i % len(TYPES)] for i in range(1000)]
+
+    admitted = 0
+    start = time.perf_counter()
+    for i in range(args.decisions):
+        admitted += admit(types[i % 1000], i * step)
+    elapsed = time.perf_counter() - start
+
+    hours = args.decisions * step / 3600
+    allowed = MAX_PER_HOUR * (1 + hours)  # full bucket at the start, then the refill
+    print(f"{args.decisions} decisions over {hours:.1f} simulated hours: "
+          f"{args.decisions / elapsed / 1e6:.2f} M decisions/s, "
+          f"{elapsed / args.decisions * 1e9:.0f} ns each")
+    print(f"  admitted {admitted}, limit allows at most {allowed:.0f}")
+
+    if admitted > allowed + 1:
+        print("FAIL: more alerts admitted than the limit allows")
+        return 1
+    if admitted < allowed - MAX_PER_HOUR - 1:
+        print("FAIL: far fewer alerts admitted than the limit allows")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Seen-node set start-up benchmark
+
+Stores --nodes node numbers two ways and times opening them at start-up:
+
+  json      a JSON list loaded into a Python set
+  seen      alertlib.seen_nodes.SeenNodes (memory-mapped sorted uint32)
+
+and the cost of a membership check in each. Both must agree on every
+lookup.
+
+Usage:
+    python3 benchmarks/bench_seen_nodes.py [--nodes 200000] [--lookups 100000]
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from alertlib.seen_nodes import SeenNodes  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200000, help="nodes already seen")
+    parser.add_argument("--lookups", type=int, default=100000, help="membership checks to time")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    nodes = rng.sample(range(1 << 32), args.nodes)
+    probes = [rng.choice(nodes) if rng.random() < 0.9 else rng.randrange(1 << 32)
+              for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "seen.json"
+        json_path.write_text(json.dumps(nodes))
+        seen_path = Path(tmp) / "seen.bin"
+        SeenNodes(seen_path).update(nodes)
+        print(f"{args.nodes} nodes: json {json_path.stat().st_size / 1e6:.1f} MB, "
+              f"seen {seen_path.stat().st_size / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        with open(json_path) as f:
+            json_set = set(json.load(f))
+        json_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        seen = SeenNodes(seen_path)
+        seen_load = time.perf_counter() - start
+
+        results = {}
+        for name, container, load in (("json", json_set, json_load), ("seen", seen, seen_load)):
+            start = time.perf_counter()
+            hits = [node in container for node in probes]
+            per_lookup_us = (time.perf_counter() - start) / len(probes) * 1e6
+            results[name] = hits
+            print(f"  {name:<5} load {load * 1000:>8.2f} ms  lookup {per_lookup_us:>5.2f} us")
+        seen.close()
+
+    if results["json"] != results["seen"]:
+        print("FAIL: the sets disagree on membership")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for configure_bot_improved.py
+
+Imports the module in a fresh interpreter with ``python -X importtime`` and
+fails if the cumulative import time exceeds the budget, or if importing it
+pulled in rich (rich must only load when the first widget is drawn) or any
+of the configlib modules and heavier stdlib modules that are only imported
+by the functions that need them.
+
+Usage:
+    python3 benchmarks/bench_startup.py [--budget-ms 40] [--runs 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MODULE = "configure_bot_improved"
+
+# Cold-start budget for the module import; it takes about 25 ms on a desktop,
+# so pass a larger --budget-ms on slow boards such as a Pi Zero 2 W
+STARTUP_BUDGET_MS = 40.0
+
+# Imported lazily by configure_bot_improved.py; any of these at startup means
+# a top-level import crept back in, whatever the machine's speed
+DEFERRED_MODULES = ("configlib.schema", "configlib.ini_writer", "configlib.install_locator",
+                    "configlib.serial_ports", "configlib.answers", "json", "socket",
+                    "hashlib", "tempfile", "concurrent.futures")
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """Import module in a fresh interpreter, return (cumulative ms, imported names)"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(REPO_ROOT), capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    cumulative_us = None
+    imported = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = [f.strip() for f in line[len("import time:"):].split("|")]
+        if not fields[1].isdigit():
+            continue  # header line
+        name = fields[2].strip()
+        imported.append(name)
+        if name == module:
+            cumulative_us = int(fields[1])
+
+    if cumulative_us is None:
+        raise RuntimeError(f"{module} not found in -X importtime output")
+    return cumulative_us / 1000.0, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = []
+    imported = []
+    for _ in range(args.runs):
+        ms, imported = measure_import(MODULE)
+        timings.append(ms)
+
+    best = min(timings)
+    print(f"{MODULE}: best {best:.1f} ms, worst {max(timings):.1f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    rich_modules = [name for name in imported if name == "rich" or name.startswith("rich.")]
+    if rich_modules:
+        print(f"FAIL: rich imported at startup: {', '.join(rich_modules[:5])}")
+        failed = True
+    deferred = [name for name in imported if name in DEFERRED_MODULES]
+    if deferred:
+        print(f"FAIL: imported at startup instead of on demand: {', '.join(deferred)}")
+        failed = True
+    if best > args.budget_ms:
+        print(f"FAIL: cold start {best:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""
+Support modules for the meshing-around configuration tools
+
+Nothing is loaded at package import. configure_bot.py imports the modules it
+uses at the top; configure_bot_improved.py imports only platform_profile up
+front and the rest inside the functions that use them, to keep startup fast.
+"""
@@ -0,0 +1,172 @@
+"""
+Answer files for running the configuration wizards without prompts
+
+An answer file maps wizard names to the answers for that wizard's prompts.
+Prompts are addressed by a key derived from the prompt text: lower-cased,
+with anything in brackets or parentheses dropped and other punctuation
+turned into underscores, so "Use auto-detect for serial port?" becomes
+use_auto_detect_for_serial_port. Prompts without an answer take their
+default, exactly as if Enter had been pressed.
+
+Reserved top-level keys:
+    output  - where to write config.ini (relative to the answer file)
+    base    - existing config to start from, e.g. config.enhanced.ini
+    set     - "section.key" -> value overrides applied after the wizards
+
+JSON, YAML (needs PyYAML) and INI are accepted. In INI files the reserved
+keys live in an [answers] section, overrides in [set], and every other
+section is a wizard.
+"""
+
+import configparser
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+RESERVED_KEYS = ('output', 'base', 'set')
+
+_BRACKETED = re.compile(r'\([^)]*\)|\[[^\]]*\]')
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+TRUE_VALUES = ('true', 'yes', 'y', '1', 'on')
+FALSE_VALUES = ('false', 'no', 'n', '0', 'off')
+
+
+def prompt_key(prompt: str) -> str:
+    """Derive the answer-file key for a prompt"""
+    text = _BRACKETED.sub(' ', prompt).lower()
+    return _NON_WORD.sub('_', text).strip('_')
+
+
+def parse_bool(value: Any) -> bool:
+    """Interpret an answer as yes/no"""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValueError(f"expected yes/no, got {value!r}")
+
+
+def parse_override(text: str) -> Tuple[str, str, str]:
+    """Split 'section.key=value' into its parts"""
+    target, sep, value = text.partition('=')
+    section, dot, key = target.strip().partition('.')
+    if not sep or not dot or not section or not key:
+        raise ValueError(f"expected SECTION.KEY=VALUE, got {text!r}")
+    return section, key.strip(), value.strip()
+
+
+def _load_ini(path: Path) -> Dict[str, Any]:
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read(path)
+    data: Dict[str, Any] = {}
+    for section in parser.sections():
+        values = dict(parser.items(section))
+        if section == 'answers':
+            data.update(values)
+        else:
+            data[section] = values
+    return data
+
+
+def load_answer_file(path: Path) -> Dict[str, Any]:
+    """Read an answer file (JSON, YAML or INI) into a dict"""
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    if suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("PyYAML is required for YAML answer files (pip install pyyaml)")
+        with open(path, 'r') as f:
+            data = yaml.safe_load(f) or {}
+    elif suffix in ('.ini', '.cfg', '.conf'):
+        data = _load_ini(path)
+    else:
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping at the top level")
+    return data
+
+
+class AnswerSource:
+    """Supplies wizard answers from an answer file instead of the keyboard"""
+
+    def __init__(self, data: Dict[str, Any], origin: Optional[Path] = None):
+        self.origin = Path(origin) if origin is not None else None
+        self.output: Optional[str] = data.get('output')
+        self.base: Optional[str] = data.get('base')
+        self.overrides: Dict[str, Any] = dict(data.get('set') or {})
+
+        self.wizards: Dict[str, Dict[str, Any]] = {}
+        for name, answers in data.items():
+            if name in RESERVED_KEYS:
+                continue
+            if not isinstance(answers, dict):
+                raise ValueError(f"answers for wizard '{name}' must be a mapping")
+            self.wizards[name] = {prompt_key(str(k)): v for k, v in answers.items()}
+
+        self._current: Dict[str, Any] = {}
+        self._current_name = ""
+        self._used: set = set()
+
+    @classmethod
+    def from_file(cls, path: Path) -> "AnswerSource":
+        return cls(load_answer_file(path), origin=path)
+
+    def resolve(self, relative: str) -> Path:
+        """Resolve a path from the answer file relative to the file itself"""
+        path = Path(relative).expanduser()
+        if not path.is_absolute() and self.origin is not None:
+            path = self.origin.parent / path
+        return path
+
+    def begin(self, wizard: str):
+        """Select the wizard whose prompts are answered next"""
+        self._current_name = wizard
+        self._current = self.wizards.get(wizard, {})
+
+    def lookup(self, prompt: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a prompt in the current wizard"""
+        key = prompt_key(prompt)
+        if key in self._current:
+            self._used.add((self._current_name, key))
+            return True, self._current[key]
+        return False, None
+
+    def answer(self, prompt: str, default: Any = "", input_type: type = str) -> Any:
+        """Answer a get_input() prompt, falling back to its default"""
+        found, value = self.lookup(prompt)
+        if not found or value is None:
+            value = default
+
+        if input_type == bool:
+            return parse_bool(value)
+        if input_type == int:
+            return int(value) if value != "" else 0
+        if input_type == float:
+            return float(value) if value != "" else 0.0
+        if isinstance(value, (list, tuple)):
+            return ','.join(str(v) for v in value)
+        return str(value)
+
+    def answer_yes_no(self, prompt: str, default: bool = False) -> bool:
+        """Answer a get_yes_no() prompt, falling back to its default"""
+        found, value = self.lookup(prompt)
+        if not found or value is None or value == "":
+            return default
+        return parse_bool(value)
+
+    def unused(self) -> List[str]:
+        """wizard.prompt keys that were never asked (usually typos)"""
+        return [f"{wizard}.{key}"
+                for wizard, answers in self.wizards.items()
+                for key in answers
+                if (wizard, key) not in self._used]
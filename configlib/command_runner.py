@@ -0,0 +1,283 @@
+"""
+Command execution with streaming output and per-command timing
+
+AsyncCommandRunner runs commands with asyncio. stdout/stderr are streamed
+line by line to the console and to a log file while the command runs, with
+only a bounded tail kept in memory. Output is read in chunks rather than
+with readline(), so a line of any length cannot overrun the stream buffer;
+overlong lines are passed on in MAX_LINE pieces. A semaphore lets
+independent commands overlap, and cancelling the calling task (e.g. Ctrl+C)
+kills the child.
+
+Every command, sync or async, can record a CommandTiming (wall clock and
+child CPU time). Timings are only kept inside a timing_scope(), which hands
+out a fresh TimingRecorder for one quick setup or maintenance run and
+renders its summary table at the end; outside a scope nothing accumulates.
+"""
+
+import asyncio
+import resource
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from configlib.paths import cache_dir
+
+COMMAND_LOG = "commands.log"
+DEFAULT_TIMEOUT = 600  # 10 minutes
+TAIL_LINES = 200
+READ_CHUNK = 65536
+MAX_LINE = 65536  # longer lines are split into pieces of this many bytes
+
+# A piped child cannot show a prompt that has no trailing newline, so apt runs
+# whose output is captured or streamed must not stop at dpkg's conffile
+# question: keep locally modified config files, take the default otherwise
+APT_KEEP_CONFFILES = ['-o', 'Dpkg::Options::=--force-confdef',
+                      '-o', 'Dpkg::Options::=--force-confold']
+
+
+class CommandTiming(NamedTuple):
+    """Wall-clock and CPU time for one command"""
+    cmd: str
+    desc: str
+    returncode: int
+    wall: float
+    cpu_user: float
+    cpu_sys: float
+
+    @property
+    def cpu(self) -> float:
+        """Total child CPU time (user + system)"""
+        return self.cpu_user + self.cpu_sys
+
+
+class CommandResult(NamedTuple):
+    """Exit status, output tail and timing of a command"""
+    returncode: int
+    stdout: str
+    stderr: str
+    timing: CommandTiming
+
+
+class TimingRecorder:
+    """Collects CommandTimings for a summary table"""
+
+    def __init__(self):
+        self.entries: List[CommandTiming] = []
+
+    def record(self, timing: CommandTiming):
+        self.entries.append(timing)
+
+    def clear(self):
+        self.entries = []
+
+    def format_table(self, max_cmd_width: int = 40) -> List[str]:
+        """Render the recorded timings as plain-text table lines"""
+        if not self.entries:
+            return []
+
+        header = f"{'Command':<{max_cmd_width}}  {'Exit':>4}  {'Wall':>8}  {'CPU':>8}"
+        lines = [header, '-' * len(header)]
+        for t in self.entries:
+            label = t.desc or t.cmd
+            if len(label) > max_cmd_width:
+                label = label[:max_cmd_width - 3] + '...'
+            lines.append(f"{label:<{max_cmd_width}}  {t.returncode:>4}  "
+                         f"{t.wall:>7.1f}s  {t.cpu:>7.1f}s")
+        total_wall = sum(t.wall for t in self.entries)
+        total_cpu = sum(t.cpu for t in self.entries)
+        lines.append('-' * len(header))
+        lines.append(f"{'Total':<{max_cmd_width}}  {'':>4}  {total_wall:>7.1f}s  {total_cpu:>7.1f}s")
+        return lines
+
+
+_active: Optional[TimingRecorder] = None
+
+
+def get_timing_recorder() -> Optional[TimingRecorder]:
+    """Return the recorder of the innermost timing_scope(), or None outside one"""
+    return _active
+
+
+@contextmanager
+def timing_scope() -> Iterator[TimingRecorder]:
+    """Record the commands run inside the block in a fresh TimingRecorder"""
+    global _active
+    previous, _active = _active, TimingRecorder()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+class CommandClock:
+    """Measures wall-clock and child CPU time around a command
+
+    Child CPU time comes from getrusage(RUSAGE_CHILDREN), so it is exact for
+    commands that do not overlap and shared between overlapping ones.
+    """
+
+    def __init__(self):
+        self._start = time.monotonic()
+        self._usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    def stop(self, cmd: Sequence[str], desc: str, returncode: int,
+             recorder: Optional[TimingRecorder] = None) -> CommandTiming:
+        usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        timing = CommandTiming(
+            cmd=' '.join(cmd), desc=desc, returncode=returncode,
+            wall=time.monotonic() - self._start,
+            cpu_user=usage.ru_utime - self._usage.ru_utime,
+            cpu_sys=usage.ru_stime - self._usage.ru_stime,
+        )
+        if recorder is not None:
+            recorder.record(timing)
+        return timing
+
+
+class AsyncCommandRunner:
+    """Run commands concurrently with line-streamed output and timing"""
+
+    def __init__(self, max_concurrency: int = 2, echo: Optional[Callable[[str], None]] = print,
+                 log_path: Optional[Path] = None, recorder: Optional[TimingRecorder] = None,
+                 tail_lines: int = TAIL_LINES):
+        self.max_concurrency = max(1, max_concurrency)
+        self.echo = echo
+        self.log_path = log_path if log_path is not None else cache_dir() / COMMAND_LOG
+        self.recorder = recorder if recorder is not None else _active
+        self.tail_lines = tail_lines
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._log = None
+
+    def _open_log(self):
+        if self._log is None and self.log_path:
+            try:
+                Path(self.log_path).parent.mkdir(parents=True, exist_ok=True)
+                self._log = open(self.log_path, 'a', buffering=1)
+            except (PermissionError, IOError, OSError):
+                self.log_path = None
+
+    def close(self):
+        """Close the command log"""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _log_line(self, line: str):
+        if self._log is not None:
+            self._log.write(line + '\n')
+
+    def _emit(self, raw: bytes, tail: deque, prefix: str, echo: bool):
+        line = raw.decode('utf-8', 'replace')
+        tail.append(line)
+        self._log_line(prefix + line)
+        if echo and self.echo is not None:
+            self.echo(line)
+
+    async def _pump(self, stream: asyncio.StreamReader, tail: deque, prefix: str, echo: bool):
+        """Forward lines from a child stream to the console, log and tail buffer"""
+        pending = b''
+        while True:
+            chunk = await stream.read(READ_CHUNK)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for raw in lines:
+                self._emit(raw, tail, prefix, echo)
+            while len(pending) >= MAX_LINE:
+                self._emit(pending[:MAX_LINE], tail, prefix, echo)
+                pending = pending[MAX_LINE:]
+        if pending:
+            self._emit(pending, tail, prefix, echo)
+
+    async def run(self, cmd: Sequence[str], desc: str = "", timeout: float = DEFAULT_TIMEOUT,
+                  echo: bool = True) -> CommandResult:
+        """Run one command, streaming its output; honours the concurrency limit"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._open_log()
+
+        async with self._semaphore:
+            clock = CommandClock()
+            stdout_tail: deque = deque(maxlen=self.tail_lines)
+            stderr_tail: deque = deque(maxlen=self.tail_lines)
+            self._log_line(f"$ {' '.join(cmd)}")
+
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            except FileNotFoundError:
+                timing = clock.stop(cmd, desc, -1, self.recorder)
+                return CommandResult(-1, "", "Command not found", timing)
+            except OSError as e:
+                timing = clock.stop(cmd, desc, -1, self.recorder)
+                return CommandResult(-1, "", str(e), timing)
+
+            async def communicate() -> int:
+                await asyncio.gather(
+                    self._pump(proc.stdout, stdout_tail, "", echo),
+                    self._pump(proc.stderr, stderr_tail, "! ", echo),
+                )
+                return await proc.wait()
+
+            try:
+                returncode = await asyncio.wait_for(communicate(), timeout)
+            except asyncio.TimeoutError:
+                await self._kill(proc)
+                stderr_tail.append("Timeout")
+                returncode = -1
+            except asyncio.CancelledError:
+                await self._kill(proc)
+                clock.stop(cmd, desc, -1, self.recorder)
+                self._log_line("# cancelled")
+                raise
+
+            timing = clock.stop(cmd, desc, returncode, self.recorder)
+            self._log_line(f"# exit {returncode} in {timing.wall:.1f}s")
+            return CommandResult(returncode, '\n'.join(stdout_tail),
+                                 '\n'.join(stderr_tail), timing)
+
+    @staticmethod
+    async def _kill(proc: asyncio.subprocess.Process, grace: float = 3.0):
+        """Terminate a child, escalating to SIGKILL after a grace period"""
+        if proc.returncode is not None:
+            return
+        try:
+            proc.terminate()
+            await asyncio.wait_for(proc.wait(), grace)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+        except ProcessLookupError:
+            pass
+
+    async def run_many(self, commands: Sequence[Tuple[Sequence[str], str]],
+                       echo: bool = False) -> List[CommandResult]:
+        """Run independent (cmd, desc) pairs concurrently, results in input order"""
+        return list(await asyncio.gather(
+            *(self.run(cmd, desc, echo=echo) for cmd, desc in commands)
+        ))
+
+
+def run_streaming(cmd: Sequence[str], desc: str = "", timeout: float = DEFAULT_TIMEOUT,
+                  echo: Optional[Callable[[str], None]] = print) -> CommandResult:
+    """Run one command from synchronous code, streaming its output"""
+    runner = AsyncCommandRunner(max_concurrency=1, echo=echo)
+    try:
+        return asyncio.run(runner.run(cmd, desc, timeout=timeout, echo=echo is not None))
+    finally:
+        runner.close()
+
+
+def run_parallel(commands: Sequence[Tuple[Sequence[str], str]],
+                 max_concurrency: int = 4) -> List[CommandResult]:
+    """Run independent (cmd, desc) pairs concurrently from synchronous code"""
+    runner = AsyncCommandRunner(max_concurrency=max_concurrency, echo=None)
+    try:
+        return asyncio.run(runner.run_many(commands))
+    finally:
+        runner.close()
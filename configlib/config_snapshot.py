@@ -0,0 +1,117 @@
+"""
+Precompiled config snapshot
+
+Parsing config.ini means reading the text, splitting every comma-separated
+list and converting every number and flag, on every bot start and every
+configurator run. write_snapshot() stores the fully typed result (see
+configlib.schema) next to the INI as config.ini.snap, a marshal blob that
+loads with a single call. load_config_fast() uses the snapshot while it still
+matches the INI and falls back to parsing the INI otherwise.
+
+A snapshot is trusted when config.ini has the same mtime and size as when
+the snapshot was made. If those differ (the file was copied or touched) the
+INI is hashed and compared with the stored SHA-256 before falling back.
+"""
+
+import configparser
+import hashlib
+import marshal
+import os
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from configlib.ini_writer import write_atomic
+from configlib.schema import get_compiled_schema, load_typed, typed_from_values, typed_to_values
+
+PathLike = Union[str, Path]
+
+SNAPSHOT_SUFFIX = ".snap"
+SNAPSHOT_VERSION = 1
+
+
+def snapshot_path(config_file: PathLike) -> Path:
+    """config.ini -> config.ini.snap"""
+    config_file = Path(config_file)
+    return config_file.with_name(config_file.name + SNAPSHOT_SUFFIX)
+
+
+def _parse_ini(data: bytes) -> configparser.ConfigParser:
+    config = configparser.ConfigParser(interpolation=None)
+    config.read_string(data.decode('utf-8'))
+    return config
+
+
+def write_snapshot(config_file: PathLike) -> Tuple[Any, List[str]]:
+    """Compile config_file into its snapshot; returns (TypedConfig, errors)
+
+    The snapshot is only rewritten when its content would change.
+    """
+    config_file = Path(config_file)
+    with open(config_file, 'rb') as f:
+        st = os.fstat(f.fileno())
+        data = f.read()
+
+    typed, errors = load_typed(_parse_ini(data))
+    values, extras = typed_to_values(typed)
+    blob = marshal.dumps((
+        SNAPSHOT_VERSION,
+        get_compiled_schema().signature,
+        st.st_mtime_ns,
+        st.st_size,
+        hashlib.sha256(data).digest(),
+        values,
+        extras,
+        errors,
+    ))
+    write_atomic(snapshot_path(config_file), blob)
+    return typed, errors
+
+
+def read_snapshot(config_file: PathLike) -> Optional[Tuple[Any, List[str]]]:
+    """(TypedConfig, errors) from the snapshot, or None if missing or stale"""
+    config_file = Path(config_file)
+    try:
+        with open(snapshot_path(config_file), 'rb') as f:
+            record = marshal.loads(f.read())
+        st = os.stat(config_file)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    try:
+        version, signature, mtime_ns, size, digest, values, extras, errors = record
+    except (TypeError, ValueError):
+        return None
+    if version != SNAPSHOT_VERSION or signature != get_compiled_schema().signature:
+        return None
+
+    if (st.st_mtime_ns, st.st_size) != (mtime_ns, size):
+        if st.st_size != size:
+            return None
+        try:
+            with open(config_file, 'rb') as f:
+                if hashlib.sha256(f.read()).digest() != digest:
+                    return None
+        except OSError:
+            return None
+
+    return typed_from_values(values, extras), list(errors)
+
+
+def load_config_fast(config_file: PathLike, refresh: bool = True) -> Tuple[Any, List[str]]:
+    """TypedConfig for config_file, from the snapshot when it is current
+
+    On a stale or missing snapshot the INI is parsed; with refresh=True a new
+    snapshot is written (silently skipped if the directory is read-only).
+    """
+    cached = read_snapshot(config_file)
+    if cached is not None:
+        return cached
+
+    if refresh:
+        try:
+            return write_snapshot(config_file)
+        except (PermissionError, OSError):
+            pass
+
+    with open(config_file, 'rb') as f:
+        return load_typed(_parse_ini(f.read()))
@@ -0,0 +1,275 @@
+"""
+Round-trip INI writer
+
+ConfigParser.write() regenerates the whole file: every comment from
+config.enhanced.ini is lost, the write is not atomic, and unchanged bytes
+are rewritten on every save. save_ini() instead edits the existing text in
+place and only changes the lines whose values differ:
+
+- comments, blank lines, key spelling and ordering are kept
+- keys are matched case-insensitively (ConfigParser lower-cases them)
+- keys and sections missing from the file are appended where they belong
+- nothing is written if the rendered text equals what is on disk
+- the new file is written to a temp file in the same directory, fsynced
+  and renamed over the old one, so a power cut leaves either version
+- optionally the previous version is kept as config.ini.1, .2, ...
+"""
+
+import configparser
+import os
+import re
+import shutil
+import stat
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+_SECTION = re.compile(r'^\[(?P<name>[^\]]+)\]\s*$')
+_OPTION = re.compile(r'^(?P<key>[^\s=:;#][^=:]*?)(?P<sep>\s*[=:]\s*)(?P<value>.*)$')
+
+
+class _Block:
+    """Lines belonging to one section (lead = comments directly above the header)"""
+
+    def __init__(self, name: Optional[str]):
+        self.name = name
+        self.lead: List[str] = []
+        self.header: Optional[str] = None
+        self.body: List[Tuple[Optional[str], List[str]]] = []  # (key or None, lines)
+
+
+def _split_blocks(text: str) -> List[_Block]:
+    """Split INI text into blocks; continuation lines stay with their key"""
+    blocks = [_Block(None)]
+    pending: List[str] = []
+
+    for line in text.splitlines(keepends=True):
+        bare = line.rstrip('\r\n')
+        stripped = bare.strip()
+        current = blocks[-1]
+
+        match = _SECTION.match(bare)
+        if match:
+            block = _Block(match.group('name').strip())
+            block.lead, pending = pending, []
+            block.header = line
+            blocks.append(block)
+            continue
+
+        if not stripped or stripped[0] in '#;':
+            # Comments are held back until we know whether they introduce
+            # the next section or belong to the current one
+            pending.append(line)
+            if not stripped:
+                current.body.extend((None, [l]) for l in pending)
+                pending = []
+            continue
+
+        if bare[:1] in ' \t' and current.body and current.body[-1][0] is not None and not pending:
+            current.body[-1][1].append(line)
+            continue
+
+        current.body.extend((None, [l]) for l in pending)
+        pending = []
+        opt = _OPTION.match(bare)
+        key = opt.group('key').strip().lower() if opt else None
+        current.body.append((key, [line]))
+
+    blocks[-1].body.extend((None, [l]) for l in pending)
+    return blocks
+
+
+def _format_value(value: str) -> str:
+    """Render a value the way ConfigParser.write does (multi-line values indented)"""
+    return str(value).replace('\n', '\n\t')
+
+
+def _raw_value(lines: List[str]) -> str:
+    """Value text of an option as ConfigParser would read it"""
+    first = _OPTION.match(lines[0].rstrip('\r\n'))
+    parts = [first.group('value').strip()] + [l.strip() for l in lines[1:]]
+    return '\n'.join(p for p in parts if p or len(parts) == 1)
+
+
+def _option_line(key: str, value: str, template: Optional[str] = None,
+                 newline: str = '\n') -> List[str]:
+    if template is not None:
+        match = _OPTION.match(template.rstrip('\r\n'))
+        return [f"{match.group('key')}{match.group('sep')}{_format_value(value)}{newline}"]
+    return [f"{key} = {_format_value(value)}{newline}"]
+
+
+def _section_items(config: configparser.ConfigParser, name: str) -> Dict[str, str]:
+    if name == config.default_section:
+        return dict(config.defaults())
+    # Raw, so values containing '%' round-trip untouched; leave out
+    # inherited [DEFAULT] keys unless the section overrides them
+    defaults = config.defaults()
+    return {k: v for k, v in config.items(name, raw=True)
+            if k not in defaults or defaults[k] != v}
+
+
+def render_ini(config: configparser.ConfigParser, original: str = "") -> str:
+    """Render config as INI text, reusing the layout and comments of original"""
+    newline = '\r\n' if '\r\n' in original else '\n'
+    blocks = _split_blocks(original)
+    wanted = [config.default_section] if config.defaults() else []
+    wanted += config.sections()
+    present = {b.name for b in blocks if b.name is not None}
+    out: List[str] = []
+
+    for block in blocks:
+        if block.name is None:
+            out.extend(l for _, lines in block.body for l in lines)
+            continue
+        if block.name not in wanted:
+            continue  # section removed: drop its header, lead comments and body
+
+        items = _section_items(config, block.name)
+        items = {k.lower(): v for k, v in items.items()}
+        seen = set()
+        body: List[str] = []
+        last_option = -1
+
+        for key, lines in block.body:
+            if key is None:
+                body.extend(lines)
+                continue
+            if key not in items or key in seen:
+                continue  # option removed (or duplicated in the file)
+            seen.add(key)
+            value = items[key]
+            if value is None or _raw_value(lines) == str(value).strip():
+                body.extend(lines)
+            else:
+                body.extend(_option_line(key, value, lines[0], newline))
+            last_option = len(body)
+
+        added = [l for key, value in items.items() if key not in seen
+                 for l in _option_line(key, value, newline=newline)]
+        if added:
+            at = last_option if last_option >= 0 else len(body)
+            # Keep added keys before the blank line that separates sections
+            if last_option < 0:
+                while at > 0 and not body[at - 1].strip():
+                    at -= 1
+            body[at:at] = added
+
+        out.extend(block.lead)
+        out.append(block.header)
+        out.extend(body)
+
+    for name in wanted:
+        if name in present:
+            continue
+        if out and out[-1].strip():
+            out.append(newline)
+        out.append(f"[{name}]{newline}")
+        for key, value in _section_items(config, name).items():
+            out.extend(_option_line(key, value, newline=newline))
+        out.append(newline)
+
+    return ''.join(out)
+
+
+def _fsync_dir(directory: Path):
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _rotate_backups(path: Path, backups: int):
+    """Shift path.1 .. path.N-1 up by one and keep the current file as path.1
+
+    The current file is hard-linked rather than copied; the rename that
+    follows gives config.ini a new inode, so the link keeps the old content.
+    """
+    for i in range(backups - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{i}")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+
+    first = path.with_name(f"{path.name}.1")
+    try:
+        first.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(path, first)
+    except OSError:
+        # Filesystems without hard links (FAT on a boot partition)
+        shutil.copy2(path, first)
+
+
+def write_atomic(path: PathLike, text: Union[str, bytes], backups: int = 0) -> bool:
+    """Write text (or bytes) to path atomically; returns False if the content was unchanged"""
+    path = Path(path)
+    data = text.encode('utf-8') if isinstance(text, str) else text
+
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        st = None
+
+    if st is not None and st.st_size == len(data):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+
+    if st is not None:
+        mode = stat.S_IMODE(st.st_mode)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    directory = path.parent if str(path.parent) else Path('.')
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(directory))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_name, mode)
+        if st is not None and backups > 0:
+            _rotate_backups(path, backups)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    _fsync_dir(directory)
+    return True
+
+
+def save_ini(config: configparser.ConfigParser, path: PathLike, backups: int = 0,
+             template: Optional[PathLike] = None) -> bool:
+    """Save config to path, preserving its comments; returns False if unchanged
+
+    When path does not exist yet, the layout and comments of template (e.g.
+    config.enhanced.ini) are used instead.
+    """
+    path = Path(path)
+    original = ""
+    for source in (path, template):
+        if source is None:
+            continue
+        try:
+            with open(source, 'r', encoding='utf-8') as f:
+                original = f.read()
+            break
+        except FileNotFoundError:
+            continue
+    return write_atomic(path, render_ini(config, original), backups=backups)
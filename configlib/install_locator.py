@@ -0,0 +1,220 @@
+"""
+Locate the meshing-around installation
+
+The last known location is kept in a small JSON file in the user cache
+directory and re-validated with a single stat() on each lookup, so repeated
+menu visits (and later runs) do not search the disk again. When the cache
+and the well-known paths miss, a bounded, depth-limited os.scandir() walk
+runs over the home directory in parallel and its result is cached. A walk
+that finds nothing is cached too, for MISS_TTL seconds, so the many lookups
+of a run on a machine without meshing-around do not each walk $HOME.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from configlib.paths import cache_dir
+
+MARKER_FILE = "mesh_bot.py"
+CACHE_FILE = "install_location.json"
+CACHE_VERSION = 1
+
+# Search limits for the fallback walk
+MAX_DEPTH = 4
+SEARCH_TIMEOUT = 5.0
+SEARCH_WORKERS = 4
+DEADLINE_CHECK_ENTRIES = 256  # directory entries between deadline checks
+
+# How long a search that found nothing is trusted
+MISS_TTL = 600
+
+# Directories never worth descending into (hidden directories are skipped too)
+PRUNE_DIRS = frozenset([
+    'node_modules', '__pycache__', 'site-packages', 'venv', 'snap',
+])
+
+
+def _cache_path() -> Path:
+    return cache_dir() / CACHE_FILE
+
+
+def _is_install(path: Path) -> bool:
+    """True if path contains the meshing-around entry point"""
+    return (path / MARKER_FILE).is_file()
+
+
+def _read_cache() -> Optional[dict]:
+    try:
+        with open(_cache_path(), 'r') as f:
+            data = json.load(f)
+    except (FileNotFoundError, PermissionError, IOError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+        return None
+    return data
+
+
+def _write_cache(data: dict) -> None:
+    cache_file = _cache_path()
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_file, cache_file)
+    except (PermissionError, IOError, OSError):
+        pass
+
+
+def _load_cached() -> Optional[Path]:
+    """Return the cached location if it still holds mesh_bot.py"""
+    data = _read_cache()
+    if data is None:
+        return None
+    path = data.get('path')
+    if not path:
+        return None
+
+    try:
+        st = os.stat(os.path.join(path, MARKER_FILE))
+    except OSError:
+        return None
+    if (st.st_dev, st.st_ino) != (data.get('dev'), data.get('ino')):
+        # Same place, different checkout (e.g. re-cloned) - still valid
+        remember_install(Path(path))
+    return Path(path)
+
+
+def remember_install(path: Path) -> None:
+    """Record path as the meshing-around location for later lookups"""
+    try:
+        st = os.stat(path / MARKER_FILE)
+    except OSError:
+        return
+
+    _write_cache({
+        'version': CACHE_VERSION,
+        'path': str(Path(path).resolve()),
+        'dev': st.st_dev,
+        'ino': st.st_ino,
+        'recorded': int(time.time()),
+    })
+
+
+def _remember_miss(root: Path) -> None:
+    """Record that a search below root found nothing"""
+    _write_cache({
+        'version': CACHE_VERSION,
+        'missing': str(Path(root).resolve()),
+        'recorded': time.time(),
+    })
+
+
+def _recent_miss(root: Path) -> bool:
+    """True if a search below root found nothing within MISS_TTL"""
+    data = _read_cache()
+    if data is None or data.get('missing') != str(Path(root).resolve()):
+        return False
+    recorded = data.get('recorded')
+    return isinstance(recorded, (int, float)) and 0 <= time.time() - recorded < MISS_TTL
+
+
+def forget_install() -> None:
+    """Drop the cached location (or cached miss)"""
+    try:
+        _cache_path().unlink()
+    except (FileNotFoundError, PermissionError, OSError):
+        pass
+
+
+def _walk(root: str, depth: int, deadline: float, found: threading.Event) -> Optional[Tuple[int, str]]:
+    """Breadth-first search for MARKER_FILE below root, returning (depth, dir)"""
+    queue = [(root, depth)]
+    while queue:
+        next_queue = []
+        for directory, level in queue:
+            if found.is_set() or time.monotonic() > deadline:
+                return None
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for count, entry in enumerate(entries, 1):
+                        # A single huge directory must not overrun the deadline
+                        if count % DEADLINE_CHECK_ENTRIES == 0 and time.monotonic() > deadline:
+                            return None
+                        name = entry.name
+                        if name == MARKER_FILE and entry.is_file(follow_symlinks=False):
+                            return level, directory
+                        if name == 'pyvenv.cfg':
+                            subdirs = []  # a virtualenv - nothing to find in here
+                            break
+                        if (name.startswith('.') or name in PRUNE_DIRS
+                                or not entry.is_dir(follow_symlinks=False)):
+                            continue
+                        subdirs.append(entry.path)
+            except OSError:
+                continue
+            if level < MAX_DEPTH:
+                next_queue.extend((sub, level + 1) for sub in subdirs)
+        queue = next_queue
+    return None
+
+
+def search_install(root: Path, timeout: float = SEARCH_TIMEOUT,
+                   workers: int = SEARCH_WORKERS) -> Optional[Path]:
+    """Search below root for mesh_bot.py, depth-limited and time-bounded"""
+    root = Path(root)
+    if _is_install(root):
+        return root
+
+    try:
+        with os.scandir(root) as entries:
+            tops = [e.path for e in entries
+                    if not e.name.startswith('.') and e.name not in PRUNE_DIRS
+                    and e.is_dir(follow_symlinks=False)]
+    except OSError:
+        return None
+
+    deadline = time.monotonic() + timeout
+    found = threading.Event()
+    hits: List[Tuple[int, str]] = []
+
+    def search_top(top: str):
+        hit = _walk(top, 1, deadline, found)
+        if hit is not None:
+            hits.append(hit)
+            found.set()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        list(pool.map(search_top, tops))
+
+    if not hits:
+        return None
+    return Path(min(hits)[1])
+
+
+def locate_install(candidates: Iterable[Path], search_root: Optional[Path] = None) -> Optional[Path]:
+    """Find meshing-around: cached location, then candidates, then a bounded search"""
+    cached = _load_cached()
+    if cached is not None:
+        return cached
+
+    for path in candidates:
+        if _is_install(path):
+            remember_install(path)
+            return path
+
+    if search_root is None or _recent_miss(search_root):
+        return None
+
+    path = search_install(search_root)
+    if path is not None:
+        remember_install(path)
+    else:
+        _remember_miss(search_root)
+    return path
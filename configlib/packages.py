@@ -0,0 +1,108 @@
+"""
+Debian package presence checks
+
+Answers "which of these packages are installed" for any number of packages
+in one pass. The dpkg status database is parsed directly and the result is
+cached until the status file's mtime or size changes, so checks after an
+apt install pick up the new state automatically. If the status file cannot
+be read, a single dpkg-query call is used instead.
+"""
+
+import os
+import subprocess
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+DPKG_STATUS = '/var/lib/dpkg/status'
+
+
+def _parse_status_file(path: str) -> FrozenSet[str]:
+    """Return the names of installed packages from a dpkg status file"""
+    installed = set()
+    package = None
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.startswith(b'Package:'):
+                package = line[8:].strip().decode('utf-8', 'replace')
+            elif line.startswith(b'Status:') and package:
+                # "Status: install ok installed" - the last word is the state
+                if line.split()[-1] == b'installed':
+                    installed.add(package)
+            elif line == b'\n':
+                package = None
+    return frozenset(installed)
+
+
+def _query_dpkg() -> FrozenSet[str]:
+    """Return installed package names using a single dpkg-query call"""
+    try:
+        result = subprocess.run(
+            ['dpkg-query', '-W', '-f=${Package}\t${db:Status-Abbrev}\n'],
+            capture_output=True, text=True, timeout=60
+        )
+    except (subprocess.SubprocessError, FileNotFoundError, OSError):
+        return frozenset()
+
+    installed = set()
+    for line in result.stdout.splitlines():
+        name, _, status = line.partition('\t')
+        # db:Status-Abbrev is e.g. "ii " - second letter 'i' means installed
+        if len(status) >= 2 and status[1] == 'i':
+            installed.add(name.split(':')[0])
+    return frozenset(installed)
+
+
+class PackageState:
+    """Installed-package set, cached on the dpkg status file's mtime"""
+
+    def __init__(self, status_file: str = DPKG_STATUS):
+        self.status_file = status_file
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._installed: FrozenSet[str] = frozenset()
+
+    def installed(self) -> FrozenSet[str]:
+        """Names of all installed packages (re-read only if dpkg state changed)"""
+        try:
+            st = os.stat(self.status_file)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamp = None
+
+        if stamp is not None and stamp == self._stamp:
+            return self._installed
+
+        try:
+            self._installed = _parse_status_file(self.status_file)
+        except (FileNotFoundError, PermissionError, IOError):
+            self._installed = _query_dpkg()
+        self._stamp = stamp
+        return self._installed
+
+    def query(self, packages: Iterable[str]) -> Dict[str, bool]:
+        """Map each package name to whether it is installed"""
+        installed = self.installed()
+        return {pkg: pkg in installed for pkg in packages}
+
+    def is_installed(self, package: str) -> bool:
+        """True if package is installed"""
+        return package in self.installed()
+
+    def missing(self, packages: Iterable[str]) -> List[str]:
+        """Packages from the list that are not installed, in the given order"""
+        installed = self.installed()
+        return [pkg for pkg in packages if pkg not in installed]
+
+
+_state: Optional[PackageState] = None
+
+
+def get_package_state() -> PackageState:
+    """Return the process-wide PackageState"""
+    global _state
+    if _state is None:
+        _state = PackageState()
+    return _state
+
+
+def missing_packages(packages: Iterable[str]) -> List[str]:
+    """Packages from the list that are not installed"""
+    return get_package_state().missing(packages)
@@ -0,0 +1,20 @@
+"""
+Filesystem locations used by the configuration tools
+"""
+
+import os
+from pathlib import Path
+
+APP_NAME = "meshing-around-config"
+
+
+def cache_dir() -> Path:
+    """Per-user cache directory ($XDG_CACHE_HOME/meshing-around-config)"""
+    base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / ".cache")
+    return Path(base) / APP_NAME
+
+
+def state_dir() -> Path:
+    """Per-user state directory ($XDG_STATE_HOME/meshing-around-config)"""
+    base = os.environ.get('XDG_STATE_HOME') or str(Path.home() / ".local" / "state")
+    return Path(base) / APP_NAME
@@ -0,0 +1,113 @@
+"""
+Platform detection for the configuration tools
+
+The platform is probed once per process (Pi model, OS release, Python,
+PEP 668 state, RAM and CPU count) and the result is shared by every caller.
+Call refresh() after anything that changes the system, such as
+raspberry_pi_setup().
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+CPUINFO_PATH = '/proc/cpuinfo'
+MEMINFO_PATH = '/proc/meminfo'
+DT_MODEL_PATH = '/sys/firmware/devicetree/base/model'
+OS_RELEASE_PATH = '/etc/os-release'
+
+# Debian Bookworm (12) and newer codenames
+BOOKWORM_OR_NEWER = ('bookworm', 'trixie', 'forky', 'sid')
+
+
+def _read_text(path: str) -> Optional[str]:
+    """Read a small text file, returning None if it is not readable"""
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except (FileNotFoundError, PermissionError, IOError):
+        return None
+
+
+class PlatformProfile:
+    """Snapshot of the host platform, probed once and memoized"""
+
+    def __init__(self):
+        self.is_raspberry_pi = False
+        self.pi_model = "Unknown"
+        self.os_name = "Unknown"
+        self.os_codename = "Unknown"
+        self.python_version: Tuple[int, int, int] = tuple(sys.version_info[:3])
+        self.pep668 = False
+        self.ram_total_mb = 0
+        self.cpu_count = 1
+        self.refresh()
+
+    def refresh(self) -> "PlatformProfile":
+        """Re-probe the platform in place"""
+        cpuinfo = _read_text(CPUINFO_PATH) or ""
+        model = (_read_text(DT_MODEL_PATH) or "").strip().rstrip('\x00')
+
+        self.pi_model = model or "Unknown"
+        self.is_raspberry_pi = ('Raspberry Pi' in cpuinfo or 'BCM' in cpuinfo
+                                or 'Raspberry Pi' in model)
+
+        self.os_name, self.os_codename = self._probe_os_release()
+        self.python_version = tuple(sys.version_info[:3])
+
+        python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        self.pep668 = Path(f"/usr/lib/python{python_version}/EXTERNALLY-MANAGED").exists()
+
+        self.ram_total_mb = self._probe_ram_mb()
+        self.cpu_count = os.cpu_count() or 1
+        return self
+
+    @staticmethod
+    def _probe_os_release() -> Tuple[str, str]:
+        """Parse PRETTY_NAME and VERSION_CODENAME from /etc/os-release"""
+        os_name = "Unknown"
+        os_codename = "Unknown"
+        for line in (_read_text(OS_RELEASE_PATH) or "").splitlines():
+            if line.startswith('PRETTY_NAME='):
+                os_name = line.split('=', 1)[1].strip().strip('"')
+            elif line.startswith('VERSION_CODENAME='):
+                os_codename = line.split('=', 1)[1].strip().strip('"')
+        return os_name, os_codename
+
+    @staticmethod
+    def _probe_ram_mb() -> int:
+        """Total RAM in MB from /proc/meminfo (0 if unknown)"""
+        for line in (_read_text(MEMINFO_PATH) or "").splitlines():
+            if line.startswith('MemTotal:'):
+                try:
+                    return int(line.split()[1]) // 1024
+                except (IndexError, ValueError):
+                    return 0
+        return 0
+
+    @property
+    def is_bookworm_or_newer(self) -> bool:
+        """True on Debian Bookworm (12) or newer"""
+        return self.os_codename.lower() in BOOKWORM_OR_NEWER
+
+    @property
+    def python_version_str(self) -> str:
+        """Python version as 'major.minor.micro'"""
+        return '.'.join(str(part) for part in self.python_version)
+
+
+_profile: Optional[PlatformProfile] = None
+
+
+def get_platform_profile() -> PlatformProfile:
+    """Return the process-wide PlatformProfile, probing on first use"""
+    global _profile
+    if _profile is None:
+        _profile = PlatformProfile()
+    return _profile
+
+
+def refresh_platform_profile() -> PlatformProfile:
+    """Re-probe the process-wide PlatformProfile"""
+    return get_platform_profile().refresh()
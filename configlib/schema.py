@@ -0,0 +1,463 @@
+"""
+Declarative schema for config.ini
+
+Every section and key of config.enhanced.ini is described once here with its
+type, default, allowed range or choices, and the condition under which it is
+required. The schema is compiled on first use into one parser callable per
+key, and load_typed() turns a ConfigParser into a frozen TypedConfig in a
+single pass: numbers are numbers, flags are bools, comma-separated lists are
+tuples and node lists are frozensets of node numbers.
+
+    typed, errors = load_typed(config)
+    if typed.emergencyHandler.enabled:
+        keywords = typed.emergencyHandler.emergency_keywords
+"""
+
+import re
+from collections import namedtuple
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Value kinds
+STR = 'str'
+INT = 'int'
+FLOAT = 'float'
+BOOL = 'bool'
+LIST = 'list'      # comma-separated strings -> tuple
+NODES = 'nodes'    # comma-separated node numbers (decimal or !hex) -> frozenset of int
+CHOICE = 'choice'  # one of Option.choices
+
+TRUE_STRINGS = frozenset(['1', 'yes', 'true', 'on'])
+FALSE_STRINGS = frozenset(['0', 'no', 'false', 'off'])
+
+_TYPE_LIMITS = re.compile(r'^\s*\w+\s*:\s*\d+\s*(?:,\s*\w+\s*:\s*\d+\s*)*,?\s*$')
+_MAC_ADDRESS = re.compile(r'^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$')
+_NUMBER = r'-?\d+(?:\.\d+)?'
+_GEOFENCE = rf'[^:;]+:{_NUMBER}:{_NUMBER}:{_NUMBER}'
+_GEOFENCES = re.compile(rf'^\s*{_GEOFENCE}\s*(?:;\s*{_GEOFENCE}\s*)*;?\s*$')
+
+
+class Option(NamedTuple):
+    """One key of a config section"""
+    name: str
+    kind: str
+    default: Any
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    choices: Optional[Tuple[str, ...]] = None
+    required_if: Optional[Tuple[str, Any]] = None  # (other key, value) making this required
+    pattern: Optional[Any] = None                  # compiled regex a non-empty value must match
+    validate: Optional[Callable[[Any], None]] = None  # raises ValueError for a bad non-empty value
+
+
+def _check_quiet_hours(value: str):
+    """Compile the schedule, so the schema accepts exactly what the bot does"""
+    from alertlib.quiet_hours import compile_quiet_hours
+    compile_quiet_hours(value)
+
+
+def _log_options(log_file: str) -> Tuple[Option, ...]:
+    return (
+        Option('log_to_file', BOOL, True),
+        Option('log_file', STR, log_file, required_if=('log_to_file', True)),
+    )
+
+
+CHANNEL = dict(minimum=0, maximum=7)
+PRIORITY = dict(minimum=1, maximum=4)
+
+SCHEMA: Dict[str, Tuple[Option, ...]] = {
+    'interface': (
+        Option('type', CHOICE, 'serial', choices=('serial', 'tcp', 'ble')),
+        Option('port', STR, ''),
+        Option('hostname', STR, '', required_if=('type', 'tcp')),
+        Option('mac', STR, '', required_if=('type', 'ble'), pattern=_MAC_ADDRESS),
+    ),
+    'general': (
+        Option('bot_name', STR, 'MeshBot'),
+        Option('favoriteNodeList', NODES, frozenset()),
+        Option('bbs_admin_list', NODES, frozenset()),
+        Option('bbslink_whitelist', NODES, frozenset()),
+    ),
+    'emergencyHandler': (
+        Option('enabled', BOOL, True),
+        Option('emergency_keywords', LIST,
+               ('emergency', '911', '112', '999', 'police', 'fire', 'ambulance',
+                'rescue', 'help', 'sos', 'mayday'),
+               required_if=('enabled', True)),
+        Option('alert_channel', INT, 2, **CHANNEL),
+        Option('alert_interface', INT, 1, minimum=1, maximum=9),
+        Option('play_sound', BOOL, False),
+        Option('sound_file', STR, '/usr/share/sounds/freedesktop/stereo/alarm-clock-elapsed.oga',
+               required_if=('play_sound', True)),
+        Option('send_email', BOOL, False),
+        Option('send_sms', BOOL, False),
+        Option('cooldown_period', INT, 300, minimum=0),
+    ) + _log_options('logs/emergency_alerts.log'),
+    'proximityAlert': (
+        Option('enabled', BOOL, False),
+        Option('target_latitude', FLOAT, 0.0, minimum=-90, maximum=90),
+        Option('target_longitude', FLOAT, 0.0, minimum=-180, maximum=180),
+        Option('radius_meters', INT, 100, minimum=1),
+        Option('extra_geofences', STR, '', pattern=_GEOFENCES),
+        Option('alert_message', STR, 'Node {node_name} is within {distance}m of target location'),
+        Option('check_interval', INT, 60, minimum=1),
+        Option('alert_channel', INT, 0, **CHANNEL),
+        Option('run_script', BOOL, False),
+        Option('script_path', STR, '', required_if=('run_script', True)),
+        Option('send_email', BOOL, False),
+        Option('send_sms', BOOL, False),
+        Option('node_cooldown', INT, 600, minimum=0),
+    ) + _log_options('logs/proximity_alerts.log'),
+    'altitudeAlert': (
+        Option('enabled', BOOL, False),
+        Option('min_altitude', INT, 1000, minimum=-500),
+        Option('hysteresis_meters', INT, 50, minimum=0),
+        Option('alert_message', STR, 'High flyer detected: {node_name} at {altitude}m'),
+        Option('alert_channel', INT, 0, **CHANNEL),
+        Option('check_interval', INT, 120, minimum=1),
+        Option('cooldown_period', INT, 300, minimum=0),
+    ) + _log_options('logs/altitude_alerts.log'),
+    'weatherAlert': (
+        Option('enabled', BOOL, False),
+        Option('location', STR, '', required_if=('enabled', True)),
+        Option('severity_levels', LIST, ('Extreme', 'Severe'),
+               choices=('Extreme', 'Severe', 'Moderate', 'Minor')),
+        Option('check_interval_minutes', INT, 30, minimum=1),
+        Option('alert_channel', INT, 2, **CHANNEL),
+        Option('send_dm', BOOL, False),
+        Option('dm_recipients', NODES, frozenset(), required_if=('send_dm', True)),
+        Option('play_sound', BOOL, False),
+        Option('sound_file', STR, '/usr/share/sounds/freedesktop/stereo/bell.oga',
+               required_if=('play_sound', True)),
+    ) + _log_options('logs/weather_alerts.log'),
+    'ipawsAlert': (
+        Option('enabled', BOOL, False),
+        Option('state_code', STR, '', required_if=('enabled', True)),
+        Option('county_fips', STR, ''),
+        Option('alert_types', LIST,
+               ('Administrative', 'Amber', 'Earthquake', 'Fire', 'Tornado', 'Tsunami')),
+        Option('check_interval_minutes', INT, 15, minimum=1),
+        Option('alert_channel', INT, 2, **CHANNEL),
+        Option('include_details', BOOL, True),
+    ) + _log_options('logs/ipaws_alerts.log'),
+    'volcanoAlert': (
+        Option('enabled', BOOL, False),
+        Option('volcano_ids', LIST, ()),
+        Option('alert_levels', LIST, ('Watch', 'Warning'),
+               choices=('Normal', 'Advisory', 'Watch', 'Warning')),
+        Option('check_interval_minutes', INT, 60, minimum=1),
+        Option('alert_channel', INT, 2, **CHANNEL),
+    ) + _log_options('logs/volcano_alerts.log'),
+    'noisyNodeAlert': (
+        Option('enabled', BOOL, False),
+        Option('message_threshold', INT, 50, minimum=1),
+        Option('time_period_minutes', INT, 10, minimum=1),
+        Option('alert_message', STR,
+               'Noisy node detected: {node_name} sent {count} messages in {period} minutes'),
+        Option('alert_channel', INT, 0, **CHANNEL),
+        Option('auto_mute', BOOL, False),
+        Option('mute_duration_minutes', INT, 60, minimum=1),
+        Option('whitelist', NODES, frozenset()),
+    ) + _log_options('logs/noisy_node_alerts.log'),
+    'batteryAlert': (
+        Option('enabled', BOOL, False),
+        Option('threshold_percent', INT, 20, minimum=0, maximum=100),
+        Option('alert_message', STR, 'Low battery alert: {node_name} at {battery}%'),
+        Option('alert_channel', INT, 0, **CHANNEL),
+        Option('check_interval_minutes', INT, 30, minimum=1),
+        Option('monitor_nodes', NODES, frozenset()),
+        Option('node_cooldown_minutes', INT, 180, minimum=0),
+    ) + _log_options('logs/battery_alerts.log'),
+    'newNodeAlert': (
+        Option('enabled', BOOL, True),
+        Option('welcome_message', STR, 'Welcome to the mesh, {node_name}!'),
+        Option('send_as_dm', BOOL, True),
+        Option('announce_to_channel', BOOL, False),
+        Option('announcement_channel', INT, 0, **CHANNEL),
+        Option('welcome_delay', INT, 5, minimum=0),
+    ) + _log_options('logs/new_nodes.log'),
+    'snrAlert': (
+        Option('enabled', BOOL, False),
+        Option('snr_threshold', FLOAT, 10.0, minimum=-30, maximum=30),
+        Option('statistic', CHOICE, 'last', choices=('last', 'ewma', 'min', 'max', 'p50', 'p90')),
+        Option('window_minutes', INT, 5, minimum=1, maximum=60),
+        Option('alert_message', STR, 'High SNR activity detected: {node_name} SNR {snr}dB'),
+        Option('alert_channel', INT, 0, **CHANNEL),
+        Option('monitor_mode', CHOICE, 'all', choices=('all', 'dm_only', 'channel_only')),
+    ) + _log_options('logs/snr_alerts.log'),
+    'disconnectAlert': (
+        Option('enabled', BOOL, False),
+        Option('offline_threshold_minutes', INT, 60, minimum=1),
+        Option('monitor_nodes', NODES, frozenset()),
+        Option('alert_message', STR, 'Node offline: {node_name} not seen for {duration} minutes'),
+        Option('alert_channel', INT, 0, **CHANNEL),
+        Option('send_admin_dm', BOOL, False),
+    ) + _log_options('logs/disconnect_alerts.log'),
+    'customAlert': (
+        Option('enabled', BOOL, False),
+        Option('keywords', LIST, (), required_if=('enabled', True)),
+        Option('alert_channel', INT, 0, **CHANNEL),
+        Option('response_message', STR, 'Alert triggered by {node_name}: {keyword}'),
+        Option('case_sensitive', BOOL, False),
+    ) + _log_options('logs/custom_alerts.log'),
+    'alertGlobal': (
+        Option('global_enabled', BOOL, True),
+        Option('quiet_hours', STR, '', validate=_check_quiet_hours),
+        Option('max_alerts_per_hour', INT, 20, minimum=0),
+        Option('per_type_limits', STR, '', pattern=_TYPE_LIMITS),
+        Option('emergency_priority', INT, 4, **PRIORITY),
+        Option('weather_priority', INT, 3, **PRIORITY),
+        Option('proximity_priority', INT, 2, **PRIORITY),
+        Option('general_priority', INT, 1, **PRIORITY),
+    ),
+    'smtp': (
+        Option('enableSMTP', BOOL, False),
+        Option('enableImap', BOOL, False),
+        Option('sysopEmails', LIST, ()),
+        Option('SMTP_SERVER', STR, 'smtp.gmail.com', required_if=('enableSMTP', True)),
+        Option('SMTP_PORT', INT, 587, minimum=1, maximum=65535),
+        Option('SMTP_AUTH', BOOL, True),
+        Option('SMTP_USERNAME', STR, ''),
+        Option('SMTP_PASSWORD', STR, ''),
+        Option('SMTP_FROM', STR, ''),
+        Option('EMAIL_SUBJECT', STR, 'Meshtastic Alert'),
+    ),
+    'sms': (
+        Option('enabled', BOOL, False),
+        Option('gateway', STR, '', required_if=('enabled', True)),
+        Option('phone_numbers', LIST, (), required_if=('enabled', True)),
+    ),
+}
+
+# Section names in template order
+SECTION_NAMES: Tuple[str, ...] = tuple(SCHEMA)
+
+
+# ============================================================================
+# COMPILED VALIDATORS
+# ============================================================================
+
+def _parse_bool(text: str) -> bool:
+    value = text.strip().lower()
+    if value in TRUE_STRINGS:
+        return True
+    if value in FALSE_STRINGS:
+        return False
+    raise ValueError(f"expected True/False, got {text!r}")
+
+
+def _split_list(text: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in text.split(',') if item.strip())
+
+
+def parse_node_id(text: str) -> int:
+    """Parse a node number given as decimal or Meshtastic '!hex' form"""
+    text = text.strip()
+    if text.startswith('!'):
+        return int(text[1:], 16)
+    return int(text)
+
+
+def _parse_nodes(text: str) -> frozenset:
+    try:
+        return frozenset(parse_node_id(item) for item in _split_list(text))
+    except ValueError:
+        raise ValueError(f"expected comma-separated node numbers, got {text!r}")
+
+
+def _parse_int(text: str) -> int:
+    try:
+        return int(text.strip())
+    except ValueError:
+        raise ValueError(f"expected a whole number, got {text!r}")
+
+
+def _parse_float(text: str) -> float:
+    try:
+        return float(text.strip())
+    except ValueError:
+        raise ValueError(f"expected a number, got {text!r}")
+
+
+_BASE_PARSERS: Dict[str, Callable[[str], Any]] = {
+    STR: str.strip,
+    INT: _parse_int,
+    FLOAT: _parse_float,
+    BOOL: _parse_bool,
+    LIST: _split_list,
+    NODES: _parse_nodes,
+    CHOICE: lambda text: text.strip().lower(),
+}
+
+
+def compile_option(option: Option) -> Callable[[str], Any]:
+    """Build a single callable that parses and validates one key's text"""
+    base = _BASE_PARSERS[option.kind]
+    checks: List[Callable[[Any], None]] = []
+
+    if option.minimum is not None or option.maximum is not None:
+        low, high = option.minimum, option.maximum
+
+        def check_range(value):
+            if (low is not None and value < low) or (high is not None and value > high):
+                bounds = f"{'' if low is None else low}..{'' if high is None else high}"
+                raise ValueError(f"{value} is outside {bounds}")
+        checks.append(check_range)
+
+    if option.choices:
+        if option.kind == LIST:
+            allowed = {c.lower(): c for c in option.choices}
+
+            def check_choices(value):
+                bad = [v for v in value if v.lower() not in allowed]
+                if bad:
+                    raise ValueError(f"{', '.join(bad)} not in {', '.join(option.choices)}")
+        else:
+            allowed = frozenset(option.choices)
+
+            def check_choices(value):
+                if value not in allowed:
+                    raise ValueError(f"{value!r} not in {', '.join(option.choices)}")
+        checks.append(check_choices)
+
+    if option.pattern is not None:
+        pattern = option.pattern
+
+        def check_pattern(value):
+            if value and not pattern.match(value):
+                raise ValueError(f"{value!r} is not in the expected format")
+        checks.append(check_pattern)
+
+    if option.validate is not None:
+        validate = option.validate
+
+        def check_value(value):
+            if value:
+                validate(value)
+        checks.append(check_value)
+
+    if not checks:
+        return base
+
+    def parse(text: str) -> Any:
+        value = base(text)
+        for check in checks:
+            check(value)
+        return value
+    return parse
+
+
+class CompiledSection:
+    """Parsers and the frozen record type for one section"""
+
+    def __init__(self, name: str, options: Tuple[Option, ...]):
+        self.name = name
+        self.options = options
+        self.parsers = tuple(compile_option(opt) for opt in options)
+        self.keys = tuple(opt.name.lower() for opt in options)
+        self.index = {key: i for i, key in enumerate(self.keys)}
+        self.defaults = tuple(opt.default for opt in options)
+        self.record = namedtuple(name, [opt.name for opt in options])
+        self.dependencies = tuple(
+            (i, self.index[opt.required_if[0].lower()], opt.required_if[1])
+            for i, opt in enumerate(options) if opt.required_if
+        )
+
+
+class CompiledSchema:
+    """All sections compiled, plus the TypedConfig record type"""
+
+    def __init__(self, schema: Dict[str, Tuple[Option, ...]]):
+        self.sections = tuple(CompiledSection(name, opts) for name, opts in schema.items())
+        self.by_name = {section.name: section for section in self.sections}
+        self.config_type = namedtuple('TypedConfig', [s.name for s in self.sections] + ['extras'])
+        # Changes whenever a section, key or kind changes; stored snapshots
+        # built against a different schema are ignored
+        self.signature = repr([(s.name, [(o.name, o.kind) for o in s.options])
+                               for s in self.sections])
+
+
+_compiled: Optional[CompiledSchema] = None
+
+
+def get_compiled_schema() -> CompiledSchema:
+    """Compile the schema on first use"""
+    global _compiled
+    if _compiled is None:
+        _compiled = CompiledSchema(SCHEMA)
+    return _compiled
+
+
+# ============================================================================
+# TYPED CONFIG
+# ============================================================================
+
+def _raw_sections(config) -> Dict[str, Dict[str, str]]:
+    """Raw (uninterpolated) key/value text per section of a ConfigParser or mapping"""
+    if hasattr(config, 'sections') and hasattr(config, 'items'):
+        try:
+            return {name: dict(config.items(name, raw=True)) for name in config.sections()}
+        except TypeError:
+            pass
+    return {name: {k.lower(): v for k, v in values.items()} for name, values in config.items()}
+
+
+def load_typed(config) -> Tuple[Any, List[str]]:
+    """Convert a ConfigParser (or {section: {key: text}}) into a frozen TypedConfig
+
+    Invalid values fall back to their defaults and are reported in the
+    returned error list as 'section.key: message'. Keys and sections not in
+    the schema are kept as text in TypedConfig.extras.
+    """
+    schema = get_compiled_schema()
+    raw = _raw_sections(config)
+    errors: List[str] = []
+    sections = []
+
+    for section in schema.sections:
+        values = list(section.defaults)
+        given = raw.get(section.name, {})
+        extras = {}
+        for key, text in given.items():
+            i = section.index.get(key.lower())
+            if i is None:
+                extras[key] = text
+                continue
+            try:
+                values[i] = section.parsers[i](text)
+            except ValueError as e:
+                errors.append(f"{section.name}.{section.options[i].name}: {e}")
+
+        for i, other, expected in section.dependencies:
+            if values[other] == expected and values[i] in ('', (), frozenset()):
+                option = section.options[i]
+                errors.append(f"{section.name}.{option.name}: required when "
+                              f"{section.options[other].name} = {expected}")
+
+        sections.append(section.record(*values))
+        if extras:
+            raw.setdefault('__extras__', {})[section.name] = extras
+
+    extras = dict(raw.pop('__extras__', {}))
+    for name, values in raw.items():
+        if name not in schema.by_name:
+            extras[name] = dict(values)
+
+    return schema.config_type(*sections, extras), errors
+
+
+def validate_config(config) -> List[str]:
+    """Return the validation errors for a ConfigParser"""
+    return load_typed(config)[1]
+
+
+def typed_to_values(typed) -> Tuple[Tuple[Tuple[Any, ...], ...], Dict[str, Dict[str, str]]]:
+    """Plain tuples of a TypedConfig's values, for serialisation"""
+    return tuple(tuple(section) for section in typed[:-1]), dict(typed.extras)
+
+
+def typed_from_values(values, extras: Optional[Dict[str, Dict[str, str]]] = None):
+    """Rebuild a TypedConfig from typed_to_values() output"""
+    schema = get_compiled_schema()
+    sections = [section.record(*vals) for section, vals in zip(schema.sections, values)]
+    return schema.config_type(*sections, extras or {})
@@ -0,0 +1,327 @@
+"""
+Serial port discovery for Meshtastic radios
+
+Ports are enumerated by walking /sys/class/tty, so no subprocess is spawned.
+Each port carries its USB metadata (VID/PID, serial number, driver) and a
+score, and the list is ranked so likely Meshtastic radios come first.
+
+SerialPortWatcher reports ports being plugged and unplugged. It listens to
+kernel uevents over netlink where available and falls back to polling sysfs.
+"""
+
+import os
+import select
+import socket
+import threading
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+SYS_CLASS_TTY = '/sys/class/tty'
+DEV_SERIAL_BY_ID = '/dev/serial/by-id'
+
+# tty name prefixes worth offering for a Meshtastic connection
+USB_TTY_PREFIXES = ('ttyUSB', 'ttyACM')
+ONBOARD_TTY_PREFIXES = ('ttyAMA',)
+ONBOARD_TTY_NAMES = ('ttyS0',)
+
+# Raspberry Pi UART aliases (symlinks to ttyS0/ttyAMA0)
+PI_SERIAL_ALIASES = ('/dev/serial0', '/dev/serial1')
+
+# USB vendor IDs of boards that run Meshtastic natively
+MESHTASTIC_BOARD_VIDS = {
+    0x239a: "Adafruit nRF52 (RAK4631, T-Echo)",
+    0x303a: "Espressif native USB (ESP32-S3)",
+    0x2e8a: "Raspberry Pi RP2040",
+}
+
+# USB-UART bridges used by most ESP32 Meshtastic boards
+MESHTASTIC_BRIDGE_IDS = {
+    (0x10c4, 0xea60): "Silicon Labs CP210x",
+    (0x1a86, 0x55d4): "WCH CH9102",
+    (0x1a86, 0x7523): "WCH CH340",
+    (0x0403, 0x6001): "FTDI FT232R",
+}
+
+NETLINK_KOBJECT_UEVENT = 15
+
+
+class SerialPort(NamedTuple):
+    """A serial port and its USB metadata"""
+    device: str
+    name: str
+    driver: str = ""
+    vid: Optional[int] = None
+    pid: Optional[int] = None
+    serial_number: str = ""
+    manufacturer: str = ""
+    product: str = ""
+    by_id: str = ""
+    score: int = 0
+
+    @property
+    def is_usb(self) -> bool:
+        """True for USB serial adapters and native USB boards"""
+        return self.vid is not None
+
+    @property
+    def usb_id(self) -> str:
+        """VID:PID as lowercase hex, or empty for non-USB ports"""
+        if self.vid is None:
+            return ""
+        return f"{self.vid:04x}:{self.pid or 0:04x}"
+
+    @property
+    def description(self) -> str:
+        """Human-readable summary for menus"""
+        parts = []
+        if self.usb_id:
+            parts.append(self.usb_id)
+            label = self.product or MESHTASTIC_BOARD_VIDS.get(self.vid) \
+                or MESHTASTIC_BRIDGE_IDS.get((self.vid, self.pid), "")
+            if label:
+                parts.append(label)
+        else:
+            parts.append("onboard UART")
+        if self.serial_number:
+            parts.append(f"S/N {self.serial_number}")
+        if self.driver:
+            parts.append(f"[{self.driver}]")
+        return ' '.join(parts)
+
+
+def _read_attr(path: str) -> str:
+    """Read a sysfs attribute, returning an empty string on failure"""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except (FileNotFoundError, PermissionError, IOError):
+        return ""
+
+
+def _is_candidate(name: str) -> bool:
+    """True for tty names that may carry a Meshtastic radio"""
+    return (name.startswith(USB_TTY_PREFIXES) or name.startswith(ONBOARD_TTY_PREFIXES)
+            or name in ONBOARD_TTY_NAMES)
+
+
+def _find_usb_device(device_dir: str) -> Optional[str]:
+    """Walk up from a tty's device directory to the USB device holding idVendor"""
+    path = device_dir
+    for _ in range(6):
+        if os.path.exists(os.path.join(path, 'idVendor')):
+            return path
+        parent = os.path.dirname(path)
+        if parent == path or not parent.startswith('/sys/devices'):
+            break
+        path = parent
+    return None
+
+
+def _by_id_links() -> Dict[str, str]:
+    """Map /dev/ttyXXX to its stable /dev/serial/by-id link"""
+    links = {}
+    try:
+        entries = os.listdir(DEV_SERIAL_BY_ID)
+    except (FileNotFoundError, PermissionError, NotADirectoryError):
+        return links
+    for entry in entries:
+        link = os.path.join(DEV_SERIAL_BY_ID, entry)
+        links[os.path.realpath(link)] = link
+    return links
+
+
+def _score(name: str, vid: Optional[int], pid: Optional[int]) -> int:
+    """Rank how likely a port is to be a Meshtastic radio (higher first)"""
+    if vid in MESHTASTIC_BOARD_VIDS:
+        return 100
+    if (vid, pid) in MESHTASTIC_BRIDGE_IDS:
+        return 80
+    if vid is not None:
+        return 50
+    if name.startswith(ONBOARD_TTY_PREFIXES):
+        return 20
+    return 10
+
+
+def probe_serial_port(name: str, by_id: Optional[Dict[str, str]] = None) -> Optional[SerialPort]:
+    """Build a SerialPort for one /sys/class/tty entry, or None if it has no device"""
+    tty_dir = os.path.join(SYS_CLASS_TTY, name)
+    device_link = os.path.join(tty_dir, 'device')
+    if not os.path.exists(device_link):
+        return None
+
+    device_dir = os.path.realpath(device_link)
+    driver_link = os.path.join(device_dir, 'driver')
+    driver = os.path.basename(os.path.realpath(driver_link)) if os.path.exists(driver_link) else ""
+
+    vid = pid = None
+    serial_number = manufacturer = product = ""
+    usb_dir = _find_usb_device(device_dir)
+    if usb_dir:
+        try:
+            vid = int(_read_attr(os.path.join(usb_dir, 'idVendor')), 16)
+            pid = int(_read_attr(os.path.join(usb_dir, 'idProduct')), 16)
+        except ValueError:
+            vid = pid = None
+        serial_number = _read_attr(os.path.join(usb_dir, 'serial'))
+        manufacturer = _read_attr(os.path.join(usb_dir, 'manufacturer'))
+        product = _read_attr(os.path.join(usb_dir, 'product'))
+
+    device = f"/dev/{name}"
+    if by_id is None:
+        by_id = _by_id_links()
+
+    return SerialPort(
+        device=device, name=name, driver=driver, vid=vid, pid=pid,
+        serial_number=serial_number, manufacturer=manufacturer, product=product,
+        by_id=by_id.get(device, ""), score=_score(name, vid, pid)
+    )
+
+
+def enumerate_serial_ports(include_aliases: bool = True) -> List[SerialPort]:
+    """List serial ports from sysfs, most likely Meshtastic radio first"""
+    try:
+        names = os.listdir(SYS_CLASS_TTY)
+    except (FileNotFoundError, PermissionError):
+        names = []
+
+    by_id = _by_id_links()
+    ports = []
+    for name in names:
+        if not _is_candidate(name):
+            continue
+        port = probe_serial_port(name, by_id)
+        if port is not None and os.path.exists(port.device):
+            ports.append(port)
+
+    if include_aliases:
+        targets = {p.device: p for p in ports}
+        for alias in PI_SERIAL_ALIASES:
+            if os.path.exists(alias):
+                target = targets.get(os.path.realpath(alias))
+                if target is not None:
+                    ports.append(target._replace(device=alias))
+                else:
+                    ports.append(SerialPort(device=alias, name=os.path.basename(alias), score=20))
+
+    ports.sort(key=lambda p: (-p.score, p.device))
+    return ports
+
+
+# ============================================================================
+# HOT-PLUG WATCHING
+# ============================================================================
+
+def _open_uevent_socket() -> Optional[socket.socket]:
+    """Open a netlink socket subscribed to kernel uevents, or None if unavailable"""
+    if not hasattr(socket, 'AF_NETLINK'):
+        return None
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        sock.bind((0, 1))  # kernel multicast group
+        return sock
+    except OSError:
+        return None
+
+
+def _parse_uevent(data: bytes) -> Dict[str, str]:
+    """Parse a kernel uevent datagram into its KEY=VALUE fields"""
+    fields = {}
+    for part in data.split(b'\0')[1:]:
+        key, sep, value = part.partition(b'=')
+        if sep:
+            fields[key.decode('ascii', 'replace')] = value.decode('utf-8', 'replace')
+    return fields
+
+
+class SerialPortWatcher:
+    """Report serial ports being plugged in or removed
+
+    callback(added, removed) is called from the watcher thread with the
+    SerialPorts that appeared and the device paths that went away.
+    """
+
+    def __init__(self, callback: Callable[[List[SerialPort], List[str]], None],
+                 poll_interval: float = 1.0, use_netlink: bool = True):
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.use_netlink = use_netlink
+        self._known: Dict[str, SerialPort] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sock: Optional[socket.socket] = None
+
+    @property
+    def mode(self) -> str:
+        """'netlink' when kernel uevents are used, otherwise 'poll'"""
+        return 'netlink' if self._sock is not None else 'poll'
+
+    def start(self) -> "SerialPortWatcher":
+        """Start watching in a daemon thread"""
+        self._known = {p.device: p for p in enumerate_serial_ports(include_aliases=False)}
+        if self.use_netlink:
+            self._sock = _open_uevent_socket()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="serial-port-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 2.0):
+        """Stop watching and wait for the thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "SerialPortWatcher":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _rescan(self):
+        """Diff the current ports against the known set and notify"""
+        current = {p.device: p for p in enumerate_serial_ports(include_aliases=False)}
+        added = [p for dev, p in current.items() if dev not in self._known]
+        removed = [dev for dev in self._known if dev not in current]
+        self._known = current
+        if added or removed:
+            added.sort(key=lambda p: (-p.score, p.device))
+            self.callback(added, removed)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if self._sock is None:
+                self._stop.wait(self.poll_interval)
+                self._rescan()
+                continue
+
+            # Wake up periodically so stop() is honoured promptly
+            readable, _, _ = select.select([self._sock], [], [], 0.25)
+            if not readable:
+                continue
+            try:
+                data = self._sock.recv(16384)
+            except OSError:
+                continue
+            event = _parse_uevent(data)
+            if event.get('SUBSYSTEM') == 'tty' and event.get('ACTION') in ('add', 'remove'):
+                self._rescan()
+
+
+def wait_for_serial_port(timeout: float = 30.0) -> Optional[SerialPort]:
+    """Block until a new serial port appears, returning it (None on timeout)"""
+    found: List[SerialPort] = []
+    event = threading.Event()
+
+    def on_change(added: List[SerialPort], removed: List[str]):
+        if added:
+            found.extend(added)
+            event.set()
+
+    with SerialPortWatcher(on_change, poll_interval=0.2):
+        event.wait(timeout)
+
+    return found[0] if found else None
@@ -22,14 +22,33 @@ import shutil
 import re
 import time
 import configparser
+import argparse
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 from getpass import getpass
 
+from alertlib.keywords import KeywordMatcher
+from alertlib.proximity import parse_geofences
+from alertlib.quiet_hours import QuietHours
+from configlib.answers import AnswerSource, parse_override
+from configlib.command_runner import (APT_KEEP_CONFFILES, CommandClock, TimingRecorder,
+                                      get_timing_recorder, run_parallel, run_streaming,
+                                      timing_scope)
+from configlib.config_snapshot import write_snapshot
+from configlib.ini_writer import save_ini
+from configlib.install_locator import locate_install, remember_install
+from configlib.packages import get_package_state, missing_packages
+from configlib.platform_profile import get_platform_profile, refresh_platform_profile
+from configlib.schema import SECTION_NAMES, validate_config
+from configlib.serial_ports import enumerate_serial_ports, wait_for_serial_port
+
 # Version info
 VERSION = "2.1.0"
 SUPPORTED_OS = ["bookworm", "trixie", "forky", "sid", "noble", "jammy"]
 
+# Active answer file in headless mode (None when prompting interactively)
+_answer_source: Optional[AnswerSource] = None
+
 class Colors:
     """ANSI color codes for terminal output"""
     HEADER = '\033[95m'
@@ -81,6 +100,8 @@ def run_command(cmd: List[str], desc: str = "", capture: bool = False, sudo: boo
     if desc:
         print_info(f"{desc}...")
 
+    clock = CommandClock()
+    returncode = -1
     try:
         result = subprocess.run(
             cmd,
@@ -88,6 +109,7 @@ def run_command(cmd: List[str], desc: str = "", capture: bool = False, sudo: boo
             text=True,
             timeout=600  # 10 minute timeout
         )
+        returncode = result.returncode
         stdout = result.stdout if capture else ""
         stderr = result.stderr if capture else ""
         return result.returncode, stdout, stderr
@@ -100,6 +122,36 @@ def run_command(cmd: List[str], desc: str = "", capture: bool = False, sudo: boo
     except Exception as e:
         print_error(f"Command failed: {e}")
         return -1, "", str(e)
+    finally:
+        clock.stop(cmd, desc, returncode, get_timing_recorder())
+
+def run_command_streaming(cmd: List[str], desc: str = "", sudo: bool = False) -> Tuple[int, str, str]:
+    """Run a long command, streaming its output to the console and the command log
+
+    Returns the same (returncode, stdout, stderr) tuple as run_command, with
+    stdout/stderr holding the last lines of output.
+    """
+    if sudo:
+        cmd = ['sudo'] + cmd
+
+    if desc:
+        print_info(f"{desc}...")
+
+    result = run_streaming(cmd, desc, echo=lambda line: print(f"  {line}"))
+    if result.stderr == "Timeout":
+        print_error(f"Command timed out: {' '.join(cmd)}")
+    elif result.stderr == "Command not found":
+        print_error(f"Command not found: {cmd[0]}")
+    return result.returncode, result.stdout, result.stderr
+
+def print_timing_summary(title: str, recorder: TimingRecorder):
+    """Print the per-command timing table collected by a timing_scope()"""
+    lines = recorder.format_table()
+    if not lines:
+        return
+    print_section(title)
+    for line in lines:
+        print(f"  {line}")
 
 def find_meshing_around() -> Optional[Path]:
     """Find the meshing-around installation directory"""
@@ -112,23 +164,7 @@ def find_meshing_around() -> Optional[Path]:
         Path.cwd() / "meshing-around",
     ]
 
-    for path in common_paths:
-        if path.exists() and (path / "mesh_bot.py").exists():
-            return path
-
-    # Try to find it with locate or find
-    try:
-        result = subprocess.run(
-            ['find', str(Path.home()), '-name', 'mesh_bot.py', '-type', 'f'],
-            capture_output=True, text=True, timeout=30
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            bot_path = Path(result.stdout.strip().split('\n')[0]).parent
-            return bot_path
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        pass
-
-    return None
+    return locate_install(common_paths, search_root=Path.home())
 
 def validate_mac_address(mac: str) -> bool:
     """Validate BLE MAC address format"""
@@ -150,91 +186,33 @@ def validate_port(port: str) -> bool:
 
 def is_raspberry_pi() -> bool:
     """Detect if running on a Raspberry Pi"""
-    try:
-        with open('/proc/cpuinfo', 'r') as f:
-            cpuinfo = f.read()
-            if 'Raspberry Pi' in cpuinfo or 'BCM' in cpuinfo:
-                return True
-    except (FileNotFoundError, PermissionError, IOError):
-        pass
-
-    # Check for Pi-specific files
-    if os.path.exists('/sys/firmware/devicetree/base/model'):
-        try:
-            with open('/sys/firmware/devicetree/base/model', 'r') as f:
-                if 'Raspberry Pi' in f.read():
-                    return True
-        except (FileNotFoundError, PermissionError, IOError):
-            pass
-
-    return False
+    return get_platform_profile().is_raspberry_pi
 
 
 def get_pi_model() -> str:
     """Get Raspberry Pi model information"""
-    try:
-        with open('/sys/firmware/devicetree/base/model', 'r') as f:
-            return f.read().strip().rstrip('\x00')
-    except (FileNotFoundError, PermissionError, IOError):
-        return "Unknown"
+    return get_platform_profile().pi_model
 
 
 def get_os_info() -> Tuple[str, str]:
     """Get OS name and version (codename)"""
-    os_name = "Unknown"
-    os_version = "Unknown"
-
-    try:
-        with open('/etc/os-release', 'r') as f:
-            for line in f:
-                if line.startswith('PRETTY_NAME='):
-                    os_name = line.split('=')[1].strip().strip('"')
-                elif line.startswith('VERSION_CODENAME='):
-                    os_version = line.split('=')[1].strip().strip('"')
-    except (FileNotFoundError, PermissionError, IOError):
-        pass
-
-    return os_name, os_version
+    profile = get_platform_profile()
+    return profile.os_name, profile.os_codename
 
 
 def is_bookworm_or_newer() -> bool:
     """Check if running Debian Bookworm (12) or newer"""
-    _, codename = get_os_info()
-    # Bookworm and newer codenames
-    new_codenames = ['bookworm', 'trixie', 'forky', 'sid']
-    return codename.lower() in new_codenames
+    return get_platform_profile().is_bookworm_or_newer
 
 
 def check_pep668_environment() -> bool:
     """Check if PEP 668 externally managed environment is in effect"""
-    # Check for EXTERNALLY-MANAGED file
-    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
-    managed_file = Path(f"/usr/lib/python{python_version}/EXTERNALLY-MANAGED")
-    return managed_file.exists()
+    return get_platform_profile().pep668
 
 
 def get_serial_ports() -> List[str]:
-    """Get available serial ports, including Raspberry Pi specific ones"""
-    ports = []
-
-    # Common USB serial ports
-    usb_patterns = ['/dev/ttyUSB*', '/dev/ttyACM*']
-
-    # Raspberry Pi specific serial ports
-    pi_ports = ['/dev/ttyAMA0', '/dev/serial0', '/dev/serial1', '/dev/ttyS0']
-
-    # Check USB ports
-    for pattern in usb_patterns:
-        ret, stdout, _ = run_command(['ls', pattern], capture=True)
-        if ret == 0 and stdout.strip():
-            ports.extend(stdout.strip().split('\n'))
-
-    # Check Pi-specific ports
-    for port in pi_ports:
-        if os.path.exists(port):
-            ports.append(port)
-
-    return list(set(ports))  # Remove duplicates
+    """Get available serial ports, most likely Meshtastic radio first"""
+    return [port.device for port in enumerate_serial_ports()]
 
 
 def check_user_groups() -> Tuple[bool, bool]:
@@ -306,8 +284,7 @@ def setup_virtual_environment(venv_path: Path = None) -> Tuple[bool, Optional[Pa
         return False, None
 
     # Check if python3-venv is installed
-    ret, _, _ = run_command(['dpkg', '-l', 'python3-venv'], capture=True)
-    if ret != 0:
+    if not get_package_state().is_installed('python3-venv'):
         print_info("Installing python3-venv...")
         ret, _, stderr = run_command(['apt', 'install', '-y', 'python3-venv'], sudo=True)
         if ret != 0:
@@ -378,12 +355,7 @@ def raspberry_pi_setup() -> Tuple[bool, Optional[Path]]:
     # Step 4: Check for required system packages
     print_step(4, 4, "Checking system packages...")
     required_packages = ['python3-pip', 'git']
-    missing = []
-
-    for pkg in required_packages:
-        ret, _, _ = run_command(['dpkg', '-l', pkg], capture=True)
-        if ret != 0:
-            missing.append(pkg)
+    missing = missing_packages(required_packages)
 
     if missing:
         print_warning(f"Missing packages: {', '.join(missing)}")
@@ -410,6 +382,9 @@ def raspberry_pi_setup() -> Tuple[bool, Optional[Path]]:
         print_info(f"Virtual environment: {venv_path}")
         print_info(f"Activate before running bot: source {venv_path}/bin/activate")
 
+    # Packages and interfaces may have changed - re-probe the platform
+    refresh_platform_profile()
+
     return len(errors) == 0, venv_path
 
 
@@ -633,12 +608,7 @@ def startup_system_check() -> bool:
         print_section("Raspberry Pi Prerequisites")
 
         required_pkgs = ['python3-pip', 'python3-venv', 'git', 'i2c-tools']
-        missing = []
-
-        for pkg in required_pkgs:
-            ret, _, _ = run_command(['dpkg', '-s', pkg], capture=True)
-            if ret != 0:
-                missing.append(pkg)
+        missing = missing_packages(required_pkgs)
 
         if missing:
             print_warning(f"Missing packages: {', '.join(missing)}")
@@ -659,6 +629,9 @@ def startup_system_check() -> bool:
 
 def get_input(prompt: str, default: str = "", input_type: type = str, password: bool = False) -> Any:
     """Get user input with optional default value and password masking"""
+    if _answer_source is not None:
+        return _answer_source.answer(prompt, default, input_type)
+
     if default:
         if password:
             full_prompt = f"{prompt} [****]: "
@@ -697,10 +670,36 @@ def get_input(prompt: str, default: str = "", input_type: type = str, password:
 
 def get_yes_no(prompt: str, default: bool = False) -> bool:
     """Get yes/no input from user"""
+    if _answer_source is not None:
+        return _answer_source.answer_yes_no(prompt, default)
+
     default_str = "Y/n" if default else "y/N"
     response = get_input(f"{prompt} ({default_str})", "y" if default else "n")
     return response.lower() in ['y', 'yes', 'true', '1']
 
+def choose_serial_port() -> str:
+    """List detected serial ports (best match first) and ask which one to use"""
+    ports = enumerate_serial_ports()
+
+    if not ports and get_yes_no("No serial ports found. Wait for a radio to be plugged in?", False):
+        print_info("Plug in your Meshtastic device now (waiting up to 30 seconds)...")
+        port = wait_for_serial_port(timeout=30)
+        if port:
+            print_success(f"Detected {port.device}: {port.description}")
+            ports = [port]
+        else:
+            print_warning("No radio detected")
+
+    if ports:
+        print_info("Available ports:")
+        for port in ports:
+            print(f"  {port.device}  {port.description}")
+            if port.by_id:
+                print(f"    stable path: {port.by_id}")
+
+    default = ports[0].device if ports else "/dev/ttyUSB0"
+    return get_input("Enter serial port", default)
+
 def configure_interface(config: configparser.ConfigParser):
     """Configure interface settings"""
     print_section("Interface Configuration")
@@ -719,7 +718,7 @@ def configure_interface(config: configparser.ConfigParser):
     if conn_type_str == "serial":
         use_auto = get_yes_no("Use auto-detect for serial port?", True)
         if not use_auto:
-            port = get_input("Enter serial port", "/dev/ttyUSB0")
+            port = choose_serial_port()
             config['interface']['port'] = port
     elif conn_type_str == "tcp":
         hostname = get_input("Enter TCP hostname/IP", "192.168.1.100")
@@ -763,6 +762,15 @@ def configure_emergency_alerts(config: configparser.ConfigParser):
     else:
         keywords = get_input("Enter emergency keywords (comma-separated)")
         config['emergencyHandler']['emergency_keywords'] = keywords
+
+    if get_yes_no("Test keywords against a sample message?", False):
+        matcher = KeywordMatcher(config['emergencyHandler']['emergency_keywords'].split(','))
+        sample = get_input("Sample message")
+        hits = sorted({hit.keyword for hit in matcher.finditer(sample)})
+        if hits:
+            print_success(f"Would trigger on: {', '.join(hits)}")
+        else:
+            print_info("No emergency keyword found (whole words only, so 'help' does not match 'helpful')")
     
     channel = get_input("Alert channel number", "2", int)
     config['emergencyHandler']['alert_channel'] = str(channel)
@@ -804,6 +812,19 @@ def configure_proximity_alerts(config: configparser.ConfigParser):
     
     radius = get_input("Proximity radius in meters", "100", int)
     config['proximityAlert']['radius_meters'] = str(radius)
+
+    if get_yes_no("Monitor additional areas?", False):
+        print("Enter areas as name:lat:lon:radius, separated by ;")
+        while True:
+            fences = get_input("Additional areas")
+            try:
+                parse_geofences(fences)
+                break
+            except ValueError as e:
+                print_error(str(e))
+                if _answer_source is not None:
+                    raise
+        config['proximityAlert']['extra_geofences'] = fences
     
     channel = get_input("Alert channel", "0", int)
     config['proximityAlert']['alert_channel'] = str(channel)
@@ -830,6 +851,9 @@ def configure_altitude_alerts(config: configparser.ConfigParser):
     
     altitude = get_input("Minimum altitude threshold (meters)", "1000", int)
     config['altitudeAlert']['min_altitude'] = str(altitude)
+
+    hysteresis = get_input("Meters below threshold before re-alerting", "50", int)
+    config['altitudeAlert']['hysteresis_meters'] = str(hysteresis)
     
     channel = get_input("Alert channel", "0", int)
     config['altitudeAlert']['alert_channel'] = str(channel)
@@ -982,7 +1006,17 @@ def configure_global_settings(config: configparser.ConfigParser):
         return
 
     if get_yes_no("Configure quiet hours?", False):
-        quiet = get_input("Quiet hours (24hr format HH:MM-HH:MM, e.g., 22:00-07:00)")
+        print("Use HH:MM-HH:MM (24hr), optionally after a day or day range;")
+        print("separate several ranges with commas, e.g. Mon-Fri 22:00-07:00, Sat-Sun 23:00-09:00")
+        while True:
+            quiet = get_input("Quiet hours", "22:00-07:00")
+            try:
+                QuietHours(quiet)
+                break
+            except ValueError as e:
+                print_error(str(e))
+                if _answer_source is not None:
+                    raise
         config['alertGlobal']['quiet_hours'] = quiet
 
     max_rate = get_input("Maximum alerts per hour (all types)", "20", int)
@@ -991,6 +1025,155 @@ def configure_global_settings(config: configparser.ConfigParser):
     print_success("Global settings configured")
 
 
+# ============================================================================
+# HEADLESS (ANSWER FILE) MODE
+# ============================================================================
+
+# Wizards in the order the interactive menu presents them; the answer-file
+# name of each wizard is its function name without the configure_ prefix
+WIZARDS = [
+    ('interface', configure_interface),
+    ('general', configure_general),
+    ('emergency_alerts', configure_emergency_alerts),
+    ('proximity_alerts', configure_proximity_alerts),
+    ('altitude_alerts', configure_altitude_alerts),
+    ('weather_alerts', configure_weather_alerts),
+    ('battery_alerts', configure_battery_alerts),
+    ('noisy_node_alerts', configure_noisy_node_alerts),
+    ('new_node_alerts', configure_new_node_alerts),
+    ('email_sms', configure_email_sms),
+    ('global_settings', configure_global_settings),
+]
+
+
+def _resolve_section(config: configparser.ConfigParser, section: str) -> str:
+    """Match a section name case-insensitively against the config and schema
+
+    Section names are case-sensitive, but INI answer files lowercase the
+    keys of [set] ('batteryAlert.enabled' arrives as 'batteryalert.enabled').
+    """
+    if config.has_section(section):
+        return section
+    wanted = section.lower()
+    for name in list(config.sections()) + list(SECTION_NAMES):
+        if name.lower() == wanted:
+            return name
+    return section
+
+
+def apply_overrides(config: configparser.ConfigParser, overrides: Dict[str, Any]):
+    """Apply 'section.key' -> value overrides to a config"""
+    for target, value in overrides.items():
+        section, key, _ = parse_override(f"{target}={value}")
+        section = _resolve_section(config, section)
+        if not config.has_section(section):
+            config.add_section(section)
+        if isinstance(value, bool):
+            value = 'True' if value else 'False'
+        elif isinstance(value, (list, tuple)):
+            value = ','.join(str(v) for v in value)
+        config[section][key] = str(value)
+
+
+def run_answer_file(source: AnswerSource, output: Optional[str] = None,
+                    base: Optional[str] = None, overrides: Optional[Dict[str, Any]] = None) -> Path:
+    """Run the wizards named in an answer file and save the resulting config"""
+    global _answer_source
+
+    if output:
+        config_file = Path(output)
+    elif source.output:
+        config_file = source.resolve(source.output)
+    elif source.origin is not None:
+        config_file = source.origin.with_name(f"{source.origin.stem}.config.ini")
+    else:
+        config_file = Path("config.ini")
+
+    base_file = Path(base) if base else (source.resolve(source.base) if source.base else None)
+    if base_file is not None and not base_file.exists():
+        raise FileNotFoundError(f"Base config not found: {base_file}")
+    config = load_config(str(base_file if base_file is not None else config_file))
+
+    unknown = [name for name in source.wizards if name not in dict(WIZARDS)]
+    if unknown:
+        raise ValueError(f"Unknown wizard(s): {', '.join(unknown)}")
+
+    _answer_source = source
+    try:
+        for name, wizard in WIZARDS:
+            if name in source.wizards:
+                source.begin(name)
+                wizard(config)
+    finally:
+        _answer_source = None
+
+    apply_overrides(config, source.overrides)
+    if overrides:
+        apply_overrides(config, overrides)
+
+    for key in source.unused():
+        print_warning(f"Answer never asked for (check spelling or branch): {key}")
+
+    save_config(config, str(config_file), template=str(base_file) if base_file else None)
+    return config_file
+
+
+def run_headless(answer_files: List[str], overrides: List[str],
+                 output: Optional[str] = None, base: Optional[str] = None) -> int:
+    """Process answer files (or just --set overrides) without prompting
+
+    Returns the number of answer files that failed.
+    """
+    try:
+        override_map = {}
+        for text in overrides:
+            section, key, value = parse_override(text)
+            override_map[f"{section}.{key}"] = value
+    except ValueError as e:
+        print_error(str(e))
+        return 1
+
+    if output and len(answer_files) > 1:
+        print_error("--output can only be used with a single answer file")
+        return 1
+
+    sources = answer_files or [None]
+    failures = 0
+    start = time.monotonic()
+
+    for path in sources:
+        label = path or "command line"
+        print_section(f"Answer file: {label}")
+        try:
+            source = AnswerSource.from_file(Path(path)) if path else AnswerSource({})
+            written = run_answer_file(source, output, base, override_map)
+            print_success(f"{label} -> {written}")
+        except (Exception, SystemExit) as e:
+            failures += 1
+            print_error(f"{label}: {e}")
+
+    elapsed = time.monotonic() - start
+    done = len(sources) - failures
+    print_info(f"Processed {done}/{len(sources)} answer file(s) in {elapsed:.2f}s")
+    return failures
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(
+        description="Interactive (or answer-file driven) setup for the meshing-around bot"
+    )
+    parser.add_argument('--answers', nargs='+', metavar='FILE', default=[],
+                        help="Run headless from one or more answer files (JSON, YAML or INI)")
+    parser.add_argument('--set', action='append', metavar='SECTION.KEY=VALUE', default=[],
+                        dest='overrides', help="Set a config value without prompting (repeatable)")
+    parser.add_argument('--base', metavar='FILE',
+                        help="Config to start from in headless mode (e.g. config.enhanced.ini)")
+    parser.add_argument('--output', '-o', metavar='FILE',
+                        help="Where to write config.ini in headless mode (single answer file only)")
+    return parser.parse_args(argv)
+
+
 # ============================================================================
 # SYSTEM MAINTENANCE FUNCTIONS
 # ============================================================================
@@ -1008,7 +1191,7 @@ def system_update() -> bool:
 
     # Step 1: apt update
     print_step(1, 3, "Updating package lists...")
-    ret, stdout, stderr = run_command(['apt', 'update'], sudo=True)
+    ret, stdout, stderr = run_command_streaming(['apt', 'update'], desc="apt update", sudo=True)
     if ret != 0:
         errors.append(f"apt update failed: {stderr}")
         print_error("Failed to update package lists")
@@ -1017,7 +1200,8 @@ def system_update() -> bool:
 
     # Step 2: apt upgrade
     print_step(2, 3, "Upgrading packages...")
-    ret, stdout, stderr = run_command(['apt', 'upgrade', '-y'], sudo=True)
+    ret, stdout, stderr = run_command_streaming(['apt', 'upgrade', '-y'] + APT_KEEP_CONFFILES,
+                                                desc="apt upgrade", sudo=True)
     if ret != 0:
         errors.append(f"apt upgrade failed: {stderr}")
         print_error("Failed to upgrade packages")
@@ -1026,7 +1210,7 @@ def system_update() -> bool:
 
     # Step 3: Clean up
     print_step(3, 3, "Cleaning up...")
-    run_command(['apt', 'autoremove', '-y'], sudo=True)
+    run_command_streaming(['apt', 'autoremove', '-y'], desc="apt autoremove", sudo=True)
     print_success("Cleanup complete")
 
     if errors:
@@ -1058,7 +1242,7 @@ def update_meshing_around(meshing_path: Optional[Path] = None) -> Tuple[bool, Op
         print_error(f"Directory not found: {meshing_path}")
         if get_yes_no("Clone meshing-around from GitHub?", True):
             clone_path = get_input("Clone to directory", str(Path.home() / "meshing-around"))
-            ret, _, stderr = run_command(
+            ret, _, stderr = run_command_streaming(
                 ['git', 'clone', 'https://github.com/SpudGunMan/meshing-around.git', clone_path],
                 desc="Cloning meshing-around"
             )
@@ -1089,17 +1273,16 @@ def update_meshing_around(meshing_path: Optional[Path] = None) -> Tuple[bool, Op
                 return True, meshing_path
 
         # Git pull
-        ret, stdout, stderr = run_command(['git', 'pull', 'origin', 'main'], capture=True)
+        ret, stdout, stderr = run_command_streaming(['git', 'pull', 'origin', 'main'], desc="git pull (main)")
         if ret != 0:
             # Try master branch
-            ret, stdout, stderr = run_command(['git', 'pull', 'origin', 'master'], capture=True)
+            ret, stdout, stderr = run_command_streaming(['git', 'pull', 'origin', 'master'], desc="git pull (master)")
 
         if ret == 0:
             if 'Already up to date' in stdout:
                 print_success("Already up to date")
             else:
                 print_success("Updated to latest version")
-                print(stdout)
         else:
             print_error(f"Git pull failed: {stderr}")
             os.chdir(original_dir)
@@ -1108,6 +1291,7 @@ def update_meshing_around(meshing_path: Optional[Path] = None) -> Tuple[bool, Op
     finally:
         os.chdir(original_dir)
 
+    remember_install(meshing_path)
     return True, meshing_path
 
 
@@ -1137,7 +1321,7 @@ def install_dependencies(meshing_path: Path, venv_path: Optional[Path] = None) -
     # Try installing from requirements.txt first
     print_info("Installing from requirements.txt...")
     install_cmd = pip_cmd + ['install', '-r', str(requirements_file)]
-    ret, stdout, stderr = run_command(install_cmd, capture=True)
+    ret, stdout, stderr = run_command_streaming(install_cmd, desc="pip install -r requirements.txt")
 
     if ret != 0:
         print_warning("Some packages failed to install from requirements.txt")
@@ -1164,9 +1348,8 @@ def install_dependencies(meshing_path: Path, venv_path: Optional[Path] = None) -
 
         failed_packages = []
         for pkg in core_packages:
-            print_info(f"Installing {pkg}...")
             install_cmd = pip_cmd + ['install', pkg]
-            ret, _, stderr = run_command(install_cmd, capture=True)
+            ret, _, stderr = run_command_streaming(install_cmd, desc=f"pip install {pkg}")
             if ret != 0:
                 failed_packages.append(pkg)
                 print_warning(f"  Failed to install {pkg}")
@@ -1263,7 +1446,7 @@ This wizard will:
             return False, None, None
 
     # Clone the repository
-    ret, stdout, stderr = run_command(
+    ret, stdout, stderr = run_command_streaming(
         ['git', 'clone', 'https://github.com/SpudGunMan/meshing-around.git', str(install_path)],
         desc="Cloning repository"
     )
@@ -1273,6 +1456,7 @@ This wizard will:
         return False, None, None
 
     print_success(f"Cloned meshing-around to {install_path}")
+    remember_install(install_path)
 
     # Step 3: Set up virtual environment (if needed)
     print_step(3, 5, "Setting up Python environment...")
@@ -1285,8 +1469,7 @@ This wizard will:
         venv_path = Path(venv_input)
 
         # Check if python3-venv is installed
-        ret, _, _ = run_command(['dpkg', '-l', 'python3-venv'], capture=True)
-        if ret != 0:
+        if not get_package_state().is_installed('python3-venv'):
             print_info("Installing python3-venv...")
             ret, _, stderr = run_command(['apt', 'install', '-y', 'python3-venv'], sudo=True)
             if ret != 0:
@@ -1726,70 +1909,73 @@ This wizard will:
     if not get_yes_no("Continue with quick setup?", True):
         return None
 
-    errors = []
-    venv_path = None
-
-    # Step 1: Raspberry Pi setup (or system check)
-    if pi_detected:
-        print_step(1, steps, "Raspberry Pi Setup")
-        success, venv_path = raspberry_pi_setup()
-        if not success:
-            errors.append("Raspberry Pi setup had issues")
-    else:
-        print_step(1, steps, "System Check")
-        show_system_info()
-
-    # Step 2: System update
-    print_step(2, steps, "System Update")
-    if not system_update():
-        errors.append("System update had issues")
+    with timing_scope() as timings:
+        errors = []
+        venv_path = None
 
-    # Step 3: Find/update meshing-around
-    print_step(3, steps, "Meshing-Around Setup")
-    success, meshing_path = update_meshing_around()
-    if not success:
-        errors.append("Failed to update meshing-around")
+        # Step 1: Raspberry Pi setup (or system check)
+        if pi_detected:
+            print_step(1, steps, "Raspberry Pi Setup")
+            success, venv_path = raspberry_pi_setup()
+            if not success:
+                errors.append("Raspberry Pi setup had issues")
+        else:
+            print_step(1, steps, "System Check")
+            show_system_info()
 
-    # Step 4: Install dependencies (with venv support)
-    if meshing_path:
-        print_step(4, steps, "Install Dependencies")
-        if not install_dependencies(meshing_path, venv_path):
-            errors.append("Dependency installation had issues")
+        # Step 2: System update
+        print_step(2, steps, "System Update")
+        if not system_update():
+            errors.append("System update had issues")
 
-    # Step 5: Create basic config
-    print_step(5, steps, "Create Configuration")
-    config = create_basic_config()
+        # Step 3: Find/update meshing-around
+        print_step(3, steps, "Meshing-Around Setup")
+        success, meshing_path = update_meshing_around()
+        if not success:
+            errors.append("Failed to update meshing-around")
+
+        # Step 4: Install dependencies (with venv support)
+        if meshing_path:
+            print_step(4, steps, "Install Dependencies")
+            if not install_dependencies(meshing_path, venv_path):
+                errors.append("Dependency installation had issues")
+
+        # Step 5: Create basic config
+        print_step(5, steps, "Create Configuration")
+        config = create_basic_config()
+
+        # Step 6: Verify bot
+        if meshing_path:
+            print_step(6, steps, "Verify Bot")
+            if not verify_bot_running(meshing_path):
+                errors.append("Bot verification failed")
+
+        # Summary
+        print_section("Setup Summary")
+        if errors:
+            print_warning("Setup completed with some issues:")
+            for err in errors:
+                print_error(f"  • {err}")
+        else:
+            print_success("Setup completed successfully!")
 
-    # Step 6: Verify bot
-    if meshing_path:
-        print_step(6, steps, "Verify Bot")
-        if not verify_bot_running(meshing_path):
-            errors.append("Bot verification failed")
+        if meshing_path:
+            print_info(f"Meshing-around location: {meshing_path}")
 
-    # Summary
-    print_section("Setup Summary")
-    if errors:
-        print_warning("Setup completed with some issues:")
-        for err in errors:
-            print_error(f"  • {err}")
-    else:
-        print_success("Setup completed successfully!")
+            if venv_path:
+                print_info(f"Virtual environment: {venv_path}")
+                print_info("\nNext steps:")
+                print(f"  1. Copy config.ini to {meshing_path}/")
+                print(f"  2. source {venv_path}/bin/activate")
+                print(f"  3. cd {meshing_path}")
+                print("  4. python3 mesh_bot.py")
+            else:
+                print_info("Next steps:")
+                print(f"  1. Copy config.ini to {meshing_path}/")
+                print(f"  2. cd {meshing_path}")
+                print("  3. python3 mesh_bot.py")
 
-    if meshing_path:
-        print_info(f"Meshing-around location: {meshing_path}")
-
-        if venv_path:
-            print_info(f"Virtual environment: {venv_path}")
-            print_info("\nNext steps:")
-            print(f"  1. Copy config.ini to {meshing_path}/")
-            print(f"  2. source {venv_path}/bin/activate")
-            print(f"  3. cd {meshing_path}")
-            print("  4. python3 mesh_bot.py")
-        else:
-            print_info("Next steps:")
-            print(f"  1. Copy config.ini to {meshing_path}/")
-            print(f"  2. cd {meshing_path}")
-            print("  3. python3 mesh_bot.py")
+        print_timing_summary("Command Timing", timings)
 
     return config
 
@@ -1801,13 +1987,7 @@ def create_basic_config() -> configparser.ConfigParser:
     config = configparser.ConfigParser()
 
     # Initialize all sections
-    sections = [
-        'interface', 'general', 'emergencyHandler', 'proximityAlert',
-        'altitudeAlert', 'weatherAlert', 'ipawsAlert', 'volcanoAlert',
-        'noisyNodeAlert', 'batteryAlert', 'newNodeAlert', 'snrAlert',
-        'disconnectAlert', 'customAlert', 'alertGlobal', 'smtp', 'sms'
-    ]
-    for section in sections:
+    for section in SECTION_NAMES:
         config.add_section(section)
 
     # Basic interface config
@@ -1853,14 +2033,24 @@ def show_system_info():
     else:
         print(f"  Codename: {os_codename}")
 
+    # Kernel, disk and memory probes are independent - run them together
+    probes = [(['uname', '-r'], "uname"), (['df', '-h', '/'], "df")]
+    if is_raspberry_pi():
+        probes.append((['free', '-h'], "free"))
+    probe_results = run_parallel(probes)
+    kernel, disk = probe_results[0], probe_results[1]
+
     # Kernel
-    ret, stdout, _ = run_command(['uname', '-r'], capture=True)
-    if ret == 0:
-        print(f"Kernel: {stdout.strip()}")
+    if kernel.returncode == 0:
+        print(f"Kernel: {kernel.stdout.strip()}")
 
     # Python version
     print(f"Python: {sys.version.split()[0]}")
 
+    # Hardware
+    profile = get_platform_profile()
+    print(f"Hardware: {profile.cpu_count} CPU core(s), {profile.ram_total_mb} MB RAM")
+
     # PEP 668 status
     if check_pep668_environment():
         print_warning("PEP 668: Externally managed environment (use venv or --break-system-packages)")
@@ -1888,10 +2078,10 @@ def show_system_info():
 
     # Check for serial ports (including Pi-specific)
     print("\nSerial ports:")
-    ports = get_serial_ports()
+    ports = enumerate_serial_ports()
     if ports:
         for port in ports:
-            print_success(f"  {port}")
+            print_success(f"  {port.device}  {port.description}")
     else:
         print_warning("  No serial ports found - connect your Meshtastic device")
 
@@ -1915,15 +2105,12 @@ def show_system_info():
         print_warning(f"\nVirtual environment: Not found (recommended for Bookworm)")
 
     # Disk space
-    ret, stdout, _ = run_command(['df', '-h', '/'], capture=True)
-    if ret == 0:
-        print(f"\nDisk space:\n{stdout}")
+    if disk.returncode == 0:
+        print(f"\nDisk space:\n{disk.stdout}")
 
     # Memory (useful for Pi)
-    if is_raspberry_pi():
-        ret, stdout, _ = run_command(['free', '-h'], capture=True)
-        if ret == 0:
-            print(f"Memory:\n{stdout}")
+    if len(probe_results) > 2 and probe_results[2].returncode == 0:
+        print(f"Memory:\n{probe_results[2].stdout}")
 
 def load_config(config_file: str) -> configparser.ConfigParser:
     """Load existing config or create new one"""
@@ -1935,28 +2122,34 @@ def load_config(config_file: str) -> configparser.ConfigParser:
     else:
         print_warning(f"No existing config found, creating new configuration")
         # Initialize sections
-        sections = [
-            'interface', 'general', 'emergencyHandler', 'proximityAlert',
-            'altitudeAlert', 'weatherAlert', 'ipawsAlert', 'volcanoAlert',
-            'noisyNodeAlert', 'batteryAlert', 'newNodeAlert', 'snrAlert',
-            'disconnectAlert', 'customAlert', 'alertGlobal', 'smtp', 'sms'
-        ]
-        for section in sections:
+        for section in SECTION_NAMES:
             if not config.has_section(section):
                 config.add_section(section)
     
     return config
 
-def save_config(config: configparser.ConfigParser, config_file: str):
-    """Save configuration to file"""
+def save_config(config: configparser.ConfigParser, config_file: str,
+                template: Optional[str] = None):
+    """Save configuration to file, keeping its comments and the previous version
+
+    A new file takes its layout and comments from template if given.
+    """
+    for err in validate_config(config):
+        print_warning(f"Config check: {err}")
     try:
-        with open(config_file, 'w') as f:
-            config.write(f)
-        print_success(f"\nConfiguration saved to {config_file}")
+        if save_ini(config, config_file, backups=1, template=template):
+            print_success(f"\nConfiguration saved to {config_file}")
+        else:
+            print_info(f"\nNo changes to save in {config_file}")
     except Exception as e:
         print_error(f"Failed to save config: {e}")
         sys.exit(1)
 
+    try:
+        write_snapshot(config_file)
+    except Exception as e:
+        print_warning(f"Could not write config snapshot: {e}")
+
 def main_menu():
     """Display main menu and handle user selection"""
     # Run startup checks (includes system update)
@@ -2205,19 +2398,21 @@ def system_maintenance_menu():
         elif (choice == "9" and not is_raspberry_pi()) or (choice == "10" and is_raspberry_pi()):
             # Run all maintenance
             print_section("Running All Maintenance")
-            if is_raspberry_pi():
-                print_step(1, 5, "Raspberry Pi Setup")
-                _, venv_path = raspberry_pi_setup()
-            print_step(2 if is_raspberry_pi() else 1, 5 if is_raspberry_pi() else 4, "System Update")
-            system_update()
-            print_step(3 if is_raspberry_pi() else 2, 5 if is_raspberry_pi() else 4, "Update Meshing-Around")
-            success, meshing_path = update_meshing_around(meshing_path)
-            if meshing_path:
-                print_step(4 if is_raspberry_pi() else 3, 5 if is_raspberry_pi() else 4, "Install Dependencies")
-                install_dependencies(meshing_path, venv_path)
-                print_step(5 if is_raspberry_pi() else 4, 5 if is_raspberry_pi() else 4, "Verify Bot")
-                verify_bot_running(meshing_path)
-            print_success("Maintenance complete!")
+            with timing_scope() as timings:
+                if is_raspberry_pi():
+                    print_step(1, 5, "Raspberry Pi Setup")
+                    _, venv_path = raspberry_pi_setup()
+                print_step(2 if is_raspberry_pi() else 1, 5 if is_raspberry_pi() else 4, "System Update")
+                system_update()
+                print_step(3 if is_raspberry_pi() else 2, 5 if is_raspberry_pi() else 4, "Update Meshing-Around")
+                success, meshing_path = update_meshing_around(meshing_path)
+                if meshing_path:
+                    print_step(4 if is_raspberry_pi() else 3, 5 if is_raspberry_pi() else 4, "Install Dependencies")
+                    install_dependencies(meshing_path, venv_path)
+                    print_step(5 if is_raspberry_pi() else 4, 5 if is_raspberry_pi() else 4, "Verify Bot")
+                    verify_bot_running(meshing_path)
+                print_success("Maintenance complete!")
+                print_timing_summary("Command Timing", timings)
         elif (choice == "10" and not is_raspberry_pi()) or (choice == "11" and is_raspberry_pi()):
             break
         else:
@@ -2237,10 +2432,20 @@ def deploy_and_start(config_file: str, meshing_path: Path):
         print_error(f"Failed to copy config: {e}")
         return
 
+    # Precompiled copy for fast loading; stale snapshots are ignored
+    try:
+        write_snapshot(dest_config)
+    except Exception as e:
+        print_warning(f"Could not write config snapshot: {e}")
+
     # Start the bot
     verify_bot_running(meshing_path)
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.answers or args.overrides:
+        sys.exit(1 if run_headless(args.answers, args.overrides, args.output, args.base) else 0)
+
     try:
         main_menu()
     except KeyboardInterrupt:
@@ -23,46 +23,37 @@ import shutil
 import re
 import time
 import configparser
+import importlib.util
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 from getpass import getpass
 
-# Check for rich library and provide fallback
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-    from rich.table import Table
-    from rich.prompt import Prompt, Confirm, IntPrompt, FloatPrompt
-    from rich.tree import Tree
-    from rich.text import Text
-    from rich import box
-    from rich.padding import Padding
-    from rich.columns import Columns
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
-    print("⚠️  Installing 'rich' library for better UI...")
-    try:
-        subprocess.run([sys.executable, "-m", "pip", "install", "rich", "--quiet"],
-                      check=False, capture_output=True)
-        from rich.console import Console
-        from rich.panel import Panel
-        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-        from rich.table import Table
-        from rich.prompt import Prompt, Confirm, IntPrompt, FloatPrompt
-        from rich.tree import Tree
-        from rich.text import Text
-        from rich import box
-        from rich.padding import Padding
-        from rich.columns import Columns
-        RICH_AVAILABLE = True
-    except Exception:
-        # Fallback to basic output
-        pass
+# Only the cheap, stdlib-only platform probe is imported up front; the other
+# configlib modules pull in json, socket, concurrent.futures and tempfile, so
+# they are imported by the functions that use them to keep startup fast.
+from configlib.platform_profile import get_platform_profile
+
+# The rich library is optional and imported lazily: we only check that it is
+# installable here, and the rich submodules are imported by the first widget
+# that draws with them. Nothing is installed at import time.
+RICH_AVAILABLE = importlib.util.find_spec("rich") is not None
+
+
+class _LazyConsole:
+    """Proxy that creates the rich Console on first use"""
+
+    def __init__(self):
+        self._console = None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return getattr(self._console, name)
+
 
 # Initialize console
-console = Console() if RICH_AVAILABLE else None
+console = _LazyConsole() if RICH_AVAILABLE else None
 
 # Version info
 VERSION = "2.2.0"
@@ -75,6 +66,8 @@ SUPPORTED_OS = ["bookworm", "trixie", "forky", "sid", "noble", "jammy"]
 def print_header(text: str):
     """Print a formatted header with rich styling"""
     if RICH_AVAILABLE:
+        from rich import box
+        from rich.panel import Panel
         console.print()
         console.print(Panel(
             f"[bold cyan]{text}[/bold cyan]",
@@ -130,6 +123,9 @@ def print_step(current: int, total: int, text: str):
 def create_menu_table(title: str, items: List[Tuple[str, str]], columns: int = 1) -> None:
     """Create a beautiful menu table"""
     if RICH_AVAILABLE:
+        from rich import box
+        from rich.panel import Panel
+        from rich.table import Table
         table = Table(show_header=False, box=box.ROUNDED, border_style="cyan", padding=(0, 2))
 
         if columns == 1:
@@ -168,6 +164,8 @@ def get_input_rich(prompt: str, default: str = "", input_type: type = str,
     if not RICH_AVAILABLE:
         return get_input_basic(prompt, default, input_type, password)
 
+    from rich.prompt import Prompt, Confirm, IntPrompt, FloatPrompt
+
     try:
         if password:
             return Prompt.ask(f"[yellow]{prompt}[/yellow]", password=True, default=default or None)
@@ -237,6 +235,7 @@ def get_input(prompt: str, default: str = "", input_type: type = str,
 def get_yes_no(prompt: str, default: bool = False) -> bool:
     """Get yes/no input from user"""
     if RICH_AVAILABLE:
+        from rich.prompt import Confirm
         return Confirm.ask(f"[yellow]{prompt}[/yellow]", default=default)
     else:
         default_str = "Y/n" if default else "y/N"
@@ -273,6 +272,8 @@ def run_command(cmd: List[str], desc: str = "", capture: bool = False,
 
 def find_meshing_around() -> Optional[Path]:
     """Find the meshing-around installation directory"""
+    from configlib.install_locator import locate_install
+
     common_paths = [
         Path.home() / "meshing-around",
         Path.home() / "mesh-bot",
@@ -282,97 +283,28 @@ def find_meshing_around() -> Optional[Path]:
         Path.cwd() / "meshing-around",
     ]
 
-    for path in common_paths:
-        if path.exists() and (path / "mesh_bot.py").exists():
-            return path
-
-    try:
-        result = subprocess.run(
-            ['find', str(Path.home()), '-name', 'mesh_bot.py', '-type', 'f'],
-            capture_output=True, text=True, timeout=30
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            bot_path = Path(result.stdout.strip().split('\n')[0]).parent
-            return bot_path
-    except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
-        pass
-
-    return None
+    return locate_install(common_paths, search_root=Path.home())
 
 def is_raspberry_pi() -> bool:
     """Detect if running on a Raspberry Pi"""
-    try:
-        with open('/proc/cpuinfo', 'r') as f:
-            cpuinfo = f.read()
-            if 'Raspberry Pi' in cpuinfo or 'BCM' in cpuinfo:
-                return True
-    except (FileNotFoundError, PermissionError, IOError):
-        pass
-
-    if os.path.exists('/sys/firmware/devicetree/base/model'):
-        try:
-            with open('/sys/firmware/devicetree/base/model', 'r') as f:
-                if 'Raspberry Pi' in f.read():
-                    return True
-        except (FileNotFoundError, PermissionError, IOError):
-            pass
-
-    return False
+    return get_platform_profile().is_raspberry_pi
 
 def get_pi_model() -> str:
     """Get Raspberry Pi model information"""
-    try:
-        with open('/sys/firmware/devicetree/base/model', 'r') as f:
-            return f.read().strip().rstrip('\x00')
-    except (FileNotFoundError, PermissionError, IOError):
-        return "Unknown"
+    return get_platform_profile().pi_model
 
 def get_os_info() -> Tuple[str, str]:
     """Get OS name and version (codename)"""
-    os_name = "Unknown"
-    os_version = "Unknown"
-
-    try:
-        with open('/etc/os-release', 'r') as f:
-            for line in f:
-                if line.startswith('PRETTY_NAME='):
-                    os_name = line.split('=')[1].strip().strip('"')
-                elif line.startswith('VERSION_CODENAME='):
-                    os_version = line.split('=')[1].strip().strip('"')
-    except (FileNotFoundError, PermissionError, IOError):
-        pass
-
-    return os_name, os_version
+    profile = get_platform_profile()
+    return profile.os_name, profile.os_codename
 
 def is_bookworm_or_newer() -> bool:
     """Check if running Debian Bookworm (12) or newer"""
-    _, codename = get_os_info()
-    new_codenames = ['bookworm', 'trixie', 'forky', 'sid']
-    return codename.lower() in new_codenames
+    return get_platform_profile().is_bookworm_or_newer
 
 def check_pep668_environment() -> bool:
     """Check if PEP 668 externally managed environment is in effect"""
-    python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
-    managed_file = Path(f"/usr/lib/python{python_version}/EXTERNALLY-MANAGED")
-    return managed_file.exists()
-
-def get_serial_ports() -> List[str]:
-    """Get available serial ports, including Raspberry Pi specific ones"""
-    ports = []
-
-    usb_patterns = ['/dev/ttyUSB*', '/dev/ttyACM*']
-    pi_ports = ['/dev/ttyAMA0', '/dev/serial0', '/dev/serial1', '/dev/ttyS0']
-
-    for pattern in usb_patterns:
-        ret, stdout, _ = run_command(['ls', pattern], capture=True)
-        if ret == 0 and stdout.strip():
-            ports.extend(stdout.strip().split('\n'))
-
-    for port in pi_ports:
-        if os.path.exists(port):
-            ports.append(port)
-
-    return list(set(ports))
+    return get_platform_profile().pep668
 
 def check_user_groups() -> Tuple[bool, bool]:
     """Check if user is in dialout and gpio groups"""
@@ -390,6 +322,10 @@ def check_user_groups() -> Tuple[bool, bool]:
 
 def show_system_info_rich():
     """Display system information in a beautiful table"""
+    from rich import box
+    from rich.table import Table
+    from configlib.serial_ports import enumerate_serial_ports
+
     print_section("System Information")
 
     # Create system info table
@@ -414,6 +350,10 @@ def show_system_info_rich():
     py_status = "✓" if sys.version_info >= (3, 9) else "⚠"
     table.add_row("🐍 Python", f"{py_status} {py_version}")
 
+    # Hardware
+    profile = get_platform_profile()
+    table.add_row("🧠 Hardware", f"{profile.cpu_count} CPU core(s), {profile.ram_total_mb} MB RAM")
+
     # PEP 668
     if check_pep668_environment():
         table.add_row("📋 PEP 668", "[yellow]Active (use venv)[/yellow]")
@@ -424,16 +364,17 @@ def show_system_info_rich():
 
     # Serial ports
     print_section("Serial Ports")
-    ports = get_serial_ports()
+    ports = enumerate_serial_ports()
 
     if ports:
         port_table = Table(box=box.SIMPLE, show_header=False)
         port_table.add_column("Port", style="cyan")
+        port_table.add_column("Device", style="white")
         port_table.add_column("Status", style="green")
 
         for port in ports:
-            accessible = "✓ Ready" if os.access(port, os.R_OK | os.W_OK) else "⚠ No permission"
-            port_table.add_row(port, accessible)
+            accessible = "✓ Ready" if os.access(port.device, os.R_OK | os.W_OK) else "⚠ No permission"
+            port_table.add_row(port.device, port.description, accessible)
 
         console.print(port_table)
     else:
@@ -477,9 +418,11 @@ def show_system_info():
         print(f"OS: {os_name} ({os_codename})")
         print(f"Python: {sys.version.split()[0]}")
 
+        from configlib.serial_ports import enumerate_serial_ports
+
         print("\nSerial Ports:")
-        for port in get_serial_ports():
-            print(f"  - {port}")
+        for port in enumerate_serial_ports():
+            print(f"  - {port.device}  {port.description}")
 
         meshing_path = find_meshing_around()
         if meshing_path:
@@ -489,6 +432,31 @@ def show_system_info():
 # CONFIGURATION FUNCTIONS (Enhanced with Rich UI)
 # ============================================================================
 
+def choose_serial_port() -> str:
+    """List detected serial ports (best match first) and ask which one to use"""
+    from configlib.serial_ports import enumerate_serial_ports, wait_for_serial_port
+
+    ports = enumerate_serial_ports()
+
+    if not ports and get_yes_no("No serial ports found. Wait for a radio to be plugged in?", False):
+        print_info("Plug in your Meshtastic device now (waiting up to 30 seconds)...")
+        port = wait_for_serial_port(timeout=30)
+        if port:
+            print_success(f"Detected {port.device}: {port.description}")
+            ports = [port]
+        else:
+            print_warning("No radio detected")
+
+    if ports:
+        print_info("Available ports:")
+        for port in ports:
+            print(f"  {port.device}  {port.description}")
+            if port.by_id:
+                print(f"    stable path: {port.by_id}")
+
+    default = ports[0].device if ports else "/dev/ttyUSB0"
+    return get_input("Enter serial port", default)
+
 def configure_interface(config: configparser.ConfigParser):
     """Configure interface settings with improved UI"""
     print_section("Interface Configuration")
@@ -515,10 +483,7 @@ def configure_interface(config: configparser.ConfigParser):
     if conn_type_str == "serial":
         use_auto = get_yes_no("Use auto-detect for serial port?", True)
         if not use_auto:
-            ports = get_serial_ports()
-            if ports:
-                print_info(f"Available ports: {', '.join(ports)}")
-            port = get_input("Enter serial port", "/dev/ttyUSB0")
+            port = choose_serial_port()
             config['interface']['port'] = port
     elif conn_type_str == "tcp":
         hostname = get_input("Enter TCP hostname/IP", "192.168.1.100")
@@ -578,26 +543,36 @@ def load_config(config_file: str) -> configparser.ConfigParser:
         print_success(f"Loading existing config from {config_file}")
         config.read(config_file)
     else:
+        from configlib.schema import SECTION_NAMES
+
         print_warning(f"No existing config found, creating new configuration")
-        sections = [
-            'interface', 'general', 'emergencyHandler', 'proximityAlert',
-            'altitudeAlert', 'weatherAlert', 'batteryAlert', 'noisyNodeAlert',
-            'newNodeAlert', 'alertGlobal', 'smtp', 'sms'
-        ]
-        for section in sections:
+        for section in SECTION_NAMES:
             if not config.has_section(section):
                 config.add_section(section)
 
     return config
 
 def save_config(config: configparser.ConfigParser, config_file: str):
-    """Save configuration to file"""
+    """Save configuration to file, keeping its comments and the previous version"""
+    from configlib.config_snapshot import write_snapshot
+    from configlib.ini_writer import save_ini
+    from configlib.schema import validate_config
+
+    for err in validate_config(config):
+        print_warning(f"Config check: {err}")
     try:
-        with open(config_file, 'w') as f:
-            config.write(f)
-        print_success(f"Configuration saved to {config_file}")
+        if save_ini(config, config_file, backups=1):
+            print_success(f"Configuration saved to {config_file}")
+        else:
+            print_info(f"No changes to save in {config_file}")
     except Exception as e:
         print_error(f"Failed to save config: {e}")
+        return
+
+    try:
+        write_snapshot(config_file)
+    except Exception as e:
+        print_warning(f"Could not write config snapshot: {e}")
 
 # ============================================================================
 # MAIN MENU AND WIZARDS
@@ -606,6 +581,10 @@ def save_config(config: configparser.ConfigParser, config_file: str):
 def startup_system_check() -> bool:
     """Run system checks with beautiful display"""
     if RICH_AVAILABLE:
+        from rich import box
+        from rich.panel import Panel
+        from rich.text import Text
+
         console.clear()
 
         # Animated header
@@ -636,9 +615,10 @@ def startup_system_check() -> bool:
 
     if get_yes_no("Run system update now (apt update && apt upgrade)?", False):
         if RICH_AVAILABLE:
+            from configlib.command_runner import APT_KEEP_CONFFILES
             with console.status("[cyan]Updating system...", spinner="dots"):
                 run_command(['apt', 'update'], sudo=True, capture=True)
-                run_command(['apt', 'upgrade', '-y'], sudo=True, capture=True)
+                run_command(['apt', 'upgrade', '-y'] + APT_KEEP_CONFFILES, sudo=True, capture=True)
                 run_command(['apt', 'autoremove', '-y'], sudo=True, capture=True)
             print_success("System updated successfully!")
         else:
@@ -652,6 +632,7 @@ def quick_setup():
     print_header("Quick Setup Wizard")
 
     if RICH_AVAILABLE:
+        from rich.panel import Panel
         steps_panel = Panel(
             "[cyan]This wizard will:[/cyan]\n\n"
             "  1. ✓ Check system requirements\n"
@@ -666,15 +647,12 @@ def quick_setup():
     if not get_yes_no("Continue with quick setup?", True):
         return None
 
+    from configlib.schema import SECTION_NAMES
+
     # Create basic config
     config = configparser.ConfigParser()
 
-    sections = [
-        'interface', 'general', 'emergencyHandler', 'proximityAlert',
-        'altitudeAlert', 'weatherAlert', 'batteryAlert', 'noisyNodeAlert',
-        'newNodeAlert', 'alertGlobal', 'smtp', 'sms'
-    ]
-    for section in sections:
+    for section in SECTION_NAMES:
         config.add_section(section)
 
     # Configure basic settings
@@ -0,0 +1,40 @@
+"""Tests for alertlib.alert_log"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from alertlib.alert_log import AlertLog
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_close_writes_buffered_lines(tmp_path):
+    log = AlertLog(tmp_path, flush_interval=3600)
+    log.log("alerts.log", "first")
+    log.log("alerts.log", "second")
+    log.close()
+    lines = (tmp_path / "alerts.log").read_text().splitlines()
+    assert [line.split(" - ", 1)[1] for line in lines] == ["first", "second"]
+    log.close()  # already stopped: harmless
+
+
+def test_urgent_line_is_written_at_once(tmp_path):
+    with AlertLog(tmp_path, flush_interval=3600) as log:
+        log.log("alerts.log", "sos", priority=4)
+        for _ in range(200):
+            if (tmp_path / "alerts.log").exists():
+                break
+            time.sleep(0.01)
+        assert "sos" in (tmp_path / "alerts.log").read_text()
+
+
+def test_lines_are_written_at_exit_without_close(tmp_path):
+    script = ("import sys\n"
+              "from alertlib.alert_log import AlertLog\n"
+              "log = AlertLog(sys.argv[1], flush_interval=3600)\n"
+              "log.log('alerts.log', 'last words')\n")
+    subprocess.run([sys.executable, "-c", script, str(tmp_path)], cwd=str(REPO_ROOT),
+                   check=True, timeout=30)
+    assert "last words" in (tmp_path / "alerts.log").read_text()
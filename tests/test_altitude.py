@@ -0,0 +1,50 @@
+"""Tests for alertlib.altitude"""
+
+from alertlib.altitude import AltitudeEngine
+
+
+def engine(**kwargs):
+    kwargs.setdefault('cooldown_period', 0)
+    return AltitudeEngine(1000, hysteresis=50, clock=lambda: 0.0, **kwargs)
+
+
+def test_first_sighting_above_the_threshold_does_not_alert():
+    alt = engine()
+    alt.update(1, 1500)
+    assert alt.tick(now=0) == []
+    alt.update(1, 1600)
+    assert alt.tick(now=10) == []
+
+
+def test_upward_crossing_alerts_once_until_rearmed():
+    alt = engine()
+    alt.update(1, 900)
+    assert alt.tick(now=0) == []
+    alt.update(1, 1100)
+    assert [e.node for e in alt.tick(now=10)] == [1]
+    alt.update(1, 980)      # inside the hysteresis band: still latched
+    alt.tick(now=20)
+    alt.update(1, 1200)
+    assert alt.tick(now=30) == []
+    alt.update(1, 900)      # below 1000 - 50: re-armed
+    alt.tick(now=40)
+    alt.update(1, 1200)
+    assert [e.altitude for e in alt.tick(now=50)] == [1200]
+
+
+def test_node_first_seen_high_alerts_after_coming_down_and_climbing_again():
+    alt = engine()
+    alt.update(1, 3000)
+    alt.tick(now=0)
+    alt.update(1, 500)
+    alt.tick(now=10)
+    alt.update(1, 1500)
+    assert [e.node for e in alt.tick(now=20)] == [1]
+
+
+def test_cooldown_limits_repeat_crossings():
+    alt = engine(cooldown_period=300)
+    for now, altitude in ((0, 900), (10, 1100), (20, 800), (30, 1100)):
+        alt.update(1, altitude)
+        events = alt.tick(now=now)
+    assert events == []     # crossed again 20 s after the first alert
@@ -0,0 +1,47 @@
+"""Tests for alertlib.battery"""
+
+import pytest
+
+from alertlib.battery import BatteryStore, np
+from alertlib.cooldowns import CooldownRegistry
+
+BACKENDS = [False, True] if np is not None else [False]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_hysteresis_alerts_once_per_drop(use_numpy):
+    store = BatteryStore(20, use_numpy=use_numpy)
+    store.update(1, 50)
+    assert store.evaluate(now=0) == []
+    store.update(1, 19)
+    assert [(e.node, e.level) for e in store.evaluate(now=10)] == [(1, 19)]
+    store.update(1, 21)                # hovering just above the threshold
+    store.update(1, 18)
+    assert store.evaluate(now=20) == []
+    store.update(1, 25)                # back to threshold + hysteresis: re-armed
+    store.evaluate(now=30)
+    store.update(1, 15)
+    assert [e.node for e in store.evaluate(now=40)] == [1]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_cooldown_is_kept_in_the_registry(use_numpy):
+    cooldowns = CooldownRegistry({'batteryAlert': 3600})
+    store = BatteryStore(20, cooldowns, use_numpy=use_numpy)
+    store.update_many([(1, 10), (2, 90)])
+    assert [e.node for e in store.evaluate(now=1000)] == [1]
+    assert cooldowns.remaining('batteryAlert', 1, now=1000) == 3600
+
+    store.update(1, 50)
+    store.evaluate(now=1100)
+    store.update(1, 10)                # re-armed, but still cooling down
+    assert store.evaluate(now=1200) == []
+    assert [e.node for e in store.evaluate(now=4600)] == [1]   # armed until it could fire
+
+
+def test_external_power_counts_as_full_and_unknown_nodes_are_ignored():
+    store = BatteryStore(20, monitor_nodes=[1], use_numpy=False)
+    store.update(1, 101)
+    store.update(2, 5)
+    assert store.level(1) == 100 and store.level(2) is None
+    assert store.memory_bytes == 6
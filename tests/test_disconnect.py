@@ -0,0 +1,51 @@
+"""Tests for alertlib.disconnect"""
+
+from alertlib.disconnect import OFFLINE, ONLINE, DisconnectMonitor
+
+
+def monitor(**kwargs):
+    return DisconnectMonitor(600, clock=lambda: 0.0, **kwargs)
+
+
+def test_node_heard_again_is_requeued_not_reported():
+    mon = monitor()
+    mon.heard(1, now=0)
+    for now in range(60, 1200, 60):
+        mon.heard(1, now=now)           # keeps talking: no new heap entries
+    assert len(mon._heap) == 1
+    assert mon.check(now=900) == []     # the stale deadline (600) is pushed back
+    assert mon.next_deadline() == 1140 + 600
+    assert mon.check(now=1739) == []
+    assert [(e.kind, e.node) for e in mon.check(now=1740)] == [(OFFLINE, 1)]
+
+
+def test_offline_node_comes_back_online_once():
+    mon = monitor()
+    mon.heard(1, now=0)
+    assert [e.kind for e in mon.check(now=600)] == [OFFLINE]
+    assert mon.check(now=5000) == []    # reported once, no heap entry left
+    event = mon.heard(1, now=6000)
+    assert event.kind == ONLINE and event.silent_seconds == 6000
+    assert mon.heard(1, now=6001) is None
+    assert mon.check(now=6600) == []
+    assert [e.node for e in mon.check(now=6601)] == [1]
+
+
+def test_forgotten_node_is_dropped_when_its_entry_is_popped():
+    mon = monitor()
+    mon.heard(1, now=0)
+    mon.heard(2, now=0)
+    mon.forget(1)
+    assert len(mon._heap) == 2          # deleted lazily
+    assert [e.node for e in mon.check(now=600)] == [2]
+    assert mon._heap == []
+    mon.heard(1, now=700)               # monitored again from scratch
+    assert [e.node for e in mon.check(now=1300)] == [1]
+
+
+def test_listed_nodes_that_are_never_heard_are_reported():
+    mon = monitor(monitor_nodes=[5, 6])
+    mon.heard(6, now=300)
+    assert mon.heard(7, now=300) is None and len(mon) == 2    # not monitored
+    assert [e.node for e in mon.check(now=600)] == [5]
+    assert [e.node for e in mon.check(now=900)] == [6]
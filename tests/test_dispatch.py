@@ -0,0 +1,67 @@
+"""Tests for alertlib.dispatch"""
+
+from alertlib.dispatch import DispatchQueue
+
+
+class Clock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def order(queue):
+    return [(alert.alert_type, alert.node, alert.priority) for alert in queue.drain()]
+
+
+def test_highest_priority_then_oldest_first():
+    queue = DispatchQueue(clock=Clock())
+    queue.put('proximityAlert', "a", node=1, priority=2)
+    queue.put('batteryAlert', "b", node=2, priority=1)
+    queue.put('emergencyHandler', "c", node=3, priority=4)
+    queue.put('proximityAlert', "d", node=4, priority=2)
+    assert order(queue) == [('emergencyHandler', 3, 4), ('proximityAlert', 1, 2),
+                            ('proximityAlert', 4, 2), ('batteryAlert', 2, 1)]
+
+
+def test_repeat_is_coalesced_in_place():
+    queue = DispatchQueue(clock=Clock())
+    queue.put('snrAlert', "first", node=1, priority=2)
+    queue.put('snrAlert', "other", node=2, priority=2)
+    queue.put('snrAlert', "latest", node=1, priority=2)
+    alert = queue.get()
+    assert (alert.node, alert.message, alert.count) == (1, "latest", 2)
+    assert queue.metrics().coalesced == 1
+
+
+def test_moved_up_alert_keeps_its_queueing_order():
+    queue = DispatchQueue(clock=Clock())
+    queue.put('weatherAlert', "early", node=1, priority=3)
+    queue.put('snrAlert', "old", node=9, priority=2)
+    queue.put('weatherAlert', "late", node=2, priority=3)
+    queue.put('snrAlert', "urgent now", node=9, priority=3)
+    # Queued before node 2's alert, so it goes out ahead of it, not at the tail
+    assert order(queue) == [('weatherAlert', 1, 3), ('snrAlert', 9, 3), ('weatherAlert', 2, 3)]
+    assert queue.metrics().depth == {1: 0, 2: 0, 3: 0, 4: 0}
+
+
+def test_full_queue_sheds_the_oldest_lower_priority_alert():
+    queue = DispatchQueue(capacity=2, clock=Clock())
+    assert queue.put('batteryAlert', "old", node=1, priority=1)
+    assert queue.put('batteryAlert', "new", node=2, priority=1)
+    assert queue.put('emergencyHandler', "sos", node=3, priority=4)
+    assert not queue.put('batteryAlert', "dropped", node=4, priority=1)
+    assert order(queue) == [('emergencyHandler', 3, 4), ('batteryAlert', 2, 1)]
+    assert queue.metrics().shed == 2
+
+
+def test_wait_is_measured_from_first_queueing():
+    clock = Clock()
+    queue = DispatchQueue(clock=clock)
+    queue.put('snrAlert', "x", node=1, priority=1)
+    clock.now = 5
+    queue.put('snrAlert', "y", node=1, priority=4)
+    clock.now = 8
+    assert queue.get().waited == 8
+    assert queue.get(block=True, timeout=0.01) is None
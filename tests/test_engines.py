@@ -0,0 +1,120 @@
+"""Tests for alertlib.engines: config.ini -> engines -> dispatch queue"""
+
+from pathlib import Path
+
+import pytest
+
+from alertlib.engines import load_engines
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def bot_dir(tmp_path, monkeypatch):
+    """A bot directory holding a copy of the shipped config, with state kept in tmp_path"""
+    monkeypatch.setenv('XDG_STATE_HOME', str(tmp_path / "state"))
+    directory = tmp_path / "bot"
+    directory.mkdir()
+    (directory / "config.ini").write_text((REPO_ROOT / "config.enhanced.ini").read_text())
+    return directory
+
+
+def set_options(path: Path, section: str, **values):
+    """Rewrite keys of one section in place, keeping the rest of the file"""
+    lines = path.read_text().splitlines()
+    current = None
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('['):
+            current = stripped[1:-1]
+        elif current == section and '=' in line:
+            key = line.split('=', 1)[0].strip()
+            if key in values:
+                lines[i] = f"{key} = {values[key]}"
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_shipped_config_builds_the_enabled_engines(bot_dir):
+    engines = load_engines(bot_dir / "config.ini")
+    try:
+        assert engines.errors == []
+        assert engines.keywords          # emergencyHandler is on by default
+        assert engines.welcomes is not None
+        assert engines.proximity is None and engines.battery is None
+        assert (bot_dir / "config.ini.snap").exists()
+    finally:
+        engines.close()
+
+
+def test_emergency_keyword_reaches_the_dispatch_queue_once(bot_dir):
+    engines = load_engines(bot_dir / "config.ini")
+    try:
+        assert engines.on_text(0x1234, "MAYDAY we need help") == 1
+        assert engines.on_text(0x1234, "mayday again") == 0    # cooling down
+        alert = engines.dispatch.get()
+        assert alert.alert_type == 'emergencyHandler'
+        assert alert.node == 0x1234 and alert.priority == 4
+        assert "!00001234" in alert.message
+    finally:
+        engines.close()
+    log = (bot_dir / "logs" / "emergency_alerts.log").read_text()
+    assert "MAYDAY we need help" in log
+
+
+def test_disabled_sections_and_global_switch(bot_dir):
+    set_options(bot_dir / "config.ini", 'alertGlobal', global_enabled='False')
+    engines = load_engines(bot_dir / "config.ini")
+    try:
+        assert engines.on_text(1, "sos") == 0
+        assert engines.dispatch.get() is None
+    finally:
+        engines.close()
+
+
+def test_altitude_alert_through_tick(bot_dir):
+    set_options(bot_dir / "config.ini", 'altitudeAlert', enabled='True', min_altitude='1000')
+    engines = load_engines(bot_dir / "config.ini")
+    try:
+        engines.on_position(7, 45.0, -122.0, altitude=200)
+        assert engines.tick(now=0.0) == 0
+        engines.on_position(7, 45.0, -122.0, altitude=1500)
+        assert engines.tick(now=1000.0) == 1
+        alert = engines.dispatch.get()
+        assert alert.alert_type == 'altitudeAlert' and "1500" in alert.message
+    finally:
+        engines.close()
+
+
+def test_state_is_saved_on_close_and_reloaded(bot_dir):
+    engines = load_engines(bot_dir / "config.ini")
+    engines.on_packet(0xBEEF)
+    engines.on_text(0xBEEF, "sos")
+    engines.close()
+    engines.close()  # a second close (e.g. from atexit) is harmless
+
+    engines = load_engines(bot_dir / "config.ini")
+    try:
+        assert 0xBEEF in engines.welcomes.seen
+        assert not engines.cooldowns.may_fire('emergencyHandler', 0xBEEF)
+    finally:
+        engines.close()
+
+
+def test_auto_mute_is_the_noisy_cooldown_and_survives_a_restart(bot_dir):
+    set_options(bot_dir / "config.ini", 'noisyNodeAlert', enabled='True', auto_mute='True',
+                message_threshold='3')
+    engines = load_engines(bot_dir / "config.ini")
+    try:
+        assert [engines.on_packet(0x42) for _ in range(4)] == [True, True, True, False]
+        alert = engines.dispatch.get()
+        assert alert.alert_type == 'noisyNodeAlert' and alert.node == 0x42
+        assert engines.cooldowns.remaining('noisyNodeAlert', 0x42) > 3500
+    finally:
+        engines.close()
+
+    engines = load_engines(bot_dir / "config.ini")
+    try:
+        assert engines.mutes.is_muted(0x42)
+        assert not engines.on_packet(0x42)
+    finally:
+        engines.close()
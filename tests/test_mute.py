@@ -0,0 +1,96 @@
+"""Tests for alertlib.mute"""
+
+from alertlib.cooldowns import CooldownRegistry
+from alertlib.mute import MuteTable
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def mute_table(clock, duration=600, path=None, **kwargs):
+    return MuteTable(CooldownRegistry({'noisyNodeAlert': duration}, path=path, clock=clock), **kwargs)
+
+
+def test_expiry_reported_at_the_next_tick():
+    clock = Clock()
+    table = mute_table(clock)
+    table.mute(1)
+    clock.now += 599
+    assert table.expire() == [] and table.is_muted(1)
+    clock.now += 61
+    assert table.expire() == [1]
+    assert not table.is_muted(1) and len(table) == 0
+
+
+def test_mute_is_the_registry_cooldown():
+    clock = Clock()
+    table = mute_table(clock)
+    assert table.default_duration == 600
+    table.mute(1)
+    assert not table.cooldowns.may_fire('noisyNodeAlert', 1)
+    table.cooldowns.fire('noisyNodeAlert', 2)      # e.g. by NoisyNodeDetector
+    assert table.is_muted(2) and len(table) == 2
+
+
+def test_unmute_and_remute_leave_no_stale_expiry():
+    clock = Clock()
+    table = mute_table(clock)
+    table.mute(1)
+    table.mute(2)
+    assert table.unmute(1) and not table.unmute(1)
+    table.mute(2, duration=3600)       # the 600 s entry for node 2 is now stale
+    clock.now += 700
+    assert table.expire() == []
+    assert table.is_muted(2) and not table.is_muted(1)
+    clock.now += 3000
+    assert table.expire() == [2]
+
+
+def test_expiry_still_reported_after_a_lookup_drops_the_entry():
+    clock = Clock()
+    table = mute_table(clock)
+    table.mute(1)
+    clock.now += 601
+    assert not table.is_muted(1)       # the registry drops the expired entry here
+    clock.now += 60
+    assert table.expire() == [1]
+
+
+def test_long_mute_survives_laps_of_the_wheel():
+    clock = Clock()
+    table = mute_table(clock, slots=4, tick_seconds=60)
+    table.mute(1, duration=60 * 10)    # two and a half laps of a 4-slot wheel
+    for _ in range(10):
+        assert table.is_muted(1)
+        clock.now += 60
+        assert table.expire() == []
+    assert not table.is_muted(1)
+    clock.now += 60                    # first tick boundary after the expiry
+    assert table.expire() == [1]
+
+
+def test_mutes_carry_across_a_restart(tmp_path):
+    path = tmp_path / "cooldowns.bin"
+    clock = Clock()
+    table = mute_table(clock, path=path)
+    table.mute(1)
+    table.mute(2, duration=60)
+    table.save()
+
+    clock.now += 300                   # bot down for five minutes
+    restarted = mute_table(clock, path=path)
+    assert restarted.is_muted(1)
+    assert not restarted.is_muted(2)   # ran out while the bot was down: not reloaded
+    assert restarted.remaining(1) == 300
+
+    clock.now += 301
+    assert not restarted.is_muted(1)   # exact, even before expire() reports it
+    clock.now += 60
+    assert restarted.expire() == [1]
+    restarted.save()
+    assert len(mute_table(clock, path=path)) == 0
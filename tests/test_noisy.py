@@ -0,0 +1,46 @@
+"""Tests for alertlib.noisy"""
+
+from alertlib.cooldowns import CooldownRegistry
+from alertlib.noisy import NoisyNodeDetector
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def flood(detector, node, count, now):
+    return [event for event in (detector.record(node, now) for _ in range(count)) if event]
+
+
+def test_alerts_once_per_burst():
+    detector = NoisyNodeDetector(5, 600)
+    events = flood(detector, 1, 20, now=0)
+    assert [(e.node, e.count) for e in events] == [(1, 5)]
+    assert flood(detector, 2, 4, now=0) == []
+    # The window has passed: the count dropped, so the next burst alerts again
+    assert len(flood(detector, 1, 5, now=2000)) == 1
+
+
+def test_next_burst_waits_for_the_registry_cooldown():
+    clock = Clock()
+    cooldowns = CooldownRegistry({'noisyNodeAlert': 3600}, clock=clock)
+    detector = NoisyNodeDetector(5, 600, cooldowns=cooldowns)
+    assert len(flood(detector, 1, 5, now=0)) == 1
+    assert not cooldowns.may_fire('noisyNodeAlert', 1)
+
+    clock.now += 2000
+    assert flood(detector, 1, 5, now=2000) == []       # new burst, still cooling down
+    clock.now += 2000
+    assert len(flood(detector, 1, 5, now=6000)) == 1
+
+
+def test_whitelisted_and_evicted_nodes():
+    detector = NoisyNodeDetector(3, 600, whitelist=[7], max_nodes=2)
+    assert flood(detector, 7, 10, now=0) == []
+    for node in (1, 2, 3):
+        detector.record(node, now=0)
+    assert len(detector) == 2 and detector.count(1, now=0) == 0
@@ -0,0 +1,46 @@
+"""Tests for alertlib.proximity"""
+
+import configparser
+
+import pytest
+
+from alertlib.proximity import ENTER, EXIT, Geofence, ProximityEngine, np
+from configlib.schema import load_typed
+
+BASECAMP = Geofence('basecamp', 45.0, -122.0, 100.0)
+
+
+def typed_config(**proximity):
+    config = configparser.ConfigParser()
+    config.read_dict({'proximityAlert': dict(enabled='True', **proximity)})
+    typed, errors = load_typed(config)
+    assert errors == []
+    return typed
+
+
+def test_unset_target_adds_no_null_island_fence():
+    engine = ProximityEngine.from_config(typed_config(extra_geofences='camp:45.0:-122.0:50'))
+    assert [f.name for f in engine.fences] == ['camp']
+    assert engine.evaluate({1: (0.0, 0.0)}, now=0.0) == []
+
+
+def test_configured_target_is_a_fence():
+    engine = ProximityEngine.from_config(typed_config(target_latitude='45.5', target_longitude='-122.5',
+                                                      radius_meters='200'))
+    assert engine.fences == (Geofence('target', 45.5, -122.5, 200.0),)
+
+
+@pytest.mark.parametrize('use_numpy', [False, True] if np is not None else [False])
+def test_enter_and_exit_are_edge_triggered(use_numpy):
+    engine = ProximityEngine([BASECAMP], node_cooldown=600, use_numpy=use_numpy)
+    assert [e.kind for e in engine.evaluate({1: (45.0, -122.0)}, now=0.0)] == [ENTER]
+    assert engine.evaluate({1: (45.0001, -122.0)}, now=10.0) == []      # still inside
+    assert [e.kind for e in engine.evaluate({1: (46.0, -122.0)}, now=20.0)] == [EXIT]
+    # Back in within node_cooldown: no second enter alert
+    assert engine.evaluate({1: (45.0, -122.0)}, now=30.0) == []
+
+
+def test_fence_across_the_antimeridian():
+    engine = ProximityEngine([Geofence('dateline', 0.0, 179.9999, 100.0)], use_numpy=False)
+    events = engine.evaluate({1: (0.0, -179.9999)}, now=0.0)
+    assert [(e.kind, e.node) for e in events] == [(ENTER, 1)]
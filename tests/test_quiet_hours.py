@@ -0,0 +1,66 @@
+"""Tests for alertlib.quiet_hours"""
+
+import configparser
+import time
+
+import pytest
+
+from alertlib.quiet_hours import DAYS, MINUTES_PER_DAY, QuietHours
+from configlib.schema import load_typed
+
+MON, FRI, SAT, SUN = (DAYS.index(d) for d in ('mon', 'fri', 'sat', 'sun'))
+
+
+def at(hhmm: str) -> int:
+    hours, minutes = hhmm.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def test_range_past_midnight_belongs_to_the_next_day():
+    quiet = QuietHours("Fri 22:00-07:00")
+    assert not quiet.is_quiet_at(FRI, at('21:59'))
+    assert quiet.is_quiet_at(FRI, at('22:00'))
+    assert quiet.is_quiet_at(SAT, at('06:59'))
+    assert not quiet.is_quiet_at(SAT, at('07:00'))     # end minute is excluded
+    assert not quiet.is_quiet_at(FRI, at('06:59'))     # Thursday night is not quiet
+    assert quiet.quiet_minutes() == 9 * 60
+
+
+def test_sunday_night_wraps_into_monday():
+    quiet = QuietHours("Sun 23:00-01:00")
+    assert quiet.is_quiet_at(SUN, at('23:30'))
+    assert quiet.is_quiet_at(MON, at('00:59'))
+    assert not quiet.is_quiet_at(MON, at('23:30'))
+
+
+def test_day_range_wraps_through_the_weekend():
+    quiet = QuietHours("Fri-Mon 12:00-13:00")
+    assert [quiet.is_quiet_at(day, at('12:30')) for day in range(7)] == [
+        True, False, False, False, True, True, True]
+
+
+def test_end_of_day_and_whole_day():
+    assert QuietHours("23:00-24:00").is_quiet_at(MON, at('23:59'))
+    assert QuietHours("00:00-24:00").quiet_minutes() == 7 * MINUTES_PER_DAY
+
+
+def test_is_quiet_uses_local_time():
+    now = time.mktime((2026, 10, 16, 23, 15, 0, 0, 0, -1))  # a Friday
+    assert QuietHours("Fri 22:00-07:00", clock=lambda: now).is_quiet()
+    assert not QuietHours("Mon 22:00-07:00", clock=lambda: now).is_quiet()
+    assert not QuietHours("").is_quiet(now)
+
+
+@pytest.mark.parametrize('spec', ["10:00-10:00", "25:00-07:00", "22:60-07:00",
+                                  "Fri 24:00-07:00", "Fr 22:00-07:00", "22:00 to 07:00"])
+def test_invalid_specs_are_rejected(spec):
+    with pytest.raises(ValueError):
+        QuietHours(spec)
+
+
+def test_schema_rejects_an_empty_range():
+    config = configparser.ConfigParser()
+    config.read_dict({'alertGlobal': {'quiet_hours': '10:00-10:00'}})
+    typed, errors = load_typed(config)
+    assert any('quiet_hours' in error for error in errors)
+    assert typed.alertGlobal.quiet_hours == ''
@@ -0,0 +1,61 @@
+"""Tests for alertlib.rate_limit"""
+
+import marshal
+
+import pytest
+
+from alertlib.rate_limit import GLOBAL, STATE_VERSION, RateLimiter, parse_type_limits
+
+
+class Clock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_global_and_per_type_buckets():
+    limiter = RateLimiter(3, {'noisyNodeAlert': 1}, clock=Clock())
+    assert limiter.admit('noisyNodeAlert', now=0)
+    assert not limiter.admit('noisyNodeAlert', now=0)     # its own bucket is empty
+    assert limiter.admit('batteryAlert', now=0) and limiter.admit('batteryAlert', now=0)
+    assert not limiter.admit('batteryAlert', now=0)       # global bucket is empty
+    assert limiter.retry_after('batteryAlert', now=0) == pytest.approx(1200)
+    assert limiter.admit('batteryAlert', now=1200)
+
+
+def test_zero_means_unlimited():
+    limiter = RateLimiter(0, clock=Clock())
+    assert all(limiter.admit('x', now=0) for _ in range(1000))
+    assert limiter.tokens() is None
+
+
+def test_levels_carry_across_a_restart(tmp_path):
+    path = tmp_path / "rate.bin"
+    wall = Clock(1_000_000)
+    limiter = RateLimiter(10, path=path, clock=Clock(), wall_clock=wall)
+    for _ in range(10):
+        limiter.admit(now=0)
+    limiter.save()
+
+    wall.now += 360                   # down for six minutes: one token refilled
+    restarted = RateLimiter(10, path=path, clock=Clock(), wall_clock=wall)
+    assert restarted.tokens(now=0) == pytest.approx(1.0)
+
+
+def test_integer_levels_are_loaded(tmp_path):
+    # A full bucket is saved as its integer capacity; other ints must load too
+    path = tmp_path / "rate.bin"
+    path.write_bytes(marshal.dumps((STATE_VERSION, 1_000_000, {GLOBAL: 2, 'proximityAlert': 5})))
+    limiter = RateLimiter(10, {'proximityAlert': 5}, path=path, clock=Clock(),
+                          wall_clock=Clock(1_000_000))
+    assert limiter.tokens(now=0) == 2
+    assert limiter.tokens('proximityAlert', now=0) == 5
+
+
+def test_parse_type_limits():
+    assert parse_type_limits("proximityAlert:5, noisyNodeAlert : 2,") == {
+        'proximityAlert': 5, 'noisyNodeAlert': 2}
+    with pytest.raises(ValueError):
+        parse_type_limits("proximityAlert=5")
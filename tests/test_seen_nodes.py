@@ -0,0 +1,72 @@
+"""Tests for alertlib.seen_nodes"""
+
+from alertlib.seen_nodes import MIN_COMPACT, SeenNodes, WelcomeScheduler
+
+
+def reopen(path):
+    seen = SeenNodes(path)
+    nodes = set(seen)
+    seen.close()
+    return nodes
+
+
+def test_nodes_survive_reopen_from_sorted_part_and_tail(tmp_path):
+    path = tmp_path / "seen.bin"
+    seen = SeenNodes(path)
+    seen.update([30, 10, 20])           # written sorted
+    assert seen.add(5) and not seen.add(10)
+    seen.close()
+    assert reopen(path) == {5, 10, 20, 30}
+    assert path.stat().st_size == 8 + 4 * 4
+
+
+def test_torn_append_is_cut_off_on_load(tmp_path):
+    path = tmp_path / "seen.bin"
+    seen = SeenNodes(path)
+    seen.update([1, 2, 3])
+    seen.add(4)
+    seen.close()
+    with open(path, 'ab') as f:
+        f.write(b'\x01\x02')            # power cut half way through an append
+    size = path.stat().st_size
+
+    seen = SeenNodes(path)
+    assert set(seen) == {1, 2, 3, 4}
+    assert path.stat().st_size == size - 2
+    seen.add(0xDEADBEEF)                # lands on a 4-byte boundary again
+    seen.close()
+    assert reopen(path) == {1, 2, 3, 4, 0xDEADBEEF}
+
+
+def test_truncated_sorted_part_is_ignored(tmp_path):
+    path = tmp_path / "seen.bin"
+    seen = SeenNodes(path)
+    seen.update(range(100))
+    seen.close()
+    path.write_bytes(path.read_bytes()[:50])
+    assert reopen(path) == set()
+
+
+def test_tail_is_compacted_into_the_sorted_part(tmp_path):
+    path = tmp_path / "seen.bin"
+    seen = SeenNodes(path)
+    for node in range(MIN_COMPACT):
+        seen.add(MIN_COMPACT - node)
+    assert len(seen._tail) == 0 and len(seen) == MIN_COMPACT
+    seen.close()
+    assert reopen(path) == set(range(1, MIN_COMPACT + 1))
+
+
+def test_welcomes_come_due_in_order_and_only_once(tmp_path):
+    welcomes = WelcomeScheduler(5, seen=SeenNodes(tmp_path / "seen.bin"), clock=lambda: 0.0)
+    assert welcomes.heard(1, now=0) and welcomes.heard(2, now=0)
+    assert not welcomes.heard(1, now=1)
+    assert welcomes.due(now=4.9) == []
+    assert welcomes.next_due() == 5
+    assert welcomes.due(now=5) == [1, 2]
+    assert welcomes.due(now=100) == [] and welcomes.next_due() is None
+    welcomes.seen.close()
+
+    restarted = WelcomeScheduler(5, seen=SeenNodes(tmp_path / "seen.bin"))
+    assert not restarted.heard(2)       # remembered across the restart
+    restarted.seen.close()